@@ -0,0 +1,394 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025, Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+DOCUMENTATION = r"""
+name: append_log
+short_description: Single append-only file for cache
+version_added: 11.1.0
+description:
+  - This cache stores the facts of all hosts in a single file, to which every change is appended.
+  - An index of the file is built when the cache is first used, without reading the facts themselves. The facts of a host
+    are only read and decoded when they are accessed, from a memory map of the file.
+  - Once most of the file consists of outdated or expired records, it is compacted in a background thread.
+  - Several Ansible processes can share the file.
+author: Unknown (!UNKNOWN)
+extends_documentation_fragment:
+  - community.general.cache_codec
+requirements:
+  - msgpack (python lib, for O(_serializer=msgpack))
+  - zstandard (python lib, for O(_compression=zstd))
+options:
+  _uri:
+    required: true
+    description:
+      - Path of the directory in which the cache plugin will save the file.
+    env:
+      - name: ANSIBLE_CACHE_PLUGIN_CONNECTION
+    ini:
+      - key: fact_caching_connection
+        section: defaults
+    type: path
+  _prefix:
+    description: User defined prefix to use for the name of the file.
+    env:
+      - name: ANSIBLE_CACHE_PLUGIN_PREFIX
+    ini:
+      - key: fact_caching_prefix
+        section: defaults
+    type: string
+  _timeout:
+    default: 86400
+    description: Expiration timeout in seconds for the cache plugin data. Set to 0 to never expire.
+    env:
+      - name: ANSIBLE_CACHE_PLUGIN_TIMEOUT
+    ini:
+      - key: fact_caching_timeout
+        section: defaults
+    type: float
+"""
+
+import atexit
+import fcntl
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+import zlib
+
+from ansible.errors import AnsibleError
+from ansible.module_utils.common.text.converters import to_bytes
+from ansible.plugins.cache import BaseCacheModule
+from ansible.utils.display import Display
+
+from ansible_collections.community.general.plugins.plugin_utils.cache_codec import CacheCodec
+
+display = Display()
+
+# Every file starts with this
+FILE_HEADER = b'ANSFLOG1'
+
+# Every record starts with its operation, its time, the length of its key and value, and the CRC32 of its key and value
+RECORD_HEADER = struct.Struct('>BdHII')
+
+OP_SET = 1
+OP_DELETE = 2
+
+# The file is compacted once it is larger than this, and less than half of it is still needed
+COMPACT_MIN_SIZE = 1024 * 1024
+
+
+class CacheModule(BaseCacheModule):
+    """
+    A caching module backed by a single append-only file.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(CacheModule, self).__init__(*args, **kwargs)
+        self._cache_dir = os.path.expanduser(os.path.expandvars(self.get_option('_uri') or ''))
+        self._timeout = float(self.get_option('_timeout'))
+        self._codec = CacheCodec(
+            serializer=self.get_option('_serializer'),
+            compression=self.get_option('_compression'),
+            compression_threshold=self.get_option('_compression_threshold'),
+        )
+        if not self._cache_dir:
+            raise AnsibleError("error, 'append_log' cache plugin requires the 'fact_caching_connection' config option "
+                               "to be set (to a writeable directory path)")
+        if not os.path.exists(self._cache_dir):
+            try:
+                os.makedirs(self._cache_dir)
+            except OSError as e:
+                raise AnsibleError(f"error in 'append_log' cache plugin while trying to create cache dir {self._cache_dir} : {e}")
+
+        self._path = os.path.join(self._cache_dir, f"{self.get_option('_prefix') or ''}ansible_facts.log")
+        self._lock = threading.RLock()
+        self._lock_fd = None
+        self._file = None
+        self._compaction = None
+        self._cache = {}
+        self._reset()
+        atexit.register(self._close)
+        os.register_at_fork(before=self._before_fork, after_in_parent=self._after_fork_in_parent, after_in_child=self._after_fork_in_child)
+
+    def _reset(self):
+        self._index = {}
+        self._inode = None
+        self._scanned = 0
+        self._live_bytes = 0
+        # Maps that are replaced are not closed explicitly, since a compaction can still be reading from them
+        self._map = None
+
+    def _close(self):
+        compaction = self._compaction
+        if compaction is not None:
+            compaction.join()
+        with self._lock:
+            for f in (self._file, self._lock_fd):
+                if f is not None:
+                    f.close()
+            self._file = self._lock_fd = None
+            self._reset()
+
+    def _before_fork(self):
+        # A compaction thread must not hold the locks, or be halfway through changing the index, while a worker is forked
+        self._lock.acquire()
+
+    def _after_fork_in_parent(self):
+        self._lock.release()
+
+    def _after_fork_in_child(self):
+        # The compaction thread does not exist in the child. The file lock belongs to the open file, which the child
+        # must not share with the parent, so that both still exclude each other
+        self._lock = threading.RLock()
+        self._compaction = None
+        for f in (self._file, self._lock_fd):
+            if f is not None:
+                f.close()
+        self._file = self._lock_fd = None
+
+    def _lock_file(self):
+        # Serializes the writers of all processes that share the file
+        if self._lock_fd is None:
+            self._lock_fd = open(f'{self._path}.lock', 'ab')
+        fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+
+    def _unlock_file(self):
+        fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    def _map_file(self, size):
+        # Returns False if the file was replaced
+        with open(self._path, 'rb') as f:
+            if os.fstat(f.fileno()).st_ino != self._inode:
+                return False
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < size:
+            return False
+        if self._scanned == 0:
+            if self._map[:len(FILE_HEADER)] != FILE_HEADER:
+                raise AnsibleError(f"error in 'append_log' cache plugin: {self._path} is not a cache file")
+            self._scanned = len(FILE_HEADER)
+        return True
+
+    def _add_record(self, op, key, offset, length, key_length, timestamp, crc):
+        old = self._index.pop(key, None)
+        if old is not None:
+            self._live_bytes -= old[1]
+            self._cache.pop(key, None)
+        if op == OP_SET:
+            # Only the position of the record is kept, its value is read once it is needed
+            self._index[key] = (offset, length, key_length, timestamp, crc)
+            self._live_bytes += length
+
+    def _refresh(self):
+        """
+        Add the records that were appended to the file since it was last read, by any process, to the index.
+
+        Returns the size of the part of the file that contains complete records.
+        """
+        try:
+            stat = os.stat(self._path)
+        except FileNotFoundError:
+            self._reset()
+            self._cache = {}
+            return 0
+        if stat.st_ino != self._inode or stat.st_size < self._scanned:
+            # The file was compacted or flushed
+            self._reset()
+            self._cache = {}
+            self._inode = stat.st_ino
+        if stat.st_size <= self._scanned or stat.st_size < len(FILE_HEADER):
+            return self._scanned
+        if not self._map_file(stat.st_size):
+            return self._refresh()
+
+        data = self._map
+        offset = self._scanned
+        size = len(data)
+        unpack_from = RECORD_HEADER.unpack_from
+        header_size = RECORD_HEADER.size
+        while offset + header_size <= size:
+            op, timestamp, key_length, value_length, crc = unpack_from(data, offset)
+            key_start = offset + header_size
+            end = key_start + key_length + value_length
+            if end > size or op not in (OP_SET, OP_DELETE):
+                # The record is still being written, or a writer was interrupted
+                break
+            key = data[key_start:key_start + key_length].decode('utf-8', 'surrogateescape')
+            self._add_record(op, key, offset, end - offset, key_length, timestamp, crc)
+            offset = end
+        self._scanned = offset
+        return offset
+
+    def _is_expired(self, entry):
+        return self._timeout > 0 and time.time() - entry[3] > self._timeout
+
+    def _append(self, op, key, value=b''):
+        b_key = to_bytes(key, errors='surrogate_or_strict')
+        timestamp = time.time()
+        crc = zlib.crc32(b_key + value)
+        record = RECORD_HEADER.pack(op, timestamp, len(b_key), len(value), crc) + b_key + value
+        with self._lock:
+            self._lock_file()
+            try:
+                valid_size = self._refresh()
+                if self._file is not None and os.fstat(self._file.fileno()).st_ino != self._inode:
+                    self._file.close()
+                    self._file = None
+                if self._file is None:
+                    self._file = open(self._path, 'ab')
+                    if self._inode is None:
+                        self._inode = os.fstat(self._file.fileno()).st_ino
+                if os.fstat(self._file.fileno()).st_size > valid_size:
+                    # Drop what an interrupted writer left behind
+                    self._file.truncate(valid_size)
+                if valid_size == 0:
+                    self._file.write(FILE_HEADER)
+                    valid_size = len(FILE_HEADER)
+                self._file.write(record)
+                self._file.flush()
+            finally:
+                self._unlock_file()
+            # The file is only mapped again once the record is read
+            self._scanned = valid_size + len(record)
+            self._add_record(op, key, valid_size, len(record), len(b_key), timestamp, crc)
+            self._maybe_compact()
+
+    def _read(self, key):
+        start, length, key_length, timestamp, crc = self._index[key]
+        if self._map is None or len(self._map) < start + length:
+            if not self._map_file(start + length):
+                raise KeyError
+        data = self._map[start + RECORD_HEADER.size:start + length]
+        if zlib.crc32(data) != crc:
+            raise AnsibleError(f"error in 'append_log' cache plugin: the record of {key} in {self._path} is corrupted")
+        return CacheCodec.decode(data[key_length:])
+
+    def _get(self, key):
+        if key not in self._cache:
+            entry = self._index.get(key)
+            if entry is None or self._is_expired(entry):
+                raise KeyError
+            self._cache[key] = self._read(key)
+        return self._cache[key]
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._cache:
+                self._refresh()
+            return self._get(key)
+
+    def set(self, key, value):
+        self._append(OP_SET, key, self._codec.encode(value))
+        with self._lock:
+            self._cache[key] = value
+
+    def keys(self):
+        with self._lock:
+            self._refresh()
+            return [key for key, entry in self._index.items() if not self._is_expired(entry)]
+
+    def contains(self, key):
+        with self._lock:
+            self._refresh()
+            entry = self._index.get(key)
+            return entry is not None and not self._is_expired(entry)
+
+    def delete(self, key):
+        self._append(OP_DELETE, key)
+
+    def flush(self):
+        with self._lock:
+            self._lock_file()
+            try:
+                fd, tmp_path = self._create_file()
+                os.close(fd)
+                self._move_file(tmp_path)
+            finally:
+                self._unlock_file()
+
+    def copy(self):
+        with self._lock:
+            ret = {}
+            for key in self.keys():
+                try:
+                    ret[key] = self._get(key)
+                except KeyError:
+                    pass
+            return ret
+
+    def _create_file(self):
+        fd, tmp_path = tempfile.mkstemp(dir=self._cache_dir, prefix='.ansible_facts', suffix='.tmp')
+        try:
+            os.write(fd, FILE_HEADER)
+            os.fchmod(fd, 0o644)
+        except Exception:
+            os.close(fd)
+            os.unlink(tmp_path)
+            raise
+        return fd, tmp_path
+
+    def _move_file(self, tmp_path):
+        # Replace the file instead of changing it, so that readers notice the change by its inode
+        os.rename(tmp_path, self._path)
+        self._refresh()
+
+    def _maybe_compact(self):
+        if self._scanned < COMPACT_MIN_SIZE or self._live_bytes * 2 > self._scanned:
+            return
+        if self._compaction is not None and self._compaction.is_alive():
+            return
+        self._compaction = threading.Thread(target=self._compact, name='append_log compaction')
+        self._compaction.daemon = True
+        self._compaction.start()
+
+    def _compact(self):
+        tmp_path = None
+        try:
+            with self._lock:
+                end = self._refresh()
+                if not self._map_file(end):
+                    return
+                source, inode = self._map, self._inode
+                entries = sorted(entry for entry in self._index.values() if not self._is_expired(entry))
+
+            # Copy the records that are still needed without blocking readers or writers
+            fd, tmp_path = self._create_file()
+            with os.fdopen(fd, 'wb') as f:
+                for entry in entries:
+                    f.write(source[entry[0]:entry[0] + entry[1]])
+
+                with self._lock:
+                    self._lock_file()
+                    try:
+                        valid_size = self._refresh()
+                        if self._inode != inode:
+                            # Another process compacted or flushed the file meanwhile
+                            return
+                        # Keep what was appended while copying
+                        if valid_size > end and not self._map_file(valid_size):
+                            return
+                        f.write(self._map[end:valid_size])
+                        f.flush()
+                        os.fsync(f.fileno())
+                        self._move_file(tmp_path)
+                        tmp_path = None
+                    finally:
+                        self._unlock_file()
+            display.vvvv(f'Compacted {self._path} from {valid_size} to {self._scanned} bytes')
+        except Exception as e:
+            display.warning(f"Cannot compact the 'append_log' fact cache {self._path}: {e}")
+        finally:
+            if tmp_path is not None:
+                os.unlink(tmp_path)
+
+    def __getstate__(self):
+        return dict()
+
+    def __setstate__(self, data):
+        self.__init__()
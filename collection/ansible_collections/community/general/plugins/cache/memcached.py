@@ -12,8 +12,13 @@ name: memcached
 short_description: Use memcached DB for cache
 description:
   - This cache uses JSON formatted, per host records saved in memcached.
+  - Records can also be stored in a more compact format, see O(_serializer) and O(_compression).
+extends_documentation_fragment:
+  - community.general.cache_codec.legacy
 requirements:
   - memcache (python lib)
+  - msgpack (python lib, for O(_serializer=msgpack))
+  - zstandard (python lib, for O(_compression=zstd))
 options:
   _uri:
     description:
@@ -50,14 +55,17 @@ options:
 import collections
 import os
 import time
+import zlib
 from multiprocessing import Lock
 from itertools import chain
 
 from ansible.errors import AnsibleError
-from ansible.module_utils.common._collections_compat import MutableSet
+from ansible.module_utils.common.text.converters import to_bytes
 from ansible.plugins.cache import BaseCacheModule
 from ansible.utils.display import Display
 
+from ansible_collections.community.general.plugins.plugin_utils.cache_codec import CacheCodec, is_encoded
+
 try:
     import memcache
     HAS_MEMCACHE = True
@@ -135,40 +143,151 @@ class ProxyClientPool(object):
             self.release_connection(conn)
 
 
-class CacheModuleKeys(MutableSet):
+class CacheModuleKeys(object):
     """
-    A set subclass that keeps track of insertion time and persists
-    the set in memcached.
+    An index of the keys in the cache, which is stored in memcached as a
+    log of additions and removals.
+
+    The log is split into shards by key, so that a shard does not exceed
+    the maximum size of a memcached value. Every change appends one line to
+    a shard, so changes do not depend on the size of the index and
+    concurrent changes by several processes do not overwrite each other.
+
+    Entries that expire are also split into buckets by time, so that
+    memcached can expire old entries on its own. Entries that never expire
+    are kept in one log per shard, which is rewritten with only the latest
+    change of every key from time to time.
     """
     PREFIX = 'ansible_cache_keys'
 
-    def __init__(self, cache, *args, **kwargs):
-        self._cache = cache
-        self._keyset = dict(*args, **kwargs)
+    # The number of buckets that are kept for entries that expire
+    BUCKETS = 24
 
-    def __contains__(self, key):
-        return key in self._keyset
+    # The number of shards of every bucket
+    SHARDS = 16
 
-    def __iter__(self):
-        return iter(self._keyset)
+    # The number of changes to a shard of entries that never expire, after which it is rewritten
+    COMPACT_INTERVAL = 100
 
-    def __len__(self):
-        return len(self._keyset)
+    def __init__(self, cache, timeout):
+        self._cache = cache
+        self._timeout = timeout
+        self._bucket_size = max(1, -(-timeout // self.BUCKETS)) if timeout > 0 else None
+        self._changes = [0] * self.SHARDS
+
+    def _shard_key(self, shard, bucket=None):
+        if bucket is None:
+            return f'{self.PREFIX}_permanent_{shard}'
+        # Buckets of different sizes, used with different timeouts, must not mix
+        return f'{self.PREFIX}_{self._bucket_size}_{bucket}_{shard}'
+
+    def _shard_keys(self, now):
+        if self._bucket_size is None:
+            return [self._shard_key(shard) for shard in range(self.SHARDS)]
+        first = int((now - self._timeout) // self._bucket_size)
+        last = int(now // self._bucket_size)
+        return [self._shard_key(shard, bucket) for bucket in range(first, last + 1) for shard in range(self.SHARDS)]
+
+    @staticmethod
+    def _parse(log):
+        for line in (log or '').splitlines():
+            timestamp, dummy, change = line.partition(' ')
+            yield float(timestamp), change[:1] == '+', change[1:]
+
+    @staticmethod
+    def _format(timestamp, added, value):
+        return f"{timestamp:.6f} {'+' if added else '-'}{value}\n"
+
+    def _write(self, key, line, expire):
+        # append() fails if the shard does not exist yet, add() fails if another process created it meanwhile
+        return self._cache.append(key, line) or self._cache.add(key, line, time=expire) or self._cache.append(key, line)
+
+    def _compact(self, shard):
+        """
+        Rewrite a shard of the entries that never expire with only the latest change of every key.
+
+        Returns whether the shard was rewritten.
+        """
+        self._changes[shard] = 0
+        key = self._shard_key(shard)
+        # Removals only have to be kept while they hide entries of the index written by older versions of this plugin
+        keep_removals = self._cache.get(self.PREFIX) is not None
+        # The shard must not be changed between gets() and cas(), which have to use the same connection
+        connection = self._cache.get_connection()
+        try:
+            log = connection.gets(key)
+            if log is None:
+                return False
+            latest = {}
+            for entry in self._parse(log):
+                if entry[2] not in latest or entry[0] >= latest[entry[2]][0]:
+                    latest[entry[2]] = entry
+            log = ''.join(self._format(*entry) for entry in sorted(latest.values()) if entry[1] or keep_removals)
+            return bool(connection.cas(key, log))
+        finally:
+            self._cache.release_connection(connection)
+
+    def _append(self, value, added):
+        now = time.time()
+        shard = zlib.crc32(to_bytes(value, errors='surrogate_or_strict')) % self.SHARDS
+        line = self._format(now, added, value)
+        if self._bucket_size is not None:
+            key = self._shard_key(shard, int(now // self._bucket_size))
+            # Keep the bucket until the last entry in it has expired
+            expire = get_expire_time(self._timeout + self._bucket_size)
+        else:
+            key = self._shard_key(shard)
+            expire = 0
+            self._changes[shard] += 1
+            if self._changes[shard] >= self.COMPACT_INTERVAL:
+                self._compact(shard)
+        if self._write(key, line, expire):
+            return
+        # The shard may have grown beyond the maximum size of a memcached value
+        if self._bucket_size is None and self._compact(shard) and self._write(key, line, expire):
+            return
+        if added:
+            display.warning(f'Cannot update the memcached cache index {key}, {value} may be missing from the cached hosts')
+        else:
+            display.warning(f'Cannot update the memcached cache index {key}, {value} may still be listed in the cached hosts')
 
     def add(self, value):
-        self._keyset[value] = time.time()
-        self._cache.set(self.PREFIX, self._keyset)
+        self._append(value, True)
 
     def discard(self, value):
-        del self._keyset[value]
-        self._cache.set(self.PREFIX, self._keyset)
+        self._append(value, False)
 
-    def remove_by_timerange(self, s_min, s_max):
-        for k in list(self._keyset.keys()):
-            t = self._keyset[k]
-            if s_min < t < s_max:
-                del self._keyset[k]
-        self._cache.set(self.PREFIX, self._keyset)
+    def keys(self):
+        now = time.time()
+        expiry_age = now - self._timeout if self._timeout > 0 else 0
+        entries = []
+        # The index written by older versions of this plugin
+        shard_keys = [self.PREFIX] + self._shard_keys(now)
+        shards = self._cache.get_multi(shard_keys)
+        legacy = shards.get(self.PREFIX)
+        if isinstance(legacy, dict):
+            entries.extend((timestamp, True, key) for key, timestamp in legacy.items())
+        for shard_key in shard_keys[1:]:
+            entries.extend(self._parse(shards.get(shard_key)))
+
+        # The latest change to a key decides whether it is in the cache
+        result = {}
+        for timestamp, added, key in sorted(entries, key=lambda entry: entry[0]):
+            if added and timestamp > expiry_age:
+                result[key] = timestamp
+            else:
+                result.pop(key, None)
+        return list(result)
+
+    def clear(self):
+        self._cache.delete_multi([self.PREFIX] + self._shard_keys(time.time()))
+
+
+def get_expire_time(timeout):
+    # memcached treats expiration times of more than 30 days as UNIX timestamps
+    if timeout > 2592000:
+        return int(time.time()) + timeout
+    return timeout
 
 
 class CacheModule(BaseCacheModule):
@@ -181,22 +300,24 @@ class CacheModule(BaseCacheModule):
             connection = self.get_option('_uri')
         self._timeout = self.get_option('_timeout')
         self._prefix = self.get_option('_prefix')
+        self._codec = None
+        if self.get_option('_serializer') != 'legacy':
+            self._codec = CacheCodec(
+                serializer=self.get_option('_serializer'),
+                compression=self.get_option('_compression'),
+                compression_threshold=self.get_option('_compression_threshold'),
+            )
 
         if not HAS_MEMCACHE:
             raise AnsibleError("python-memcached is required for the memcached fact cache")
 
         self._cache = {}
-        self._db = ProxyClientPool(connection, debug=0)
-        self._keys = CacheModuleKeys(self._db, self._db.get(CacheModuleKeys.PREFIX) or [])
+        self._db = ProxyClientPool(connection, debug=0, cache_cas=True)
+        self._keys = CacheModuleKeys(self._db, self._timeout)
 
     def _make_key(self, key):
         return f"{self._prefix}{key}"
 
-    def _expire_keys(self):
-        if self._timeout > 0:
-            expiry_age = time.time() - self._timeout
-            self._keys.remove_by_timerange(0, expiry_age)
-
     def get(self, key):
         if key not in self._cache:
             value = self._db.get(self._make_key(key))
@@ -206,34 +327,58 @@ class CacheModule(BaseCacheModule):
             if value is None:
                 self.delete(key)
                 raise KeyError
-            self._cache[key] = value
+            self._cache[key] = self._decode(value)
 
         return self._cache.get(key)
 
+    @staticmethod
+    def _decode(value):
+        # Values written by older versions of this plugin are pickled and unpickled by the memcache library
+        if is_encoded(value):
+            return CacheCodec.decode(value)
+        return value
+
     def set(self, key, value):
-        self._db.set(self._make_key(key), value, time=self._timeout, min_compress_len=1)
+        if self._codec is None:
+            self._db.set(self._make_key(key), value, time=get_expire_time(self._timeout), min_compress_len=1)
+        else:
+            # The codec takes care of compression
+            self._db.set(self._make_key(key), self._codec.encode(value), time=get_expire_time(self._timeout))
         self._cache[key] = value
         self._keys.add(key)
 
     def keys(self):
-        self._expire_keys()
-        return list(iter(self._keys))
+        return self._keys.keys()
 
     def contains(self, key):
-        self._expire_keys()
-        return key in self._keys
+        if key in self._cache:
+            return True
+        # memcached has removed the value if it expired
+        value = self._db.get(self._make_key(key))
+        if value is None:
+            return False
+        self._cache[key] = self._decode(value)
+        return True
 
     def delete(self, key):
-        del self._cache[key]
+        self._cache.pop(key, None)
         self._db.delete(self._make_key(key))
         self._keys.discard(key)
 
     def flush(self):
-        for key in self.keys():
-            self.delete(key)
+        self._cache = {}
+        self._db.delete_multi([self._make_key(key) for key in self.keys()])
+        self._keys.clear()
 
     def copy(self):
-        return self._keys.copy()
+        keys = self.keys()
+        missing = [key for key in keys if key not in self._cache]
+        values = self._db.get_multi([self._make_key(key) for key in missing])
+        for key in missing:
+            value = values.get(self._make_key(key))
+            if value is not None:
+                self._cache[key] = self._decode(value)
+        return dict((key, self._cache[key]) for key in keys if key in self._cache)
 
     def __getstate__(self):
         return dict()
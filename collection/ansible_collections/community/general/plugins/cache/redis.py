@@ -11,8 +11,13 @@ name: redis
 short_description: Use Redis DB for cache
 description:
   - This cache uses JSON formatted, per host records saved in Redis.
+  - Records can also be stored in a more compact format, see O(_serializer) and O(_compression).
+extends_documentation_fragment:
+  - community.general.cache_codec.legacy
 requirements:
   - redis>=2.4.5 (python lib)
+  - msgpack (python lib, for O(_serializer=msgpack))
+  - zstandard (python lib, for O(_compression=zstd))
 options:
   _uri:
     description:
@@ -65,25 +70,77 @@ options:
     ini:
       - key: fact_caching_timeout
         section: defaults
+  _batch_size:
+    description:
+      - The number of hosts whose facts are collected before they are written to Redis together.
+      - Writes are also sent O(_batch_max_age) seconds after the oldest of them was made, when the keys of the cache are
+        listed or copied, when a key is removed, and when Ansible exits.
+      - Facts that have not been written yet are lost if Ansible is killed, for example by C(SIGKILL) or by a C(SIGTERM) that
+        Ansible does not handle.
+      - The default V(1) writes the facts of every host right away.
+    type: integer
+    default: 1
+    env:
+      - name: ANSIBLE_CACHE_REDIS_BATCH_SIZE
+    ini:
+      - key: fact_caching_redis_batch_size
+        section: defaults
+    version_added: 11.1.0
+  _batch_max_age:
+    description:
+      - The maximum number of seconds that facts are held back before they are written to Redis when O(_batch_size) is
+        greater than V(1).
+    type: float
+    default: 5
+    env:
+      - name: ANSIBLE_CACHE_REDIS_BATCH_MAX_AGE
+    ini:
+      - key: fact_caching_redis_batch_max_age
+        section: defaults
+    version_added: 11.1.0
 """
 
+import atexit
+import os
 import re
+import threading
 import time
 import json
 
 from ansible.errors import AnsibleError
+from ansible.module_utils.common.text.converters import to_text
 from ansible.parsing.ajson import AnsibleJSONEncoder, AnsibleJSONDecoder
 from ansible.plugins.cache import BaseCacheModule
 from ansible.utils.display import Display
 
+from ansible_collections.community.general.plugins.plugin_utils.cache_codec import CacheCodec, is_encoded
+
 try:
     from redis import StrictRedis, VERSION
+    from redis.exceptions import ResponseError
     HAS_REDIS = True
 except ImportError:
     HAS_REDIS = False
 
 display = Display()
 
+# The number of keys requested with one MGET, or deleted with one DEL
+CHUNK_SIZE = 1000
+
+# Deletes all keys in the zset KEYS[1], prefixed with ARGV[1], and the zset itself
+FLUSH_SCRIPT = """
+local keys = redis.call('ZRANGE', KEYS[1], 0, -1)
+for i = 1, #keys, 1000 do
+    local chunk = {}
+    for j = i, math.min(i + 999, #keys) do
+        chunk[#chunk + 1] = ARGV[1] .. keys[j]
+    end
+    redis.call('DEL', unpack(chunk))
+end
+redis.call('DEL', KEYS[1])
+return #keys
+"""
+
 
 class CacheModule(BaseCacheModule):
     """
@@ -108,6 +165,15 @@ class CacheModule(BaseCacheModule):
         self._prefix = self.get_option('_prefix')
         self._keys_set = self.get_option('_keyset_name')
         self._sentinel_service_name = self.get_option('_sentinel_service_name')
+        self._batch_size = max(1, self.get_option('_batch_size'))
+        self._batch_max_age = float(self.get_option('_batch_max_age'))
+        self._codec = None
+        if self.get_option('_serializer') != 'legacy':
+            self._codec = CacheCodec(
+                serializer=self.get_option('_serializer'),
+                compression=self.get_option('_compression'),
+                compression_threshold=self.get_option('_compression_threshold'),
+            )
 
         if not HAS_REDIS:
             raise AnsibleError("The 'redis' python module (version 2.4.5 or newer) is required for the redis fact cache, 'pip install redis'")
@@ -131,6 +197,16 @@ class CacheModule(BaseCacheModule):
 
         display.vv(f'Redis connection: {self._db}')
 
+        # Writes that have not been sent yet, and the timer that sends them once the first of them is _batch_max_age old
+        self._pending = None
+        self._pending_count = 0
+        self._timer = None
+        self._lock = threading.Lock()
+        self._flush_script = None
+        if self._batch_size > 1:
+            atexit.register(self._send_pending)
+            os.register_at_fork(after_in_child=self._reset_after_fork)
+
     @staticmethod
     def _parse_connection(re_patt, uri):
         match = re_patt.match(uri)
@@ -172,6 +248,49 @@ class CacheModule(BaseCacheModule):
     def _make_key(self, key):
         return self._prefix + key
 
+    def _zadd(self, target, key, score):
+        if VERSION[0] == 2:
+            target.zadd(self._keys_set, score, key)
+        else:
+            target.zadd(self._keys_set, {key: score})
+
+    def _send_pending(self):
+        # The lock also keeps the batches in order, so that an older value of a key is never written after a newer one
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._pending is not None:
+                display.vvvv(f'Writing facts of {self._pending_count} host(s) to redis')
+                pending = self._pending
+                self._pending = None
+                self._pending_count = 0
+                pending.execute()
+
+    def _send_pending_on_timer(self):
+        try:
+            self._send_pending()
+        except Exception as exc:
+            display.warning(f'Could not write facts to redis: {exc}')
+
+    def _reset_after_fork(self):
+        # Worker processes must not send the writes of the strategy, nor wait for a lock held by one of its threads
+        self._lock = threading.Lock()
+        self._pending = None
+        self._pending_count = 0
+        self._timer = None
+
+    def _encode(self, value):
+        if self._codec is None:
+            return json.dumps(value, cls=AnsibleJSONEncoder, sort_keys=True, indent=4)
+        return self._codec.encode(value)
+
+    def _decode(self, value):
+        # Values can have been written with any serializer, including by older versions of this plugin
+        if is_encoded(value):
+            return CacheCodec.decode(value)
+        return json.loads(value, cls=AnsibleJSONDecoder)
+
     def get(self, key):
 
         if key not in self._cache:
@@ -182,53 +301,99 @@ class CacheModule(BaseCacheModule):
             if value is None:
                 self.delete(key)
                 raise KeyError
-            self._cache[key] = json.loads(value, cls=AnsibleJSONDecoder)
+            self._cache[key] = self._decode(value)
 
         return self._cache.get(key)
 
     def set(self, key, value):
 
-        value2 = json.dumps(value, cls=AnsibleJSONEncoder, sort_keys=True, indent=4)
-        if self._timeout > 0:  # a timeout of 0 is handled as meaning 'never expire'
-            self._db.setex(self._make_key(key), int(self._timeout), value2)
-        else:
-            self._db.set(self._make_key(key), value2)
-
-        if VERSION[0] == 2:
-            self._db.zadd(self._keys_set, time.time(), key)
-        else:
-            self._db.zadd(self._keys_set, {key: time.time()})
+        value2 = self._encode(value)
+        with self._lock:
+            if self._pending is None:
+                # The value and the zset entry are written together in one round trip
+                self._pending = self._db.pipeline(transaction=False)
+                if self._batch_size > 1:
+                    self._timer = threading.Timer(self._batch_max_age, self._send_pending_on_timer)
+                    self._timer.daemon = True
+                    self._timer.start()
+            if self._timeout > 0:  # a timeout of 0 is handled as meaning 'never expire'
+                self._pending.setex(self._make_key(key), int(self._timeout), value2)
+            else:
+                self._pending.set(self._make_key(key), value2)
+            self._zadd(self._pending, key, time.time())
+            self._pending_count += 1
+            send = self._pending_count >= self._batch_size
         self._cache[key] = value
 
-    def _expire_keys(self):
+        if send:
+            self._send_pending()
+
+    def _expire_keys(self, pipe):
         if self._timeout > 0:
             expiry_age = time.time() - self._timeout
-            self._db.zremrangebyscore(self._keys_set, 0, expiry_age)
+            pipe.zremrangebyscore(self._keys_set, 0, expiry_age)
 
     def keys(self):
-        self._expire_keys()
-        return self._db.zrange(self._keys_set, 0, -1)
+        self._send_pending()
+        pipe = self._db.pipeline(transaction=False)
+        self._expire_keys(pipe)
+        pipe.zrange(self._keys_set, 0, -1)
+        return [to_text(key) for key in pipe.execute()[-1]]
 
     def contains(self, key):
-        self._expire_keys()
-        return (self._db.zrank(self._keys_set, key) is not None)
+        self._send_pending()
+        pipe = self._db.pipeline(transaction=False)
+        self._expire_keys(pipe)
+        pipe.zrank(self._keys_set, key)
+        return (pipe.execute()[-1] is not None)
 
     def delete(self, key):
+        self._send_pending()
         if key in self._cache:
             del self._cache[key]
-        self._db.delete(self._make_key(key))
-        self._db.zrem(self._keys_set, key)
+        pipe = self._db.pipeline(transaction=False)
+        pipe.delete(self._make_key(key))
+        pipe.zrem(self._keys_set, key)
+        pipe.execute()
 
     def flush(self):
-        for key in list(self.keys()):
-            self.delete(key)
+        self._send_pending()
+        self._cache = {}
+        if self._flush_script is None:
+            self._flush_script = self._db.register_script(FLUSH_SCRIPT)
+        try:
+            self._flush_script(keys=[self._keys_set], args=[self._prefix])
+            return
+        except ResponseError as exc:
+            # For example when scripting is disabled on the server
+            display.vvvv(f'Cannot flush redis cache with a script, deleting keys one chunk at a time: {exc}')
+        keys = self.keys()
+        for start in range(0, len(keys), CHUNK_SIZE):
+            chunk = keys[start:start + CHUNK_SIZE]
+            pipe = self._db.pipeline(transaction=False)
+            pipe.delete(*[self._make_key(key) for key in chunk])
+            pipe.zrem(self._keys_set, *chunk)
+            pipe.execute()
 
     def copy(self):
-        # TODO: there is probably a better way to do this in redis
-        ret = {k: self.get(k) for k in self.keys()}
-        return ret
+        keys = self.keys()
+        missing = set()
+        # Fetch the values that are not cached yet with one request per chunk instead of one per key
+        fetch = [key for key in keys if key not in self._cache]
+        for start in range(0, len(fetch), CHUNK_SIZE):
+            chunk = fetch[start:start + CHUNK_SIZE]
+            for key, value in zip(chunk, self._db.mget([self._make_key(key) for key in chunk])):
+                if value is None:
+                    # guard against the key not being removed from the zset, like get() does
+                    missing.add(key)
+                else:
+                    self._cache[key] = self._decode(value)
+        if missing:
+            self._db.zrem(self._keys_set, *missing)
+        return dict((key, self._cache[key]) for key in keys if key not in missing)
 
     def __getstate__(self):
+        self._send_pending()
         return dict()
 
     def __setstate__(self, data):
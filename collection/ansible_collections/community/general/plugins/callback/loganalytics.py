@@ -14,6 +14,8 @@ description:
   - This callback plugin will post task results in JSON formatted to an Azure Log Analytics workspace.
   - Credits to authors of splunk callback plugin.
 version_added: "2.4.0"
+extends_documentation_fragment:
+  - community.general.event_shipper
 requirements:
   - Whitelisting this callback plugin.
   - An Azure log analytics work space has been established.
@@ -36,6 +38,36 @@ options:
     ini:
       - section: callback_loganalytics
         key: shared_key
+  max_events_per_request:
+    env:
+      - name: LOGANALYTICS_MAX_EVENTS_PER_REQUEST
+    ini:
+      - section: callback_loganalytics
+        key: max_events_per_request
+  max_request_size:
+    env:
+      - name: LOGANALYTICS_MAX_REQUEST_SIZE
+    ini:
+      - section: callback_loganalytics
+        key: max_request_size
+  flush_interval:
+    env:
+      - name: LOGANALYTICS_FLUSH_INTERVAL
+    ini:
+      - section: callback_loganalytics
+        key: flush_interval
+  queue_size:
+    env:
+      - name: LOGANALYTICS_QUEUE_SIZE
+    ini:
+      - section: callback_loganalytics
+        key: queue_size
+  retries:
+    env:
+      - name: LOGANALYTICS_RETRIES
+    ini:
+      - section: callback_loganalytics
+        key: retries
 """
 
 EXAMPLES = r"""
@@ -63,6 +95,7 @@ import getpass
 from os.path import basename
 
 from ansible.module_utils.ansible_release import __version__ as ansible_version
+from ansible.module_utils.common.text.converters import to_bytes
 from ansible.module_utils.urls import open_url
 from ansible.parsing.ajson import AnsibleJSONEncoder
 from ansible.plugins.callback import CallbackBase
@@ -70,6 +103,7 @@ from ansible.plugins.callback import CallbackBase
 from ansible_collections.community.general.plugins.module_utils.datetime import (
     now,
 )
+from ansible_collections.community.general.plugins.plugin_utils.event_shipper import EventShipper
 
 
 class AzureLogAnalyticsSource(object):
@@ -80,6 +114,7 @@ class AzureLogAnalyticsSource(object):
         self.host = socket.gethostname()
         self.user = getpass.getuser()
         self.extra_vars = ""
+        self.shipper = None
 
     def __build_signature(self, date, workspace_id, shared_key, content_length):
         # Build authorisation signature for Azure log analytics API call
@@ -133,6 +168,11 @@ class AzureLogAnalyticsSource(object):
 
         # Preparing the playbook logs as JSON format and send to Azure log analytics
         jsondata = json.dumps({'event': data}, cls=AnsibleJSONEncoder, sort_keys=True)
+
+        if self.shipper is not None:
+            self.shipper.put(to_bytes(jsondata))
+            return
+
         content_length = len(jsondata)
         rfc1123date = self.__rfc1123date()
         signature = self.__build_signature(rfc1123date, workspace_id, shared_key, content_length)
@@ -150,6 +190,25 @@ class AzureLogAnalyticsSource(object):
             method='POST'
         )
 
+    def send_events(self, workspace_id, shared_key, events):
+        # The Data Collector API accepts a JSON array of records
+        body = b'[' + b','.join(events) + b']'
+        rfc1123date = self.__rfc1123date()
+        signature = self.__build_signature(rfc1123date, workspace_id, shared_key, len(body))
+        workspace_url = self.__build_workspace_url(workspace_id)
+
+        open_url(
+            workspace_url,
+            body,
+            headers={
+                'content-type': 'application/json',
+                'Authorization': signature,
+                'Log-Type': 'ansible_playbook',
+                'x-ms-date': rfc1123date
+            },
+            method='POST'
+        )
+
 
 class CallbackModule(CallbackBase):
     CALLBACK_VERSION = 2.0
@@ -174,6 +233,14 @@ class CallbackModule(CallbackBase):
         super(CallbackModule, self).set_options(task_keys=task_keys, var_options=var_options, direct=direct)
         self.workspace_id = self.get_option('workspace_id')
         self.shared_key = self.get_option('shared_key')
+        self.loganalytics.shipper = EventShipper(
+            lambda events, key: self.loganalytics.send_events(self.workspace_id, self.shared_key, events),
+            max_events=self.get_option('max_events_per_request'),
+            max_bytes=self.get_option('max_request_size'),
+            flush_interval=self.get_option('flush_interval'),
+            queue_size=self.get_option('queue_size'),
+            retries=self.get_option('retries'),
+        )
 
     def v2_playbook_on_play_start(self, play):
         vm = play.get_variable_manager()
@@ -233,3 +300,8 @@ class CallbackModule(CallbackBase):
             result,
             self._seconds_since_start(result)
         )
+
+    def v2_playbook_on_stats(self, stats):
+        if self.loganalytics.shipper is not None:
+            self.loganalytics.shipper.close()
+            self.loganalytics.shipper.report(self._display, 'Azure Log Analytics')
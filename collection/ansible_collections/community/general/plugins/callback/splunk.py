@@ -14,6 +14,8 @@ description:
   - This callback plugin will send task results as JSON formatted events to a Splunk HTTP collector.
   - The companion Splunk Monitoring & Diagnostics App is available here U(https://splunkbase.splunk.com/app/4023/).
   - Credit to "Ryan Currah (@ryancurrah)" for original source upon which this is based.
+extends_documentation_fragment:
+  - community.general.event_shipper
 requirements:
   - Whitelisting this callback plugin
   - 'Create a HTTP Event Collector in Splunk'
@@ -68,6 +70,48 @@ options:
         key: batch
     type: str
     version_added: 3.3.0
+  max_events_per_request:
+    env:
+      - name: SPLUNK_MAX_EVENTS_PER_REQUEST
+    ini:
+      - section: callback_splunk
+        key: max_events_per_request
+  max_request_size:
+    env:
+      - name: SPLUNK_MAX_REQUEST_SIZE
+    ini:
+      - section: callback_splunk
+        key: max_request_size
+  flush_interval:
+    env:
+      - name: SPLUNK_FLUSH_INTERVAL
+    ini:
+      - section: callback_splunk
+        key: flush_interval
+  queue_size:
+    env:
+      - name: SPLUNK_QUEUE_SIZE
+    ini:
+      - section: callback_splunk
+        key: queue_size
+  retries:
+    env:
+      - name: SPLUNK_RETRIES
+    ini:
+      - section: callback_splunk
+        key: retries
+  compress:
+    description:
+      - Whether to compress requests with gzip.
+      - O(max_request_size) is the size of the events before compression.
+    type: bool
+    default: true
+    env:
+      - name: SPLUNK_COMPRESS
+    ini:
+      - section: callback_splunk
+        key: compress
+    version_added: 11.1.0
 """
 
 EXAMPLES = r"""
@@ -84,6 +128,7 @@ examples: >-
     authtoken = f23blad6-5965-4537-bf69-5b5a545blabla88
 """
 
+import gzip
 import json
 import uuid
 import socket
@@ -92,6 +137,7 @@ import getpass
 from os.path import basename
 
 from ansible.module_utils.ansible_release import __version__ as ansible_version
+from ansible.module_utils.common.text.converters import to_bytes
 from ansible.module_utils.urls import open_url
 from ansible.parsing.ajson import AnsibleJSONEncoder
 from ansible.plugins.callback import CallbackBase
@@ -99,6 +145,7 @@ from ansible.plugins.callback import CallbackBase
 from ansible_collections.community.general.plugins.module_utils.datetime import (
     now,
 )
+from ansible_collections.community.general.plugins.plugin_utils.event_shipper import EventShipper
 
 
 class SplunkHTTPCollectorSource(object):
@@ -109,6 +156,7 @@ class SplunkHTTPCollectorSource(object):
         self.host = socket.gethostname()
         self.ip_address = socket.gethostbyname(socket.gethostname())
         self.user = getpass.getuser()
+        self.shipper = None
 
     def send_event(self, url, authtoken, validate_certs, include_milliseconds, batch, state, result, runtime):
         if result._task_fields['args'].get('_ansible_check_mode') is True:
@@ -150,6 +198,10 @@ class SplunkHTTPCollectorSource(object):
         # This wraps the json payload in and outer json event needed by Splunk
         jsondata = json.dumps({"event": data}, cls=AnsibleJSONEncoder, sort_keys=True)
 
+        if self.shipper is not None:
+            self.shipper.put(to_bytes(jsondata))
+            return
+
         open_url(
             url,
             jsondata,
@@ -161,6 +213,25 @@ class SplunkHTTPCollectorSource(object):
             validate_certs=validate_certs
         )
 
+    def send_events(self, url, authtoken, validate_certs, compress, events):
+        # The HTTP collector accepts several events in one request, one after the other
+        body = b'\n'.join(events)
+        headers = {
+            'Content-type': 'application/json',
+            'Authorization': f"Splunk {authtoken}"
+        }
+        if compress:
+            body = gzip.compress(body)
+            headers['Content-Encoding'] = 'gzip'
+
+        open_url(
+            url,
+            body,
+            headers=headers,
+            method='POST',
+            validate_certs=validate_certs
+        )
+
 
 class CallbackModule(CallbackBase):
     CALLBACK_VERSION = 2.0
@@ -215,6 +286,17 @@ class CallbackModule(CallbackBase):
 
         self.batch = self.get_option('batch')
 
+        if not self.disabled:
+            compress = self.get_option('compress')
+            self.splunk.shipper = EventShipper(
+                lambda events, key: self.splunk.send_events(self.url, self.authtoken, self.validate_certs, compress, events),
+                max_events=self.get_option('max_events_per_request'),
+                max_bytes=self.get_option('max_request_size'),
+                flush_interval=self.get_option('flush_interval'),
+                queue_size=self.get_option('queue_size'),
+                retries=self.get_option('retries'),
+            )
+
     def v2_playbook_on_start(self, playbook):
         self.splunk.ansible_playbook = basename(playbook._file_name)
 
@@ -283,3 +365,8 @@ class CallbackModule(CallbackBase):
             result,
             self._runtime(result)
         )
+
+    def v2_playbook_on_stats(self, stats):
+        if self.splunk.shipper is not None:
+            self.splunk.shipper.close()
+            self.splunk.shipper.report(self._display, 'Splunk HTTP collector')
@@ -12,6 +12,8 @@ short_description: Sends task result events to Sumologic
 author: "Ryan Currah (@ryancurrah)"
 description:
   - This callback plugin will send task results as JSON formatted events to a Sumologic HTTP collector source.
+extends_documentation_fragment:
+  - community.general.event_shipper
 requirements:
   - Whitelisting this callback plugin
   - 'Create a HTTP collector source in Sumologic and specify a custom timestamp format of V(yyyy-MM-dd HH:mm:ss ZZZZ) and
@@ -25,6 +27,48 @@ options:
     ini:
       - section: callback_sumologic
         key: url
+  max_events_per_request:
+    env:
+      - name: SUMOLOGIC_MAX_EVENTS_PER_REQUEST
+    ini:
+      - section: callback_sumologic
+        key: max_events_per_request
+  max_request_size:
+    env:
+      - name: SUMOLOGIC_MAX_REQUEST_SIZE
+    ini:
+      - section: callback_sumologic
+        key: max_request_size
+  flush_interval:
+    env:
+      - name: SUMOLOGIC_FLUSH_INTERVAL
+    ini:
+      - section: callback_sumologic
+        key: flush_interval
+  queue_size:
+    env:
+      - name: SUMOLOGIC_QUEUE_SIZE
+    ini:
+      - section: callback_sumologic
+        key: queue_size
+  retries:
+    env:
+      - name: SUMOLOGIC_RETRIES
+    ini:
+      - section: callback_sumologic
+        key: retries
+  compress:
+    description:
+      - Whether to compress requests with gzip.
+      - O(max_request_size) is the size of the events before compression.
+    type: bool
+    default: true
+    env:
+      - name: SUMOLOGIC_COMPRESS
+    ini:
+      - section: callback_sumologic
+        key: compress
+    version_added: 11.1.0
 """
 
 EXAMPLES = r"""
@@ -41,6 +85,7 @@ examples: |-
     url = https://endpoint1.collection.us2.sumologic.com/receiver/v1/http/R8moSv1d8EW9LAUFZJ6dbxCFxwLH6kfCdcBfddlfxCbLuL-BN5twcTpMk__pYy_cDmp==
 """
 
+import gzip
 import json
 import uuid
 import socket
@@ -49,6 +94,7 @@ import getpass
 from os.path import basename
 
 from ansible.module_utils.ansible_release import __version__ as ansible_version
+from ansible.module_utils.common.text.converters import to_bytes
 from ansible.module_utils.urls import open_url
 from ansible.parsing.ajson import AnsibleJSONEncoder
 from ansible.plugins.callback import CallbackBase
@@ -56,6 +102,7 @@ from ansible.plugins.callback import CallbackBase
 from ansible_collections.community.general.plugins.module_utils.datetime import (
     now,
 )
+from ansible_collections.community.general.plugins.plugin_utils.event_shipper import EventShipper
 
 
 class SumologicHTTPCollectorSource(object):
@@ -66,6 +113,7 @@ class SumologicHTTPCollectorSource(object):
         self.host = socket.gethostname()
         self.ip_address = socket.gethostbyname(socket.gethostname())
         self.user = getpass.getuser()
+        self.shipper = None
 
     def send_event(self, url, state, result, runtime):
         if result._task_fields['args'].get('_ansible_check_mode') is True:
@@ -96,9 +144,16 @@ class SumologicHTTPCollectorSource(object):
         data['ansible_task'] = result._task_fields
         data['ansible_result'] = result._result
 
+        jsondata = json.dumps(data, cls=AnsibleJSONEncoder, sort_keys=True)
+
+        if self.shipper is not None:
+            # Events are sent together with other events of the same host, so that they keep their X-Sumo-Host header
+            self.shipper.put(to_bytes(jsondata), key=data['ansible_host'])
+            return
+
         open_url(
             url,
-            data=json.dumps(data, cls=AnsibleJSONEncoder, sort_keys=True),
+            data=jsondata,
             headers={
                 'Content-type': 'application/json',
                 'X-Sumo-Host': data['ansible_host']
@@ -106,6 +161,24 @@ class SumologicHTTPCollectorSource(object):
             method='POST'
         )
 
+    def send_events(self, url, compress, events, ansible_host):
+        # The HTTP collector source accepts one event per line
+        body = b'\n'.join(events)
+        headers = {
+            'Content-type': 'application/json',
+            'X-Sumo-Host': ansible_host
+        }
+        if compress:
+            body = gzip.compress(body)
+            headers['Content-Encoding'] = 'gzip'
+
+        open_url(
+            url,
+            data=body,
+            headers=headers,
+            method='POST'
+        )
+
 
 class CallbackModule(CallbackBase):
     CALLBACK_VERSION = 2.0
@@ -138,6 +211,17 @@ class CallbackModule(CallbackBase):
                                   '`SUMOLOGIC_URL` environment variable or '
                                   'in the ansible.cfg file.')
 
+        if not self.disabled:
+            compress = self.get_option('compress')
+            self.sumologic.shipper = EventShipper(
+                lambda events, key: self.sumologic.send_events(self.url, compress, events, key),
+                max_events=self.get_option('max_events_per_request'),
+                max_bytes=self.get_option('max_request_size'),
+                flush_interval=self.get_option('flush_interval'),
+                queue_size=self.get_option('queue_size'),
+                retries=self.get_option('retries'),
+            )
+
     def v2_playbook_on_start(self, playbook):
         self.sumologic.ansible_playbook = basename(playbook._file_name)
 
@@ -186,3 +270,8 @@ class CallbackModule(CallbackBase):
             result,
             self._runtime(result)
         )
+
+    def v2_playbook_on_stats(self, stats):
+        if self.sumologic.shipper is not None:
+            self.sumologic.shipper.close()
+            self.sumologic.shipper.report(self._display, 'Sumologic HTTP collector')
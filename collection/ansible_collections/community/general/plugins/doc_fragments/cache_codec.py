@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025, Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+class ModuleDocFragment(object):
+
+    # Options for cache plugins that use community.general.plugin_utils.cache_codec
+    DOCUMENTATION = r"""
+options:
+  _serializer:
+    description:
+      - How the facts of a host are serialized before they are stored.
+      - V(json) stores them as compact JSON.
+      - V(msgpack) stores them in the binary MessagePack format, which is smaller and faster to read. It requires the
+        C(msgpack) Python library.
+      - Values stored with another serializer or compression can always be read, so this option can be changed at any time.
+    type: string
+    choices: [json, msgpack]
+    default: json
+    env:
+      - name: ANSIBLE_CACHE_PLUGIN_SERIALIZER
+    ini:
+      - key: fact_caching_serializer
+        section: defaults
+    version_added: 11.1.0
+  _compression:
+    description:
+      - How serialized facts that are larger than O(_compression_threshold) are compressed.
+      - V(zstd) requires the C(zstandard) Python library.
+    type: string
+    choices: [none, zlib, zstd]
+    default: none
+    env:
+      - name: ANSIBLE_CACHE_PLUGIN_COMPRESSION
+    ini:
+      - key: fact_caching_compression
+        section: defaults
+    version_added: 11.1.0
+  _compression_threshold:
+    description:
+      - The size in bytes from which serialized facts are compressed.
+    type: integer
+    default: 4096
+    env:
+      - name: ANSIBLE_CACHE_PLUGIN_COMPRESSION_THRESHOLD
+    ini:
+      - key: fact_caching_compression_threshold
+        section: defaults
+    version_added: 11.1.0
+"""
+
+    # Options for cache plugins that use community.general.plugin_utils.cache_codec, and that can still store facts
+    # in the format of their earlier versions
+    LEGACY = r"""
+options:
+  _serializer:
+    description:
+      - How the facts of a host are serialized before they are stored.
+      - V(legacy) stores them the same way as earlier versions of this plugin. Use it while older versions of this collection
+        share the cache.
+      - V(json) stores them as compact JSON.
+      - V(msgpack) stores them in the binary MessagePack format, which is smaller and faster to read. It requires the
+        C(msgpack) Python library.
+      - Values stored with another serializer or compression can always be read, so this option can be changed at any time.
+    type: string
+    choices: [legacy, json, msgpack]
+    default: legacy
+    env:
+      - name: ANSIBLE_CACHE_PLUGIN_SERIALIZER
+    ini:
+      - key: fact_caching_serializer
+        section: defaults
+    version_added: 11.1.0
+  _compression:
+    description:
+      - How serialized facts that are larger than O(_compression_threshold) are compressed.
+      - V(zstd) requires the C(zstandard) Python library.
+      - Ignored if O(_serializer=legacy).
+    type: string
+    choices: [none, zlib, zstd]
+    default: none
+    env:
+      - name: ANSIBLE_CACHE_PLUGIN_COMPRESSION
+    ini:
+      - key: fact_caching_compression
+        section: defaults
+    version_added: 11.1.0
+  _compression_threshold:
+    description:
+      - The size in bytes from which serialized facts are compressed.
+    type: integer
+    default: 4096
+    env:
+      - name: ANSIBLE_CACHE_PLUGIN_COMPRESSION_THRESHOLD
+    ini:
+      - key: fact_caching_compression_threshold
+        section: defaults
+    version_added: 11.1.0
+"""
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025, Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+class ModuleDocFragment(object):
+
+    # Options for callback plugins that use community.general.plugin_utils.event_shipper.
+    # The plugins add the env and ini entries of these options.
+    DOCUMENTATION = r"""
+options:
+  max_events_per_request:
+    description:
+      - The maximum number of events that are sent with one request.
+      - Events are sent by a background thread, so that Ansible does not wait for the server. The remaining events are
+        sent when the playbook finishes.
+    type: int
+    default: 100
+    version_added: 11.1.0
+  max_request_size:
+    description:
+      - The maximum size in bytes of the events that are sent with one request.
+    type: int
+    default: 1048576
+    version_added: 11.1.0
+  flush_interval:
+    description:
+      - The maximum number of seconds an event waits to be sent together with other events.
+    type: float
+    default: 1.0
+    version_added: 11.1.0
+  queue_size:
+    description:
+      - The maximum number of events that wait to be sent. Further events are dropped with a warning at the end of the
+        playbook.
+    type: int
+    default: 10000
+    version_added: 11.1.0
+  retries:
+    description:
+      - How often a failed request is retried, waiting one second before the first retry and twice as long before each
+        further retry.
+      - Events of requests that still fail are dropped.
+    type: int
+    default: 3
+    version_added: 11.1.0
+"""
@@ -0,0 +1,134 @@
+# Copyright (c) 2025, Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import json
+import zlib
+
+from ansible.errors import AnsibleError
+from ansible.module_utils.common.text.converters import to_bytes
+from ansible.parsing.ajson import AnsibleJSONEncoder, AnsibleJSONDecoder
+
+try:
+    import msgpack
+    HAS_MSGPACK = True
+except ImportError:
+    HAS_MSGPACK = False
+
+try:
+    import zstandard
+    HAS_ZSTANDARD = True
+except ImportError:
+    HAS_ZSTANDARD = False
+
+
+# Encoded values start with this byte, which neither JSON nor a pickle can start with,
+# followed by the format version, the serializer and the compression
+MAGIC = b'\x00'
+VERSION = b'1'
+HEADER_LENGTH = 4
+
+SERIALIZERS = {
+    'json': b'j',
+    'msgpack': b'm',
+}
+
+COMPRESSIONS = {
+    'none': b'-',
+    'zlib': b'z',
+    'zstd': b's',
+}
+
+
+def _get_name(ids, value_id):
+    for name, known_id in ids.items():
+        if known_id == value_id:
+            return name
+    raise AnsibleError('Cannot decode cached value: unknown format {0!r}'.format(value_id))
+
+
+def _check_serializer(serializer):
+    if serializer == 'msgpack' and not HAS_MSGPACK:
+        raise AnsibleError("The 'msgpack' python module is required to read and write cached values with the msgpack serializer, 'pip install msgpack'")
+
+
+def _check_compression(compression):
+    if compression == 'zstd' and not HAS_ZSTANDARD:
+        raise AnsibleError("The 'zstandard' python module is required to read and write cached values with zstd compression, 'pip install zstandard'")
+
+
+def is_encoded(data):
+    '''
+    Whether ``data`` is a value written by ``CacheCodec.encode()``, and not a value written by an older version of a cache plugin.
+    '''
+    return isinstance(data, bytes) and data[:2] == MAGIC + VERSION
+
+
+class CacheCodec(object):
+    '''
+    Serializes cached values, and compresses them when they are larger than ``compression_threshold`` bytes.
+
+    Every encoded value records how it was encoded, so values written with other settings can still be decoded.
+    '''
+
+    def __init__(self, serializer='json', compression='none', compression_threshold=4096):
+        if serializer not in SERIALIZERS:
+            raise AnsibleError('Unknown serializer {0!r} for cached values'.format(serializer))
+        if compression not in COMPRESSIONS:
+            raise AnsibleError('Unknown compression {0!r} for cached values'.format(compression))
+        _check_serializer(serializer)
+        _check_compression(compression)
+        self.serializer = serializer
+        self.compression = compression
+        self.compression_threshold = compression_threshold
+
+    def _serialize(self, value):
+        if self.serializer == 'msgpack':
+            return msgpack.packb(value, default=AnsibleJSONEncoder().default, use_bin_type=True)
+        return to_bytes(json.dumps(value, cls=AnsibleJSONEncoder, sort_keys=True, separators=(',', ':')), errors='surrogate_or_strict')
+
+    @staticmethod
+    def _deserialize(serializer, payload):
+        _check_serializer(serializer)
+        if serializer == 'msgpack':
+            return msgpack.unpackb(payload, raw=False, strict_map_key=False, object_hook=AnsibleJSONDecoder().object_hook)
+        return json.loads(payload, cls=AnsibleJSONDecoder)
+
+    def _compress(self, payload):
+        if self.compression == 'zlib':
+            return zlib.compress(payload)
+        return zstandard.ZstdCompressor().compress(payload)
+
+    @staticmethod
+    def _decompress(compression, payload):
+        _check_compression(compression)
+        if compression == 'zlib':
+            return zlib.decompress(payload)
+        if compression == 'zstd':
+            return zstandard.ZstdDecompressor().decompress(payload)
+        return payload
+
+    def encode(self, value):
+        payload = self._serialize(value)
+        compression = 'none'
+        if self.compression != 'none' and len(payload) >= self.compression_threshold:
+            compressed = self._compress(payload)
+            # Incompressible values are stored as they are
+            if len(compressed) < len(payload):
+                payload = compressed
+                compression = self.compression
+        return MAGIC + VERSION + SERIALIZERS[self.serializer] + COMPRESSIONS[compression] + payload
+
+    @classmethod
+    def decode(cls, data):
+        '''
+        Decode a value written by ``encode()``, no matter which serializer and compression were used.
+        '''
+        if not is_encoded(data):
+            raise AnsibleError('Cannot decode cached value: it was not written by this cache plugin version')
+        serializer = _get_name(SERIALIZERS, data[2:3])
+        compression = _get_name(COMPRESSIONS, data[3:4])
+        return cls._deserialize(serializer, cls._decompress(compression, data[HEADER_LENGTH:]))
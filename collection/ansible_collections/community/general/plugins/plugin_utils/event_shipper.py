@@ -0,0 +1,168 @@
+# Copyright (c) 2025, Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import atexit
+import queue
+import threading
+import time
+
+
+_STOP = object()
+
+
+class EventShipper(object):
+    '''
+    Sends events from a background thread, so that callbacks do not have to wait for the server.
+
+    Events are collected in a queue of at most ``queue_size`` events, and are passed to ``send(events, key)`` in batches.
+    Only events with the same ``key`` are sent together. A batch is sent once it has ``max_events`` events, once it would
+    grow beyond ``max_bytes`` bytes, or once its first event is ``flush_interval`` seconds old. If ``send`` raises an
+    exception, it is called again up to ``retries`` times, waiting ``backoff`` seconds and twice as long after every
+    failure. Events that do not fit into the queue, or whose batch could not be sent, are dropped. While batches cannot be
+    sent, the following batches are only tried once.
+    '''
+
+    def __init__(self, send, max_events=100, max_bytes=1048576, flush_interval=1.0, queue_size=10000, retries=3, backoff=1.0):
+        self._send = send
+        self._max_events = max(1, max_events)
+        self._max_bytes = max_bytes
+        self._flush_interval = flush_interval
+        self._retries = retries
+        self._backoff = backoff
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._start = None
+        self._end = None
+        self.stats = {
+            'queued': 0,
+            'sent': 0,
+            'dropped': 0,
+            'requests': 0,
+            'retries': 0,
+            'bytes': 0,
+        }
+        self.last_error = None
+        self._failing = False
+
+    def _count(self, name, value=1):
+        with self._lock:
+            self.stats[name] += value
+
+    def put(self, event, key=None):
+        '''
+        Queue ``event`` (bytes) to be sent, without waiting. Returns whether it was queued.
+        '''
+        if self._thread is None or not self._thread.is_alive():
+            if self._thread is None:
+                self._start = time.time()
+                # Events that are still queued when Ansible exits without reporting stats are sent as well
+                atexit.register(self.close)
+            self._end = None
+            self._thread = threading.Thread(target=self._run, name='event shipper')
+            self._thread.daemon = True
+            self._thread.start()
+        try:
+            self._queue.put_nowait((key, event))
+        except queue.Full:
+            self._count('dropped')
+            return False
+        self._count('queued')
+        return True
+
+    def _run(self):
+        # The events, size and time of the first event of the batches that have not been sent yet, by key
+        batches = {}
+        while True:
+            timeout = None
+            if batches:
+                oldest = min(batch[2] for batch in batches.values())
+                timeout = max(0, oldest + self._flush_interval - time.time())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                for key, batch in batches.items():
+                    self._send_batch(key, batch[0], batch[1])
+                return
+
+            if item is not None:
+                key, event = item
+                batch = batches.get(key)
+                if batch is not None and batch[1] + len(event) > self._max_bytes:
+                    self._send_batch(key, batch[0], batch[1])
+                    batch = None
+                if batch is None:
+                    batch = batches[key] = [[], 0, time.time()]
+                batch[0].append(event)
+                batch[1] += len(event)
+                if len(batch[0]) >= self._max_events or batch[1] >= self._max_bytes:
+                    del batches[key]
+                    self._send_batch(key, batch[0], batch[1])
+
+            now = time.time()
+            for key, batch in list(batches.items()):
+                if now - batch[2] >= self._flush_interval:
+                    del batches[key]
+                    self._send_batch(key, batch[0], batch[1])
+
+    def _send_batch(self, key, events, size):
+        # Once a batch could not be sent at all, do not wait for retries until the server accepts events again
+        retries = 0 if self._failing else self._retries
+        for attempt in range(retries + 1):
+            if attempt:
+                self._count('retries')
+                time.sleep(self._backoff * 2 ** (attempt - 1))
+            try:
+                self._send(events, key)
+            except Exception as e:
+                self.last_error = e
+                continue
+            self._failing = False
+            with self._lock:
+                self.stats['sent'] += len(events)
+                self.stats['requests'] += 1
+                self.stats['bytes'] += size
+            return
+        self._failing = True
+        self._count('dropped', len(events))
+
+    def close(self, timeout=None):
+        '''
+        Send all queued events and stop the background thread.
+
+        Returns the statistics.
+        '''
+        if self._thread is not None:
+            thread = self._thread
+            if thread.is_alive():
+                self._queue.put(_STOP)
+                thread.join(timeout)
+            self._end = time.time()
+        return self.stats
+
+    def get_summary(self):
+        stats = self.stats
+        duration = ((self._end or time.time()) - self._start) if self._start is not None else 0
+        rate = stats['sent'] / duration if duration > 0 else 0
+        return (
+            f"sent {stats['sent']} events ({stats['bytes']} bytes) in {stats['requests']} requests, "
+            f"{rate:.1f} events/s, {stats['retries']} retries, dropped {stats['dropped']} events"
+        )
+
+    def report(self, display, name):
+        '''
+        Show the summary with ``display``, and warn if events were dropped.
+        '''
+        display.vv(f'{name}: {self.get_summary()}')
+        if self.stats['dropped']:
+            msg = f"{name}: {self.stats['dropped']} events could not be sent"
+            if self.last_error is not None:
+                msg += f', last error: {self.last_error}'
+            display.warning(msg)
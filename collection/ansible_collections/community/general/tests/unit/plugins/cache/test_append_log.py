@@ -0,0 +1,160 @@
+# Copyright (c) 2025, Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import os
+import threading
+import time
+
+import pytest
+
+from ansible.errors import AnsibleError
+from ansible.plugins.loader import cache_loader
+
+from ansible_collections.community.general.plugins.cache import append_log
+from ansible_collections.community.general.plugins.cache.append_log import CacheModule as AppendLogCache
+
+
+def get_cache(path, **kwargs):
+    cache = cache_loader.get('community.general.append_log', _uri=str(path), **kwargs)
+    # Newer ansible-core versions wrap cache plugins to encode keys and values
+    cache = getattr(cache, '__wrapped__', cache)
+    assert isinstance(cache, AppendLogCache)
+    return cache
+
+
+def test_append_log_cachemodule(tmp_path):
+    cache = get_cache(tmp_path)
+    cache.set('host1', {'a': 1})
+    cache.set('host2', {'b': [1, 2]})
+    cache.set('host1', {'a': 2})
+    cache.set('host3', {})
+    cache.delete('host3')
+    assert sorted(os.listdir(str(tmp_path))) == ['ansible_facts.log', 'ansible_facts.log.lock']
+
+    other = get_cache(tmp_path)
+    assert sorted(other.keys()) == ['host1', 'host2']
+    # Facts are only read once they are needed
+    assert other._cache == {}
+    assert other.contains('host2')
+    assert not other.contains('host3')
+    assert other.get('host1') == {'a': 2}
+    with pytest.raises(KeyError):
+        other.get('host3')
+    assert other.copy() == {'host1': {'a': 2}, 'host2': {'b': [1, 2]}}
+
+    # Changes by other processes are picked up
+    cache.set('host4', {'d': 4})
+    cache.delete('host2')
+    assert sorted(other.keys()) == ['host1', 'host4']
+    assert other.get('host4') == {'d': 4}
+
+    other.flush()
+    assert other.keys() == []
+    assert cache.keys() == []
+    cache.set('host5', {})
+    assert other.keys() == ['host5']
+
+
+def test_append_log_cachemodule_timeout(tmp_path, monkeypatch):
+    now = [1700000000.0]
+    monkeypatch.setattr('time.time', lambda: now[0])
+    cache = get_cache(tmp_path, _timeout=100)
+    cache.set('host1', {})
+    now[0] += 50
+    cache.set('host2', {})
+    now[0] += 60
+    assert cache.keys() == ['host2']
+    assert not cache.contains('host1')
+    assert get_cache(tmp_path, _timeout=0).keys() == ['host1', 'host2']
+
+
+def test_append_log_cachemodule_interrupted_write(tmp_path):
+    cache = get_cache(tmp_path)
+    cache.set('host1', {'a': 1})
+    cache.set('host2', {'a': 2})
+    path = os.path.join(str(tmp_path), 'ansible_facts.log')
+    size = os.path.getsize(path)
+    with open(path, 'r+b') as f:
+        f.truncate(size - 3)
+
+    other = get_cache(tmp_path)
+    assert other.keys() == ['host1']
+    other.set('host3', {'a': 3})
+    assert sorted(get_cache(tmp_path).copy().items()) == [('host1', {'a': 1}), ('host3', {'a': 3})]
+
+
+def test_append_log_cachemodule_corrupted(tmp_path):
+    cache = get_cache(tmp_path)
+    cache.set('host1', {'a': 'value'})
+    path = os.path.join(str(tmp_path), 'ansible_facts.log')
+    with open(path, 'r+b') as f:
+        data = f.read()
+        f.seek(data.index(b'value'))
+        f.write(b'VALUE')
+    with pytest.raises(AnsibleError, match='corrupted'):
+        get_cache(tmp_path).get('host1')
+
+    with open(path, 'wb') as f:
+        f.write(b'something else')
+    with pytest.raises(AnsibleError, match='is not a cache file'):
+        get_cache(tmp_path).keys()
+
+
+def test_append_log_cachemodule_compaction(tmp_path, monkeypatch):
+    monkeypatch.setattr(append_log, 'COMPACT_MIN_SIZE', 10000)
+    cache = get_cache(tmp_path)
+    other = get_cache(tmp_path)
+    for index in range(200):
+        cache.set('host%d' % (index % 10), {'index': index, 'data': 'x' * 100})
+        if cache._compaction is not None:
+            cache._compaction.join()
+    path = os.path.join(str(tmp_path), 'ansible_facts.log')
+    assert os.path.getsize(path) < 10000
+    assert sorted(os.listdir(str(tmp_path))) == ['ansible_facts.log', 'ansible_facts.log.lock']
+    assert other.copy() == dict(('host%d' % index, {'index': 190 + index, 'data': 'x' * 100}) for index in range(10))
+
+
+@pytest.mark.filterwarnings('ignore::DeprecationWarning')
+def test_append_log_cachemodule_fork(tmp_path):
+    cache = get_cache(tmp_path)
+    cache.set('host1', {'a': 1})
+    locked = threading.Event()
+
+    def compact():
+        # Holds the locks like a compaction thread
+        with cache._lock:
+            cache._lock_file()
+            try:
+                locked.set()
+                time.sleep(0.2)
+            finally:
+                cache._unlock_file()
+
+    thread = threading.Thread(target=compact)
+    thread.start()
+    assert locked.wait(5)
+    pid = os.fork()
+    if pid == 0:
+        try:
+            cache.set('host2', {'b': 2})
+            os._exit(0 if cache.get('host1') == {'a': 1} else 1)
+        except BaseException:
+            os._exit(2)
+    thread.join()
+
+    deadline = time.time() + 10
+    while True:
+        finished, status = os.waitpid(pid, os.WNOHANG)
+        if finished or time.time() > deadline:
+            break
+        time.sleep(0.05)
+    if not finished:
+        os.kill(pid, 9)
+        os.waitpid(pid, 0)
+    # The worker neither waits for locks held by threads of the parent, nor shares the file lock with it
+    assert finished and os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0
+    assert sorted(get_cache(tmp_path).keys()) == ['host1', 'host2']
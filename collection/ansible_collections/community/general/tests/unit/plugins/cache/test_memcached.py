@@ -11,8 +11,191 @@ import pytest
 pytest.importorskip('memcache')
 
 from ansible.plugins.loader import cache_loader
+from ansible_collections.community.general.plugins.cache import memcached
 from ansible_collections.community.general.plugins.cache.memcached import CacheModule as MemcachedCache
 
 
 def test_memcached_cachemodule():
     assert isinstance(cache_loader.get('community.general.memcached'), MemcachedCache)
+
+
+class FakeClient(object):
+    data = {}
+    versions = {}
+    max_value_length = 1024 * 1024
+
+    def __init__(self, *args, **kwargs):
+        self.cas_ids = {}
+
+    def _store(self, key, value):
+        if len(value) > self.max_value_length:
+            return False
+        self.data[key] = value
+        self.versions[key] = self.versions.get(key, 0) + 1
+        return True
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def gets(self, key):
+        self.cas_ids[key] = self.versions.get(key)
+        return self.data.get(key)
+
+    def get_multi(self, keys):
+        return dict((key, self.data[key]) for key in keys if key in self.data)
+
+    def set(self, key, value, time=0, min_compress_len=0):
+        self.data[key] = value
+        return True
+
+    def add(self, key, value, time=0):
+        if key in self.data:
+            return False
+        return self._store(key, value)
+
+    def append(self, key, value):
+        if key not in self.data:
+            return False
+        return self._store(key, self.data[key] + value)
+
+    def cas(self, key, value, time=0):
+        if key in self.data and self.versions.get(key) != self.cas_ids.get(key):
+            return False
+        return self._store(key, value)
+
+    def delete(self, key):
+        self.data.pop(key, None)
+        return True
+
+    def delete_multi(self, keys):
+        for key in keys:
+            self.data.pop(key, None)
+        return True
+
+
+@pytest.fixture
+def fake_client(monkeypatch):
+    monkeypatch.setattr(FakeClient, 'data', {})
+    monkeypatch.setattr(FakeClient, 'versions', {})
+    monkeypatch.setattr('memcache.Client', FakeClient)
+    return FakeClient
+
+
+def get_cache(**kwargs):
+    cache = cache_loader.get('community.general.memcached', **kwargs)
+    # Newer ansible-core versions wrap cache plugins to encode keys and values
+    return getattr(cache, '__wrapped__', cache)
+
+
+def test_memcached_cachemodule_codec(fake_client):
+    facts = {'ansible_mounts': [{'mount': '/', 'options': 'rw,relatime'}] * 100}
+
+    legacy = get_cache()
+    legacy.set('host1', facts)
+    assert fake_client.data['ansible_factshost1'] == facts
+
+    cache = get_cache(_serializer='json', _compression='zlib', _compression_threshold=100)
+    cache.set('host2', facts)
+    assert isinstance(fake_client.data['ansible_factshost2'], bytes)
+    assert len(fake_client.data['ansible_factshost2']) < 200
+
+    reader = get_cache()
+    assert reader.get('host1') == facts
+    assert reader.get('host2') == facts
+
+
+def test_memcached_cachemodule_index(fake_client, monkeypatch):
+    now = [1700000000.0]
+    monkeypatch.setattr('time.time', lambda: now[0])
+
+    cache = get_cache(_timeout=3600)
+    for index in range(100):
+        cache.set('host%d' % index, {'index': index})
+        now[0] += 1
+    # Every write appends one line to the index
+    index_size = sum(len(value) for key, value in fake_client.data.items() if key.startswith('ansible_cache_keys'))
+    assert index_size < 100 * 40
+
+    cache.delete('host0')
+    cache.set('host1', {'index': 'again'})
+    reader = get_cache(_timeout=3600)
+    assert sorted(reader.keys()) == sorted('host%d' % index for index in range(1, 100))
+    assert reader.contains('host1')
+    assert not reader.contains('host0')
+    assert reader.copy()['host1'] == {'index': 'again'}
+
+    # Entries older than the timeout are not part of the index anymore
+    now[0] += 3600 - 50
+    assert sorted(get_cache(_timeout=3600).keys()) == sorted(['host1'] + ['host%d' % index for index in range(51, 100)])
+    now[0] += 3600
+    assert get_cache(_timeout=3600).keys() == []
+
+
+def test_memcached_cachemodule_index_legacy(fake_client, monkeypatch):
+    monkeypatch.setattr('time.time', lambda: 1700000000.0)
+    # The index written by older versions of this plugin
+    fake_client.data['ansible_cache_keys'] = {'old1': 1700000000.0 - 10, 'old2': 1700000000.0 - 100000}
+    fake_client.data['ansible_factsold1'] = {'old': 1}
+
+    cache = get_cache()
+    cache.set('new', {'new': 1})
+    assert sorted(cache.keys()) == ['new', 'old1']
+    assert get_cache().copy() == {'new': {'new': 1}, 'old1': {'old': 1}}
+
+    cache.flush()
+    assert cache.keys() == []
+    assert fake_client.data == {}
+
+
+def test_memcached_cachemodule_index_permanent(fake_client, monkeypatch):
+    now = [1700000000.0]
+    monkeypatch.setattr('time.time', lambda: now[0])
+    cache = get_cache(_timeout=0)
+    cache.set('host1', {})
+    now[0] += 10 * 86400
+    cache.set('host2', {})
+    assert sorted(get_cache(_timeout=0).keys()) == ['host1', 'host2']
+
+
+def test_memcached_cachemodule_index_permanent_compaction(fake_client, monkeypatch):
+    cache = get_cache(_timeout=0)
+    for dummy in range(100):
+        for index in range(20):
+            cache.set('host%d' % index, {})
+        cache.delete('host0')
+    cache.set('host0', {})
+    cache.delete('host1')
+
+    # The log of every shard is rewritten with the latest changes, and does not grow with every change
+    shards = [value for key, value in fake_client.data.items() if key.startswith('ansible_cache_keys_permanent_')]
+    assert shards
+    assert all(len(shard.splitlines()) < memcached.CacheModuleKeys.COMPACT_INTERVAL + 20 for shard in shards)
+    assert sorted(get_cache(_timeout=0).keys()) == sorted('host%d' % index for index in range(20) if index != 1)
+
+    # A shard that exceeds the maximum size of a memcached value is rewritten as well
+    monkeypatch.setattr(FakeClient, 'max_value_length', max(len(shard) for shard in shards) + 30)
+    for dummy in range(50):
+        cache.set('host2', {})
+    assert 'host2' in get_cache(_timeout=0).keys()
+
+
+def test_memcached_cachemodule_index_permanent_legacy(fake_client):
+    fake_client.data['ansible_cache_keys'] = {'old': 1700000000.0}
+    cache = get_cache(_timeout=0)
+    cache.delete('old')
+    for dummy in range(memcached.CacheModuleKeys.COMPACT_INTERVAL):
+        cache.set('old2', {})
+    # Removals of keys in the index written by older versions of this plugin are kept
+    assert cache.keys() == ['old2']
+
+
+def test_memcached_cachemodule_index_failure(fake_client, monkeypatch):
+    warning = []
+    monkeypatch.setattr(memcached.display, 'warning', warning.append)
+    monkeypatch.setattr(FakeClient, 'max_value_length', 10)
+    cache = get_cache(_timeout=0)
+    cache.set('host1', {})
+    cache.delete('host1')
+    assert len(warning) == 2
+    assert 'host1 may be missing from the cached hosts' in warning[0]
+    assert 'host1 may still be listed in the cached hosts' in warning[1]
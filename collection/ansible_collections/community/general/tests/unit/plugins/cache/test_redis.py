@@ -6,6 +6,8 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
+import time
+
 import pytest
 
 pytest.importorskip('redis')
@@ -24,3 +26,107 @@ def test_redis_cachemodule():
     # The _uri option is required for the redis plugin
     connection = '[::1]:6379:1'
     assert isinstance(cache_loader.get('community.general.redis', **{'_uri': connection}), RedisCache)
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    fakeredis = pytest.importorskip('fakeredis')
+    server = fakeredis.FakeServer()
+
+    def connect(*args, **kwargs):
+        return fakeredis.FakeStrictRedis(server=server)
+
+    monkeypatch.setattr('ansible_collections.community.general.plugins.cache.redis.StrictRedis', connect)
+    return connect()
+
+
+def get_cache(**kwargs):
+    kwargs['_uri'] = '127.0.0.1:6379:0'
+    cache = cache_loader.get('community.general.redis', **kwargs)
+    # Newer ansible-core versions wrap cache plugins to encode keys and values
+    return getattr(cache, '__wrapped__', cache)
+
+
+def test_redis_cachemodule_roundtrip(fake_redis):
+    cache = get_cache()
+    cache.set('host1', {'a': 1})
+    cache.set('host2', {'b': [1, 2]})
+    assert fake_redis.get('ansible_factshost1') is not None
+
+    other = get_cache()
+    assert sorted(other.keys()) == ['host1', 'host2']
+    assert other.contains('host1')
+    assert not other.contains('host3')
+    assert other.get('host2') == {'b': [1, 2]}
+    assert other.copy() == {'host1': {'a': 1}, 'host2': {'b': [1, 2]}}
+
+    # A value that expired before its entry in the keyset is skipped
+    fake_redis.delete('ansible_factshost1')
+    third = get_cache()
+    assert third.copy() == {'host2': {'b': [1, 2]}}
+    assert third.keys() == ['host2']
+
+    other.delete('host2')
+    assert other.keys() == []
+    assert fake_redis.get('ansible_factshost2') is None
+
+
+def test_redis_cachemodule_batch(fake_redis):
+    cache = get_cache(_batch_size=3, _batch_max_age=60)
+    cache.set('host1', {'a': 1})
+    cache.set('host2', {'a': 2})
+    assert fake_redis.zcard('ansible_cache_keys') == 0
+    assert cache.get('host1') == {'a': 1}
+    cache.set('host3', {'a': 3})
+    assert fake_redis.zcard('ansible_cache_keys') == 3
+
+    cache.set('host4', {'a': 4})
+    assert fake_redis.zcard('ansible_cache_keys') == 3
+    # Listing the keys sends the pending writes first
+    assert sorted(cache.keys()) == ['host1', 'host2', 'host3', 'host4']
+
+
+def test_redis_cachemodule_batch_max_age(fake_redis):
+    cache = get_cache(_batch_size=100, _batch_max_age=0.05)
+    cache.set('host1', {'a': 1})
+    assert fake_redis.zcard('ansible_cache_keys') == 0
+    # The facts are written without waiting for another write
+    deadline = time.time() + 5
+    while fake_redis.zcard('ansible_cache_keys') == 0 and time.time() < deadline:
+        time.sleep(0.01)
+    assert fake_redis.zcard('ansible_cache_keys') == 1
+    assert cache._pending is None
+
+
+def test_redis_cachemodule_flush(fake_redis):
+    cache = get_cache()
+    for index in range(2500):
+        cache.set('host%d' % index, {'index': index})
+    fake_redis.set('other', 'value')
+    cache.flush()
+    assert cache.keys() == []
+    assert fake_redis.keys() == [b'other']
+
+
+@pytest.mark.parametrize('serializer, compression', [
+    ('json', 'none'),
+    ('json', 'zlib'),
+    ('msgpack', 'zlib'),
+])
+def test_redis_cachemodule_codec(fake_redis, serializer, compression):
+    if serializer == 'msgpack':
+        pytest.importorskip('msgpack')
+    facts = {'ansible_mounts': [{'mount': '/', 'options': 'rw,relatime'}] * 100}
+    legacy = get_cache()
+    legacy.set('host1', facts)
+
+    cache = get_cache(_serializer=serializer, _compression=compression, _compression_threshold=100)
+    cache.set('host2', facts)
+    ratio = len(fake_redis.get('ansible_factshost2')) / len(fake_redis.get('ansible_factshost1'))
+    assert ratio < (0.1 if compression != 'none' else 0.7)
+
+    # Entries are readable no matter how they were written
+    for reader in (get_cache(), get_cache(_serializer=serializer, _compression=compression)):
+        assert reader.get('host1') == facts
+        assert reader.get('host2') == facts
+        assert reader.copy() == {'host1': facts, 'host2': facts}
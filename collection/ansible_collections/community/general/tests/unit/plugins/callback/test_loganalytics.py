@@ -64,3 +64,18 @@ class TestAzureLogAnalytics(unittest.TestCase):
 
         self.assertRegex(headers['Authorization'], r'^SharedKey 01234567-0123-0123-0123-01234567890a:.*=$')
         self.assertEqual(headers['Log-Type'], 'ansible_playbook')
+
+    @patch('ansible_collections.community.general.plugins.callback.loganalytics.now')
+    @patch('ansible_collections.community.general.plugins.callback.loganalytics.open_url')
+    def test_send_events(self, open_url_mock, mock_now):
+        mock_now.return_value = datetime(2020, 12, 1)
+
+        self.loganalytics.send_events(workspace_id='01234567-0123-0123-0123-01234567890a',
+                                      shared_key='dZD0kCbKl3ehZG6LHFMuhtE0yHiFCmetzFMc2u+roXIUQuatqU924SsAAAAPemhjbGlAemhjbGktTUJQAQIDBA==',
+                                      events=[b'{"event": {"uuid": "a"}}', b'{"event": {"uuid": "b"}}'])
+
+        args, kwargs = open_url_mock.call_args
+        sent_data = json.loads(args[1])
+
+        self.assertEqual([record['event']['uuid'] for record in sent_data], ['a', 'b'])
+        self.assertRegex(kwargs['headers']['Authorization'], r'^SharedKey 01234567-0123-0123-0123-01234567890a:.*=$')
@@ -11,6 +11,7 @@ from ansible_collections.community.internal_test_tools.tests.unit.compat.mock im
 from ansible_collections.community.general.plugins.callback.splunk import SplunkHTTPCollectorSource
 from datetime import datetime
 
+import gzip
 import json
 
 
@@ -62,3 +63,34 @@ class TestSplunkClient(unittest.TestCase):
         self.assertEqual(sent_data['event']['timestamp'], '2020-12-01 00:00:00 +0000')
         self.assertEqual(sent_data['event']['host'], 'my-host')
         self.assertEqual(sent_data['event']['ip_address'], '1.2.3.4')
+
+    @patch('ansible_collections.community.general.plugins.callback.splunk.now')
+    @patch('ansible_collections.community.general.plugins.callback.splunk.open_url')
+    def test_send_event_with_shipper(self, open_url_mock, mock_now):
+        mock_now.return_value = datetime(2020, 12, 1)
+        result = TaskResult(host=self.mock_host, task=self.mock_task, return_data={}, task_fields=self.task_fields)
+        self.splunk.shipper = Mock()
+
+        self.splunk.send_event(
+            url='endpoint', authtoken='token', validate_certs=False, include_milliseconds=False,
+            batch=None, state='OK', result=result, runtime=100
+        )
+
+        open_url_mock.assert_not_called()
+        args, kwargs = self.splunk.shipper.put.call_args
+        self.assertEqual(json.loads(args[0])['event']['status'], 'OK')
+
+    @patch('ansible_collections.community.general.plugins.callback.splunk.open_url')
+    def test_send_events(self, open_url_mock):
+        self.splunk.send_events(url='endpoint', authtoken='token', validate_certs=False, compress=True, events=[b'{"event": 1}', b'{"event": 2}'])
+
+        args, kwargs = open_url_mock.call_args
+        self.assertEqual(gzip.decompress(args[1]), b'{"event": 1}\n{"event": 2}')
+        self.assertEqual(kwargs['headers']['Content-Encoding'], 'gzip')
+        self.assertEqual(kwargs['headers']['Authorization'], 'Splunk token')
+
+        self.splunk.send_events(url='endpoint', authtoken='token', validate_certs=False, compress=False, events=[b'{"event": 1}'])
+
+        args, kwargs = open_url_mock.call_args
+        self.assertEqual(args[1], b'{"event": 1}')
+        self.assertNotIn('Content-Encoding', kwargs['headers'])
@@ -0,0 +1,85 @@
+# Copyright (c) 2025, Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import json
+
+import pytest
+
+from ansible.errors import AnsibleError
+
+from ansible_collections.community.general.plugins.plugin_utils.cache_codec import (
+    CacheCodec,
+    is_encoded,
+)
+
+
+FACTS = {
+    'ansible_hostname': 'host1',
+    'ansible_processor_vcpus': 4,
+    'ansible_mounts': [{'mount': '/', 'size_total': 1234567890, 'options': 'rw,relatime'}] * 50,
+    'ansible_local': {},
+    'ansible_selinux': {'status': 'disabled'},
+    'ansible_virtualization_tech_guest': [],
+    'ansible_is_chroot': False,
+    'ansible_fips': None,
+    'ansible_unicode': 'Grüße',
+}
+
+
+@pytest.mark.parametrize('serializer, compression', [
+    ('json', 'none'),
+    ('json', 'zlib'),
+    ('json', 'zstd'),
+    ('msgpack', 'none'),
+    ('msgpack', 'zlib'),
+    ('msgpack', 'zstd'),
+])
+def test_roundtrip(serializer, compression):
+    if serializer == 'msgpack':
+        pytest.importorskip('msgpack')
+    if compression == 'zstd':
+        pytest.importorskip('zstandard')
+    codec = CacheCodec(serializer=serializer, compression=compression, compression_threshold=100)
+    data = codec.encode(FACTS)
+    assert is_encoded(data)
+    assert CacheCodec.decode(data) == FACTS
+    assert len(data) < len(json.dumps(FACTS, sort_keys=True, indent=4))
+    if compression != 'none':
+        assert data[3:4] != b'-'
+
+
+def test_compression_threshold():
+    codec = CacheCodec(compression='zlib', compression_threshold=1000000)
+    data = codec.encode(FACTS)
+    assert data[:4] == b'\x001j-'
+    assert CacheCodec.decode(data) == FACTS
+
+
+def test_incompressible():
+    codec = CacheCodec(compression='zlib', compression_threshold=1)
+    assert codec.encode({}) == b'\x001j-{}'
+
+
+@pytest.mark.parametrize('data', [
+    json.dumps(FACTS, sort_keys=True, indent=4).encode('utf-8'),
+    json.dumps(FACTS),
+    FACTS,
+    None,
+])
+def test_not_encoded(data):
+    assert not is_encoded(data)
+    with pytest.raises(AnsibleError):
+        CacheCodec.decode(data)
+
+
+def test_invalid():
+    with pytest.raises(AnsibleError, match='Unknown serializer'):
+        CacheCodec(serializer='pickle')
+    with pytest.raises(AnsibleError, match='Unknown compression'):
+        CacheCodec(compression='lzma')
+    with pytest.raises(AnsibleError, match='unknown format'):
+        CacheCodec.decode(b'\x001x-{}')
@@ -0,0 +1,140 @@
+# Copyright (c) 2025, Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import threading
+import time
+
+from ansible_collections.community.internal_test_tools.tests.unit.compat.mock import Mock
+
+from ansible_collections.community.general.plugins.plugin_utils.event_shipper import EventShipper
+
+
+class Recorder(object):
+    def __init__(self, failures=0):
+        self.batches = []
+        self.failures = failures
+        self.calls = 0
+
+    def __call__(self, events, key):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise Exception(f'failure {self.calls}')
+        self.batches.append((key, list(events)))
+
+
+def test_batches_by_count():
+    send = Recorder()
+    shipper = EventShipper(send, max_events=3, flush_interval=60)
+    for i in range(7):
+        assert shipper.put(f'event{i}'.encode())
+    stats = shipper.close()
+
+    assert [len(events) for key, events in send.batches] == [3, 3, 1]
+    assert [event for key, events in send.batches for event in events] == [f'event{i}'.encode() for i in range(7)]
+    assert stats['sent'] == 7
+    assert stats['requests'] == 3
+    assert stats['dropped'] == 0
+
+
+def test_batches_by_size():
+    send = Recorder()
+    shipper = EventShipper(send, max_events=100, max_bytes=10, flush_interval=60)
+    for event in [b'aaaa', b'bbbb', b'cccc', b'dddddddddddd', b'e']:
+        shipper.put(event)
+    shipper.close()
+
+    assert [events for key, events in send.batches] == [[b'aaaa', b'bbbb'], [b'cccc'], [b'dddddddddddd'], [b'e']]
+
+
+def test_batches_by_time():
+    sent = threading.Event()
+
+    def send(events, key):
+        sent.set()
+
+    shipper = EventShipper(send, max_events=100, flush_interval=0.05)
+    shipper.put(b'event')
+    # The event is sent without waiting for more events or for close()
+    assert sent.wait(5)
+    shipper.close()
+    assert shipper.stats['requests'] == 1
+
+
+def test_batches_by_key():
+    send = Recorder()
+    shipper = EventShipper(send, max_events=2, flush_interval=60)
+    for key in ['a', 'b', 'a', 'b', 'b']:
+        shipper.put(key.encode(), key=key)
+    shipper.close()
+
+    assert sorted(send.batches) == [('a', [b'a', b'a']), ('b', [b'b']), ('b', [b'b', b'b'])]
+
+
+def test_retries():
+    send = Recorder(failures=2)
+    shipper = EventShipper(send, retries=3, backoff=0.01)
+    shipper.put(b'event')
+    stats = shipper.close()
+
+    assert send.batches == [(None, [b'event'])]
+    assert stats['retries'] == 2
+    assert stats['sent'] == 1
+    assert stats['dropped'] == 0
+
+
+def test_drops_after_retries():
+    send = Recorder(failures=100)
+    shipper = EventShipper(send, max_events=1, retries=2, backoff=0.01)
+    shipper.put(b'event1')
+    shipper.put(b'event2')
+    stats = shipper.close()
+
+    # Once a batch was dropped, the next one is only tried once
+    assert send.calls == 4
+    assert stats['retries'] == 2
+    assert stats['dropped'] == 2
+    assert str(shipper.last_error) == 'failure 4'
+
+    display = Mock()
+    shipper.report(display, 'Test')
+    display.warning.assert_called_once_with('Test: 2 events could not be sent, last error: failure 4')
+
+
+def test_drops_when_queue_is_full():
+    release = threading.Event()
+
+    def send(events, key):
+        release.wait(5)
+
+    shipper = EventShipper(send, max_events=1, queue_size=2)
+    assert shipper.put(b'event1')
+    # Wait until the worker blocks in send(), so that the queue is empty
+    deadline = time.time() + 5
+    while not shipper._queue.empty() and time.time() < deadline:
+        time.sleep(0.01)
+    assert shipper.put(b'event2')
+    assert shipper.put(b'event3')
+    assert not shipper.put(b'event4')
+    release.set()
+    stats = shipper.close()
+
+    assert stats['queued'] == 3
+    assert stats['sent'] == 3
+    assert stats['dropped'] == 1
+
+
+def test_summary():
+    shipper = EventShipper(Recorder())
+    shipper.put(b'12345')
+    shipper.close()
+
+    display = Mock()
+    shipper.report(display, 'Test')
+    summary = display.vv.call_args[0][0]
+    assert summary.startswith('Test: sent 1 events (5 bytes) in 1 requests, ')
+    assert summary.endswith(' events/s, 0 retries, dropped 0 events')
+    display.warning.assert_not_called()
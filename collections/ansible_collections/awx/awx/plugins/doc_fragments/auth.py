@@ -61,6 +61,21 @@ options:
     - If provided, the other locations for config files will not be considered.
     type: path
     aliases: [tower_config_file]
+  resolve_cache_ttl:
+    description:
+    - Number of seconds to remember which id a name resolved to, across module invocations on the same machine.
+    - Related objects given by name (organizations, inventories, credentials, ...) are then looked up once per I(resolve_cache_ttl)
+      instead of once per task.
+    - Names are remembered per controller host, user and endpoint, since other users may see other objects by the same name.
+    - If value not set, will try environment variable C(CONTROLLER_RESOLVE_CACHE_TTL).
+    - Names are only remembered for the current module invocation if not set or C(0).
+    type: int
+  resolve_cache_path:
+    description:
+    - Path of the file shared by the module invocations that use I(resolve_cache_ttl).
+    - If value not set, will try environment variable C(CONTROLLER_RESOLVE_CACHE_PATH).
+    - Defaults to C(~/.ansible/tmp/controller_resolve_cache.json).
+    type: path
 
 notes:
 - If no I(config_file) is provided we will attempt to use the tower-cli library
@@ -33,7 +33,25 @@ options:
         description: Make extra requests to provide all group vars with metadata about the source host.
         type: bool
         default: False
-extends_documentation_fragment: awx.awx.auth_plugin
+    cache_plugin:
+        description:
+            - Cache plugin to use for the inventory's source data.
+            - Defaults to a persistent JSON file cache so the inventory is kept between runs.
+        default: ansible.builtin.jsonfile
+    cache_connection:
+        description:
+            - Cache connection data or path, read cache plugin documentation for specifics.
+        default: ~/.ansible/tmp/awx_controller_inventory_cache
+extends_documentation_fragment:
+  - awx.awx.auth_plugin
+  - inventory_cache
+notes:
+  - When the cache is enabled the cached inventory is keyed on the controller host and inventory id.
+  - Before the cached inventory is used, a few small requests compare the modification times and counts of
+    the inventory, its hosts and its groups against the cached ones. The full inventory is only downloaded again
+    if any of them changed.
+  - Changing only which groups an existing host belongs to does not update those modification times,
+    such changes show up once the cache times out or is flushed.
 '''
 
 EXAMPLES = '''
@@ -51,6 +69,14 @@ inventory_id: the_ID_of_targeted_automation_controller_inventory
 # If some of the arguments are missing, Ansible will attempt to read them from environment variables.
 # ansible-inventory -i /path/to/controller_inventory.yml --list
 
+# Example keeping the inventory in the persistent cache, it is re-downloaded only when the
+# hosts or groups of the inventory were modified on the controller or after one day.
+
+plugin: awx.awx.controller
+inventory_id: the_ID_of_targeted_automation_controller_inventory
+cache: true
+cache_timeout: 86400
+
 # Example for reading from environment variables:
 
 # Set environment variables:
@@ -68,18 +94,19 @@ import os
 from ansible.module_utils import six
 from ansible.module_utils._text import to_text, to_native
 from ansible.errors import AnsibleParserError, AnsibleOptionsError
-from ansible.plugins.inventory import BaseInventoryPlugin
+from ansible.plugins.inventory import BaseInventoryPlugin, Cacheable
 from ansible.config.manager import ensure_type
 
 from ansible.module_utils.six import raise_from
 from ..module_utils.controller_api import ControllerAPIModule
+from ..module_utils.inventory_script import iter_inventory_script
 
 
 def handle_error(**kwargs):
     raise AnsibleParserError(to_native(kwargs.get('msg')))
 
 
-class InventoryModule(BaseInventoryPlugin):
+class InventoryModule(BaseInventoryPlugin, Cacheable):
     NAME = 'awx.awx.controller'  # REPLACE
     # Stays backward compatible with the inventory script.
     # If the user supplies '@controller_inventory' as path, the plugin will read from environment variables.
@@ -108,6 +135,60 @@ class InventoryModule(BaseInventoryPlugin):
     def warn_callback(self, warning):
         self.display.warning(warning)
 
+    def _get_fingerprint(self, module, inventory_id):
+        # Small requests whose results change whenever hosts or groups of the inventory are added, removed or modified
+        inventory_url = '/api/v2/inventories/{inv_id}/'.format(inv_id=inventory_id)
+        inventory = module.get_endpoint(inventory_url)['json']
+        fingerprint = [inventory.get('modified'), inventory.get('total_hosts'), inventory.get('total_groups')]
+        for related in ('hosts', 'groups'):
+            latest = module.get_endpoint('{0}{1}/'.format(inventory_url, related), data={'order_by': '-modified', 'page_size': 1})['json']
+            fingerprint.append(latest['count'])
+            fingerprint.append(latest['results'][0]['modified'] if latest['results'] else None)
+        return fingerprint
+
+    def _populate(self, script_items):
+        # script_items yields ('group', name, data) and ('host', name, hostvars) in any order,
+        # adding hosts and groups is idempotent so each one can be added to the inventory as soon as it is read
+        for kind, name, data in script_items:
+            if kind == 'host':
+                self.inventory.add_host(name)
+                for var_name, var_value in six.iteritems(data):
+                    self.inventory.set_variable(name, var_name, var_value)
+                continue
+
+            self.inventory.add_group(name)
+            if name != 'all':
+                # First add hosts to groups
+                for host_name in data.get('hosts', []):
+                    self.inventory.add_host(host_name, name)
+                # Then add the parent-children group relationships.
+                for child_group_name in data.get('children', []):
+                    # add the child group to groups, if its already there it will just throw a warning
+                    self.inventory.add_group(child_group_name)
+                    self.inventory.add_child(name, child_group_name)
+            # Set the group vars. Note we should set group var for 'all', but not '_meta'.
+            for var_name, var_value in six.iteritems(data.get('vars', {})):
+                self.inventory.set_variable(name, var_name, var_value)
+
+    @staticmethod
+    def _iter_script(inventory):
+        # The same items iter_inventory_script reads from a stream, from an already loaded inventory script
+        for group_name, group_content in six.iteritems(inventory):
+            if group_name != '_meta':
+                yield 'group', group_name, group_content
+        for host_name, host_vars in six.iteritems(inventory['_meta']['hostvars']):
+            yield 'host', host_name, host_vars
+
+    @staticmethod
+    def _collect_script(script_items, inventory):
+        # Passes the items through while building the inventory script document back up in inventory
+        for kind, name, data in script_items:
+            if kind == 'host':
+                inventory['_meta']['hostvars'][name] = data
+            else:
+                inventory[name] = data
+            yield kind, name, data
+
     def parse(self, inventory, loader, path, cache=True):
         super().parse(inventory, loader, path)
         if not self.no_config_file_supplied and os.path.isfile(path):
@@ -136,35 +217,41 @@ class InventoryModule(BaseInventoryPlugin):
         inventory_id = inventory_id.replace('/', '')
         inventory_url = '/api/v2/inventories/{inv_id}/script/'.format(inv_id=inventory_id)
 
-        inventory = module.get_endpoint(inventory_url, data={'hostvars': '1', 'towervars': '1', 'all': '1'})['json']
-
-        # To start with, create all the groups.
-        for group_name in inventory:
-            if group_name != '_meta':
-                self.inventory.add_group(group_name)
+        self.load_cache_plugin()
+        cache_key = self.get_cache_key('{0}/api/v2/inventories/{1}/'.format(module.host, inventory_id))
+        user_cache_setting = self.get_option('cache')
 
-        # Then, create all hosts and add the host vars.
-        all_hosts = inventory['_meta']['hostvars']
-        for host_name, host_vars in six.iteritems(all_hosts):
-            self.inventory.add_host(host_name)
-            for var_name, var_value in six.iteritems(host_vars):
-                self.inventory.set_variable(host_name, var_name, var_value)
+        inventory = None
+        fingerprint = None
+        if user_cache_setting:
+            fingerprint = self._get_fingerprint(module, inventory_id)
+            if cache:
+                try:
+                    cached = self._cache[cache_key]
+                except KeyError:
+                    cached = None
+                # Only use what is cached if nothing has been modified on the controller since
+                if cached and cached.get('fingerprint') == fingerprint:
+                    inventory = cached['inventory']
 
-        # Lastly, create to group-host and group-group relationships, and set group vars.
-        for group_name, group_content in six.iteritems(inventory):
-            if group_name != 'all' and group_name != '_meta':
-                # First add hosts to groups
-                for host_name in group_content.get('hosts', []):
-                    self.inventory.add_host(host_name, group_name)
-                # Then add the parent-children group relationships.
-                for child_group_name in group_content.get('children', []):
-                    # add the child group to groups, if its already there it will just throw a warning
-                    self.inventory.add_group(child_group_name)
-                    self.inventory.add_child(group_name, child_group_name)
-            # Set the group vars. Note we should set group var for 'all', but not '_meta'.
-            if group_name != '_meta':
-                for var_name, var_value in six.iteritems(group_content.get('vars', {})):
-                    self.inventory.set_variable(group_name, var_name, var_value)
+        if inventory is not None:
+            self._populate(self._iter_script(inventory))
+        else:
+            # Stream the inventory script into the inventory instead of loading the whole document first
+            response = module.get_endpoint(inventory_url, data={'hostvars': '1', 'towervars': '1', 'all': '1'}, stream=True)
+            if response['status_code'] != 200:
+                raise AnsibleParserError('Failed to read the inventory script at {0}: {1}'.format(inventory_url, response.get('json', response)))
+            script_items = iter_inventory_script(response['stream'].read)
+            if user_cache_setting:
+                # The cache needs the whole document after all
+                inventory = {'_meta': {'hostvars': {}}}
+                script_items = self._collect_script(script_items, inventory)
+            try:
+                self._populate(script_items)
+            except ValueError as e:
+                raise_from(AnsibleParserError('Failed to parse the inventory script at {0}: {1}'.format(inventory_url, to_native(e))), e)
+            if user_cache_setting:
+                self._cache[cache_key] = {'fingerprint': fingerprint, 'inventory': inventory}
 
         # Fetch extra variables if told to do so
         if self.get_option('include_metadata'):
@@ -46,6 +46,7 @@ options:
   return_all:
     description:
       - If the response is paginated, return all pages.
+      - Pages after the first one are requested concurrently.
     type: boolean
     default: False
   return_ids:
@@ -173,11 +174,7 @@ class LookupModule(LookupBase):
                     'by max_objects, {2}'.format(terms[0], return_data['count'], self.get_option('max_objects'))
                 )
 
-            next_page = return_data['next']
-            while next_page is not None:
-                next_response = module.get_endpoint(next_page)
-                return_data['results'] += next_response['json']['results']
-                next_page = next_response['json']['next']
+            return_data['results'].extend(module.iter_remaining_pages(response))
             return_data['next'] = None
 
         if self.get_option('return_ids'):
@@ -0,0 +1,178 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = """
+    name: schedule_preview
+    author: AWX Project Contributors (@ansible)
+    short_description: Preview the next occurrences of many schedule rules at once
+    requirements:
+      - pytz
+      - python-dateutil >= 2.7.0
+    description:
+      - Returns the next occurrences of each rule it is given, without contacting the controller.
+      - Takes any number of rules, such as the ones generated by the schedule_rrule and schedule_rruleset lookups
+        or the rrule of existing schedules, and returns one list of occurrences per rule in the same order.
+      - Each distinct rule is parsed once and kept for later calls in the same process, so checking the schedules
+        of many job templates can be done in a single lookup.
+    options:
+      _terms:
+        description:
+          - The rules to preview, in the format the controller uses for the rrule of a schedule
+        required: True
+      count:
+        description:
+          - The maximum number of occurrences to return for each rule
+        type: int
+        default: 5
+      start_date:
+        description:
+          - Only return occurrences after this date
+          - Format should be 'YYYY-MM-DD HH:MM:SS'
+          - The date is in the timezone of the DTSTART of each rule
+          - Defaults to now
+        type: str
+      end_date:
+        description:
+          - Only return occurrences up to this date
+          - Format should be 'YYYY-MM-DD HH:MM:SS'
+          - The date is in the timezone of the DTSTART of each rule
+        type: str
+"""
+
+EXAMPLES = """
+- name: Show the next 3 runs of a rule
+  debug:
+    msg: "{{ query('awx.awx.schedule_preview', 'DTSTART;TZID=UTC:20220430T103045 RRULE:FREQ=DAILY;INTERVAL=1', count=3) }}"
+
+- name: Check which schedules run during a maintenance window
+  debug:
+    msg: "{{ schedules | zip(query('awx.awx.schedule_preview', *(schedules | map(attribute='rrule')), start_date=window_start, end_date=window_end)) }}"
+"""
+
+RETURN = """
+_raw:
+  description:
+    - One list per rule with the ISO 8601 dates of its next occurrences
+  type: list
+  elements: list
+"""
+import re
+from itertools import islice
+
+from ansible.module_utils.six import raise_from
+from ansible.plugins.lookup import LookupBase
+from ansible.errors import AnsibleError
+from datetime import datetime
+from ..module_utils.rrule_cache import RuleCache
+
+try:
+    import pytz
+    from dateutil import rrule, tz
+except ImportError as imp_exc:
+    LIBRARY_IMPORT_ERROR = imp_exc
+else:
+    LIBRARY_IMPORT_ERROR = None
+
+# Parsed rule sets by their rule string
+PREVIEW_CACHE = RuleCache()
+
+DTSTART_TZID = re.compile(r'DTSTART;TZID=(?P<tzid>[^:]+):')
+DTSTART_UTC = re.compile(r'DTSTART:\d{8}T\d{6}Z')
+NAIVE_UNTIL = re.compile(r'UNTIL=(?P<until>\d{8}T\d{6})(?![0-9Z])')
+
+
+class LookupModule(LookupBase):
+    # plugin constructor
+    def __init__(self, *args, **kwargs):
+        if LIBRARY_IMPORT_ERROR:
+            raise_from(AnsibleError('{0}'.format(LIBRARY_IMPORT_ERROR)), LIBRARY_IMPORT_ERROR)
+        super().__init__(*args, **kwargs)
+
+    @staticmethod
+    def parse_date_time(date_string):
+        try:
+            return datetime.strptime(date_string, '%Y-%m-%d %H:%M:%S')
+        except ValueError:
+            return datetime.strptime(date_string, '%Y-%m-%d')
+
+    @staticmethod
+    def rule_timezone(rule_string):
+        match = DTSTART_TZID.search(rule_string)
+        if match:
+            return tz.gettz(match.group('tzid'))
+        if DTSTART_UTC.search(rule_string):
+            return tz.tzutc()
+        return None
+
+    @staticmethod
+    def compile_rule(rule_string):
+        # The controller takes an UNTIL without a timezone to be in the timezone of DTSTART, dateutil wants it in UTC
+        match = DTSTART_TZID.search(rule_string)
+        if match:
+            timezone = pytz.timezone(match.group('tzid'))
+
+            def until_in_utc(until):
+                local_until = timezone.localize(datetime.strptime(until.group('until'), '%Y%m%dT%H%M%S'))
+                return 'UNTIL={0}'.format(local_until.astimezone(pytz.utc).strftime('%Y%m%dT%H%M%SZ'))
+
+            rule_string = NAIVE_UNTIL.sub(until_in_utc, rule_string)
+        return rrule.rrulestr(rule_string, forceset=True)
+
+    def run(self, terms, variables=None, **kwargs):
+        if not terms:
+            raise AnsibleError('You must pass at least one rule to preview')
+
+        try:
+            count = int(kwargs.get('count', 5))
+        except (TypeError, ValueError) as e:
+            raise_from(AnsibleError('Parameter count must be an integer'), e)
+
+        dates = {}
+        for option in ('start_date', 'end_date'):
+            if kwargs.get(option):
+                try:
+                    dates[option] = LookupModule.parse_date_time(kwargs[option])
+                except Exception as e:
+                    raise_from(AnsibleError('Parameter {0} must be in the format YYYY-MM-DD [HH:MM:SS]'.format(option)), e)
+
+        # The same rule is often shared by many schedules, each distinct rule is only expanded once
+        previews = {}
+        for rule_number, rule_string in enumerate(terms, start=1):
+            if rule_string not in previews:
+                previews[rule_string] = self.preview(rule_string, rule_number, count, dates.get('start_date'), dates.get('end_date'))
+
+        return [previews[rule_string] for rule_string in terms]
+
+    def preview(self, rule_string, rule_number, count, start_date, end_date):
+        try:
+            ruleset = PREVIEW_CACHE.get(rule_string, lambda: LookupModule.compile_rule(rule_string))
+        except Exception as e:
+            raise_from(AnsibleError('Unable to parse rule {0} {1}: {2}'.format(rule_number, rule_string, e)), e)
+
+        # Compare dates in the timezone of the rule, occurrences of a rule with a timezone can not be compared to naive dates
+        timezone = LookupModule.rule_timezone(rule_string)
+        after = start_date.replace(tzinfo=timezone) if start_date else datetime.now(timezone)
+        before = end_date.replace(tzinfo=timezone) if end_date else None
+
+        occurrences = []
+        for occurrence in islice(self.iter_after(ruleset, after), count):
+            if before is not None and occurrence > before:
+                break
+            occurrences.append(occurrence.isoformat())
+        return occurrences
+
+    @staticmethod
+    def iter_after(ruleset, after):
+        # xafter walks the rule once, it is only in newer versions of dateutil
+        if hasattr(ruleset, 'xafter'):
+            return ruleset.xafter(after)
+
+        def walk(occurrence):
+            while True:
+                occurrence = ruleset.after(occurrence)
+                if occurrence is None:
+                    return
+                yield occurrence
+
+        return walk(after)
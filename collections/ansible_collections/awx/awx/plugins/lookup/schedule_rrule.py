@@ -90,6 +90,7 @@ from ansible.module_utils.six import raise_from
 from ansible.plugins.lookup import LookupBase
 from ansible.errors import AnsibleError
 from datetime import datetime
+from ..module_utils.rrule_cache import RuleCache, freeze
 
 try:
     import pytz
@@ -99,6 +100,9 @@ except ImportError as imp_exc:
 else:
     LIBRARY_IMPORT_ERROR = None
 
+# Generated rules by frequency and parameters, so a loop creating similar schedules only builds each rule once
+RRULE_CACHE = RuleCache()
+
 
 class LookupModule(LookupBase):
     # plugin constructor
@@ -150,6 +154,12 @@ class LookupModule(LookupBase):
         return self.get_rrule(frequency, kwargs)
 
     def get_rrule(self, frequency, kwargs):
+        # Without a start date the rule starts now, so it is built again every time
+        if 'start_date' not in kwargs:
+            return [self.build_rrule(frequency, kwargs)]
+        return [RRULE_CACHE.get((frequency, freeze(kwargs)), lambda: self.build_rrule(frequency, kwargs))]
+
+    def build_rrule(self, frequency, kwargs):
 
         if frequency not in self.frequencies:
             raise AnsibleError('Frequency of {0} is invalid'.format(frequency))
@@ -227,7 +237,7 @@ class LookupModule(LookupBase):
         # So we will do a string manip here if we need to
         timezone = 'America/New_York'
         if 'timezone' in kwargs:
-            if kwargs['timezone'] not in pytz.all_timezones:
+            if kwargs['timezone'] not in pytz.all_timezones_set:
                 raise AnsibleError('Timezone parameter is not valid')
             timezone = kwargs['timezone']
 
@@ -237,4 +247,4 @@ class LookupModule(LookupBase):
         if kwargs.get('every', 1) == 1:
             return_rrule = "{0};INTERVAL=1".format(return_rrule)
 
-        return [return_rrule]
+        return return_rrule
@@ -132,6 +132,7 @@ from ansible.module_utils.six import raise_from
 from ansible.plugins.lookup import LookupBase
 from ansible.errors import AnsibleError
 from datetime import datetime
+from ..module_utils.rrule_cache import RuleCache, freeze
 
 try:
     import pytz
@@ -141,6 +142,10 @@ except ImportError as imp_exc:
 else:
     LIBRARY_IMPORT_ERROR = None
 
+# Whole rule sets and the single rules in them by their parameters, a loop creating similar schedules builds each of them once
+RULESET_CACHE = RuleCache()
+RULE_CACHE = RuleCache()
+
 
 class LookupModule(LookupBase):
     # plugin constructor
@@ -192,13 +197,14 @@ class LookupModule(LookupBase):
         # something: ["1", "2", "3"] - A list of strings
         # something: [1,2,3] - A list of ints
         return_values = []
+        values = rule[field_name]
         # If they give us a single int, lets make it a list of ints
-        if isinstance(rule[field_name], int):
-            rule[field_name] = [rule[field_name]]
+        if isinstance(values, int):
+            values = [values]
         # If its not a list, we need to split it into a list
-        if not isinstance(rule[field_name], list):
-            rule[field_name] = rule[field_name].split(',')
-        for value in rule[field_name]:
+        if not isinstance(values, list):
+            values = values.split(',')
+        for value in values:
             # If they have a list of strs we want to strip the str incase its space delineated
             if isinstance(value, str):
                 value = value.strip()
@@ -210,10 +216,11 @@ class LookupModule(LookupBase):
 
     def process_list(self, field_name, rule, valid_list, rule_number):
         return_values = []
+        values = rule[field_name]
         # If its not a list, we need to split it into a list
-        if not isinstance(rule[field_name], list):
-            rule[field_name] = rule[field_name].split(',')
-        for value in rule[field_name]:
+        if not isinstance(values, list):
+            values = values.split(',')
+        for value in values:
             value = value.strip().lower()
             if value not in valid_list:
                 raise AnsibleError('In rule {0} {1} must only contain values in {2}'.format(rule_number, field_name, ', '.join(valid_list.keys())))
@@ -237,93 +244,20 @@ class LookupModule(LookupBase):
         # So we will do a string manip here if we need to
         timezone = 'America/New_York'
         if 'timezone' in kwargs:
-            if kwargs['timezone'] not in pytz.all_timezones:
+            if kwargs['timezone'] not in pytz.all_timezones_set:
                 raise AnsibleError('Timezone parameter is not valid')
             timezone = kwargs['timezone']
 
+        cache_key = (start_date, timezone, freeze(kwargs['rules']))
+        return [RULESET_CACHE.get(cache_key, lambda: self.build_ruleset(start_date, timezone, kwargs['rules']))]
+
+    def build_ruleset(self, start_date, timezone, rule_list):
         rules = []
         got_at_least_one_rule = False
-        for rule_index in range(0, len(kwargs['rules'])):
-            rule = kwargs['rules'][rule_index]
+        for rule_index in range(0, len(rule_list)):
+            rule = rule_list[rule_index]
             rule_number = rule_index + 1
-            valid_options = [
-                "frequency",
-                "interval",
-                "end_on",
-                "bysetpos",
-                "bymonth",
-                "bymonthday",
-                "byyearday",
-                "byweekno",
-                "byweekday",
-                "byhour",
-                "byminute",
-                "include",
-            ]
-            invalid_options = list(set(rule.keys()) - set(valid_options))
-            if invalid_options:
-                raise AnsibleError('Rule {0} has invalid options: {1}'.format(rule_number, ', '.join(invalid_options)))
-            frequency = rule.get('frequency', None)
-            if not frequency:
-                raise AnsibleError("Rule {0} is missing a frequency".format(rule_number))
-            if frequency not in self.frequencies:
-                raise AnsibleError('Frequency of rule {0} is invalid {1}'.format(rule_number, frequency))
-
-            rrule_kwargs = {
-                'freq': self.frequencies[frequency],
-                'interval': rule.get('interval', 1),
-                'dtstart': start_date,
-            }
-
-            # If we are a none frequency we don't need anything else
-            if frequency == 'none':
-                rrule_kwargs['count'] = 1
-            else:
-                # All non-none frequencies can have an end_on option
-                if 'end_on' in rule:
-                    end_on = rule['end_on']
-                    if re.match(r'^\d+$', end_on):
-                        rrule_kwargs['count'] = end_on
-                    else:
-                        try:
-                            rrule_kwargs['until'] = LookupModule.parse_date_time(end_on)
-                        except Exception as e:
-                            raise_from(
-                                AnsibleError('In rule {0} end_on must either be an integer or in the format YYYY-MM-DD [HH:MM:SS]'.format(rule_number)), e
-                            )
-
-            if 'bysetpos' in rule:
-                rrule_kwargs['bysetpos'] = self.process_list('bysetpos', rule, self.set_positions, rule_number)
-
-            if 'bymonth' in rule:
-                rrule_kwargs['bymonth'] = self.process_integer('bymonth', rule, 1, 12, rule_number)
-
-            if 'bymonthday' in rule:
-                rrule_kwargs['bymonthday'] = self.process_integer('bymonthday', rule, 1, 31, rule_number)
-
-            if 'byyearday' in rule:
-                rrule_kwargs['byyearday'] = self.process_integer('byyearday', rule, 1, 366, rule_number)  # 366 for leap years
-
-            if 'byweekno' in rule:
-                rrule_kwargs['byweekno'] = self.process_integer('byweekno', rule, 1, 52, rule_number)
-
-            if 'byweekday' in rule:
-                rrule_kwargs['byweekday'] = self.process_list('byweekday', rule, self.weekdays, rule_number)
-
-            if 'byhour' in rule:
-                rrule_kwargs['byhour'] = self.process_integer('byhour', rule, 0, 23, rule_number)
-
-            if 'byminute' in rule:
-                rrule_kwargs['byminute'] = self.process_integer('byminute', rule, 0, 59, rule_number)
-
-            try:
-                generated_rule = str(rrule.rrule(**rrule_kwargs))
-            except Exception as e:
-                raise_from(AnsibleError('Failed to parse rrule for rule {0} {1}: {2}'.format(rule_number, str(rrule_kwargs), e)), e)
-
-            # AWX requires an interval. rrule will not add interval if it's set to 1
-            if rule.get('interval', 1) == 1:
-                generated_rule = "{0};INTERVAL=1".format(generated_rule)
+            generated_rule = RULE_CACHE.get((start_date, freeze(rule)), lambda: self.build_rule(start_date, rule, rule_number))
 
             if rule_index == 0:
                 # rrule puts a \n in the rule instead of a space and can't handle timezones
@@ -351,5 +285,87 @@ class LookupModule(LookupBase):
         except Exception as e:
             raise_from(AnsibleError("Failed to parse generated rule set via rruleset {0}".format(e)), e)
 
-        # return self.get_rrule(frequency, kwargs)
-        return [rruleset_str]
+        return rruleset_str
+
+    def build_rule(self, start_date, rule, rule_number):
+        # Returns the rrule string for one rule of a ruleset, with its DTSTART and RRULE lines
+        valid_options = [
+            "frequency",
+            "interval",
+            "end_on",
+            "bysetpos",
+            "bymonth",
+            "bymonthday",
+            "byyearday",
+            "byweekno",
+            "byweekday",
+            "byhour",
+            "byminute",
+            "include",
+        ]
+        invalid_options = list(set(rule.keys()) - set(valid_options))
+        if invalid_options:
+            raise AnsibleError('Rule {0} has invalid options: {1}'.format(rule_number, ', '.join(invalid_options)))
+        frequency = rule.get('frequency', None)
+        if not frequency:
+            raise AnsibleError("Rule {0} is missing a frequency".format(rule_number))
+        if frequency not in self.frequencies:
+            raise AnsibleError('Frequency of rule {0} is invalid {1}'.format(rule_number, frequency))
+
+        rrule_kwargs = {
+            'freq': self.frequencies[frequency],
+            'interval': rule.get('interval', 1),
+            'dtstart': start_date,
+        }
+
+        # If we are a none frequency we don't need anything else
+        if frequency == 'none':
+            rrule_kwargs['count'] = 1
+        else:
+            # All non-none frequencies can have an end_on option
+            if 'end_on' in rule:
+                end_on = rule['end_on']
+                if re.match(r'^\d+$', end_on):
+                    rrule_kwargs['count'] = end_on
+                else:
+                    try:
+                        rrule_kwargs['until'] = LookupModule.parse_date_time(end_on)
+                    except Exception as e:
+                        raise_from(
+                            AnsibleError('In rule {0} end_on must either be an integer or in the format YYYY-MM-DD [HH:MM:SS]'.format(rule_number)), e
+                        )
+
+        if 'bysetpos' in rule:
+            rrule_kwargs['bysetpos'] = self.process_list('bysetpos', rule, self.set_positions, rule_number)
+
+        if 'bymonth' in rule:
+            rrule_kwargs['bymonth'] = self.process_integer('bymonth', rule, 1, 12, rule_number)
+
+        if 'bymonthday' in rule:
+            rrule_kwargs['bymonthday'] = self.process_integer('bymonthday', rule, 1, 31, rule_number)
+
+        if 'byyearday' in rule:
+            rrule_kwargs['byyearday'] = self.process_integer('byyearday', rule, 1, 366, rule_number)  # 366 for leap years
+
+        if 'byweekno' in rule:
+            rrule_kwargs['byweekno'] = self.process_integer('byweekno', rule, 1, 52, rule_number)
+
+        if 'byweekday' in rule:
+            rrule_kwargs['byweekday'] = self.process_list('byweekday', rule, self.weekdays, rule_number)
+
+        if 'byhour' in rule:
+            rrule_kwargs['byhour'] = self.process_integer('byhour', rule, 0, 23, rule_number)
+
+        if 'byminute' in rule:
+            rrule_kwargs['byminute'] = self.process_integer('byminute', rule, 0, 59, rule_number)
+
+        try:
+            generated_rule = str(rrule.rrule(**rrule_kwargs))
+        except Exception as e:
+            raise_from(AnsibleError('Failed to parse rrule for rule {0} {1}: {2}'.format(rule_number, str(rrule_kwargs), e)), e)
+
+        # AWX requires an interval. rrule will not add interval if it's set to 1
+        if rule.get('interval', 1) == 1:
+            generated_rule = "{0};INTERVAL=1".format(generated_rule)
+
+        return generated_rule
@@ -0,0 +1,67 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import re
+from json import dumps, loads
+
+
+# Lines are written by dump_asset_line, so the resource name can be read without decoding the whole asset
+RESOURCE_PREFIX = re.compile(r'^\{"resource": "(\w+)"')
+
+
+def dump_asset_line(resource, asset):
+    """Returns one line of a JSON-lines asset file, the resource type of the asset comes first."""
+    return dumps({'resource': resource, 'asset': asset}) + '\n'
+
+
+class AssetFileIndex:
+    """Index of a JSON-lines asset file written by the export module.
+
+    Only the byte offsets of the lines are kept per resource type, assets are read from the file when they are iterated.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.offsets = {}
+        with open(path, 'rb') as f:
+            offset = 0
+            for line_number, line in enumerate(f, start=1):
+                if line.strip():
+                    self.offsets.setdefault(self._resource(line, line_number), []).append(offset)
+                offset += len(line)
+
+    def _resource(self, line, line_number):
+        match = RESOURCE_PREFIX.match(line.decode('utf-8'))
+        if match:
+            return match.group(1)
+        # The line was not written by dump_asset_line, fall back to decoding all of it
+        try:
+            return loads(line)['resource']
+        except (ValueError, KeyError, TypeError):
+            raise ValueError('Line {0} of {1} is not an asset line'.format(line_number, self.path))
+
+    @property
+    def resources(self):
+        return list(self.offsets)
+
+    def count(self, resource):
+        return len(self.offsets.get(resource, []))
+
+    def iter_assets(self, resource):
+        with open(self.path, 'rb') as f:
+            for offset in self.offsets.get(resource, []):
+                f.seek(offset)
+                yield loads(f.readline())['asset']
+
+
+def iter_chunks(items, size):
+    """Yields lists of at most size items, size None puts everything in one list."""
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if size is not None and len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
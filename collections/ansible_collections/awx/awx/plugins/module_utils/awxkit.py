@@ -4,6 +4,7 @@ __metaclass__ = type
 
 from .controller_api import ControllerModule
 from ansible.module_utils.basic import missing_required_lib
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 try:
     from awxkit.api.client import Connection
@@ -18,6 +19,12 @@ except ImportError:
 class ControllerAWXKitModule(ControllerModule):
     connection = None
     apiV2Ref = None
+    # The number of resource types exported at the same time
+    export_workers = 4
+    # The number of chunks of assets imported at the same time
+    import_workers = 4
+    # The number of assets of one resource type handed to awxkit in a single import call
+    import_chunk_size = 100
 
     def __init__(self, argument_spec, **kwargs):
         kwargs['supports_check_mode'] = False
@@ -43,8 +50,35 @@ class ControllerAWXKitModule(ControllerModule):
             if not self.authenticated:
                 self.authenticate()
             v2_index = get_registered_page('/api/v2/')(self.connection).get()
-            self.api_ref = ApiV2(connection=self.connection, **{'json': v2_index})
-        return self.api_ref
+            self.apiV2Ref = ApiV2(connection=self.connection, **{'json': v2_index})
+        return self.apiV2Ref
+
+    def new_api_v2_object(self):
+        # awxkit keeps its lookup caches on the ApiV2 object, so every concurrent export or import gets its own
+        return ApiV2(connection=self.connection, **{'json': self.get_api_v2_object().json})
+
+    def run_concurrently(self, function, items, workers):
+        # Yields (item, function(item)) in the order the calls finish, at most workers of them run at the same time
+        # Items are only taken from the iterable when a worker is free for them
+        if workers <= 1:
+            for item in items:
+                yield item, function(item)
+            return
+        items = iter(items)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {}
+            for item in items:
+                futures[executor.submit(function, item)] = item
+                if len(futures) >= workers:
+                    break
+            while futures:
+                done, dummy = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    item = futures.pop(future)
+                    for next_item in items:
+                        futures[executor.submit(function, next_item)] = next_item
+                        break
+                    yield item, future.result()
 
     def logout(self):
         if self.authenticated:
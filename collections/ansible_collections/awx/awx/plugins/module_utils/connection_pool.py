@@ -0,0 +1,202 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ansible.module_utils.urls import Request, SSLValidationError, ConnectionError
+from ansible.module_utils.six.moves import http_client
+from ansible.module_utils.six.moves.urllib.error import HTTPError
+from ansible.module_utils.six.moves.urllib.parse import urlparse, urljoin
+from ansible.module_utils.six.moves.urllib.request import Request as UrllibRequest, getproxies, proxy_bypass
+from io import BytesIO
+import ssl
+import threading
+
+
+class KeepAliveResponse:
+    # A fully read response, it offers the parts of the HTTPResponse interface that the modules use
+    def __init__(self, url, response, body):
+        self.url = url
+        self.status = response.status
+        self.reason = response.reason
+        self.headers = response.msg
+        self._body = body
+
+    def read(self):
+        return self._body
+
+    def getheader(self, name, default=None):
+        return self.headers.get(name, default)
+
+    def getcode(self):
+        return self.status
+
+    def geturl(self):
+        return self.url
+
+    def info(self):
+        return self.headers
+
+
+class KeepAliveRequest(Request):
+    """A Request which keeps its HTTP(S) connections open and reuses them for later calls.
+
+    Connections are pooled per (scheme, host, port) and at most max_connections_per_host of them
+    are in use for a host at any time, callers beyond that block until a connection is returned.
+    Anything the pool does not handle itself (streamed responses, proxies, client certificates, unix sockets
+    or any extra open() argument) is passed through to the regular Request implementation.
+    """
+
+    REDIRECT_CODES = (301, 302, 303, 307, 308)
+    MAX_REDIRECTS = 10
+    # What a reused connection raises when the server closed it while it was idle, before sending any part of a response
+    STALE_CONNECTION_ERRORS = (http_client.RemoteDisconnected, BrokenPipeError, ConnectionResetError, ConnectionAbortedError)
+
+    def __init__(self, *args, **kwargs):
+        self.max_connections_per_host = kwargs.pop('max_connections_per_host', 8)
+        super().__init__(*args, **kwargs)
+        self._idle_connections = {}
+        self._host_limits = {}
+        self._ssl_contexts = {}
+        self._lock = threading.Lock()
+
+    def open(self, method, url, data=None, headers=None, timeout=None, validate_certs=None, follow_redirects=None, stream=False, **kwargs):
+        # A streamed response is handed back unread, so its connection can not go back to the pool
+        if stream or kwargs or not self._can_keep_alive(url):
+            return super().open(
+                method, url, data=data, headers=headers, timeout=timeout, validate_certs=validate_certs, follow_redirects=follow_redirects, **kwargs
+            )
+
+        timeout = self.timeout if timeout is None else timeout
+        validate_certs = self.validate_certs if validate_certs is None else validate_certs
+        follow_redirects = self.follow_redirects if follow_redirects is None else follow_redirects
+        request_headers = dict(self.headers or {})
+        request_headers.update(headers or {})
+        if self.http_agent and 'User-Agent' not in request_headers:
+            request_headers['User-Agent'] = self.http_agent
+
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+
+        for dummy in range(self.MAX_REDIRECTS + 1):
+            response = self._send(method, url, data, request_headers, timeout, validate_certs)
+            if response.status not in self.REDIRECT_CODES or not self._should_redirect(method, follow_redirects):
+                break
+            url = urljoin(url, response.getheader('Location'))
+            if response.status in (301, 302, 303) and method != 'HEAD':
+                # Same as urllib, the redirected request becomes a GET without a body
+                method = 'GET'
+                data = None
+                request_headers = dict((k, v) for k, v in request_headers.items() if k.lower() not in ('content-type', 'content-length'))
+            if not self._can_keep_alive(url):
+                return super().open(
+                    method, url, data=data, headers=request_headers, timeout=timeout, validate_certs=validate_certs, follow_redirects=follow_redirects
+                )
+
+        if response.status >= 400 or response.status in self.REDIRECT_CODES:
+            raise HTTPError(url, response.status, response.reason, response.headers, BytesIO(response.read()))
+        return response
+
+    def close(self):
+        with self._lock:
+            idle_connections = self._idle_connections
+            self._idle_connections = {}
+        for connections in idle_connections.values():
+            for connection in connections:
+                connection.close()
+
+    @staticmethod
+    def _should_redirect(method, follow_redirects):
+        if follow_redirects in ('all', 'yes', 'urllib2') or follow_redirects is True:
+            return True
+        if follow_redirects == 'safe':
+            return method in ('GET', 'HEAD')
+        return False
+
+    def _can_keep_alive(self, url):
+        parsed = urlparse(url)
+        if parsed.scheme not in ('http', 'https'):
+            return False
+        for option in ('unix_socket', 'client_cert', 'ca_path', 'ciphers', 'context'):
+            if getattr(self, option, None):
+                return False
+        if self.use_proxy and parsed.scheme in getproxies() and not proxy_bypass(parsed.hostname):
+            return False
+        return True
+
+    def _ssl_context(self, validate_certs):
+        with self._lock:
+            if validate_certs not in self._ssl_contexts:
+                context = ssl.create_default_context()
+                if not validate_certs:
+                    context.check_hostname = False
+                    context.verify_mode = ssl.CERT_NONE
+                self._ssl_contexts[validate_certs] = context
+            return self._ssl_contexts[validate_certs]
+
+    def _host_limit(self, key):
+        with self._lock:
+            if key not in self._host_limits:
+                self._host_limits[key] = threading.BoundedSemaphore(self.max_connections_per_host)
+            return self._host_limits[key]
+
+    def _checkout(self, key, timeout):
+        with self._lock:
+            idle = self._idle_connections.get(key)
+            if idle:
+                connection = idle.pop()
+                connection.timeout = timeout
+                if connection.sock is not None:
+                    connection.sock.settimeout(timeout)
+                return connection, True
+
+        scheme, host, port, validate_certs = key
+        if scheme == 'https':
+            return http_client.HTTPSConnection(host, port, timeout=timeout, context=self._ssl_context(validate_certs)), False
+        return http_client.HTTPConnection(host, port, timeout=timeout), False
+
+    def _checkin(self, key, connection):
+        with self._lock:
+            self._idle_connections.setdefault(key, []).append(connection)
+
+    def _send(self, method, url, data, headers, timeout, validate_certs):
+        parsed = urlparse(url)
+        port = parsed.port or (443 if parsed.scheme == 'https' else 80)
+        key = (parsed.scheme, parsed.hostname, port, bool(validate_certs))
+        path = parsed.path or '/'
+        if parsed.query:
+            path = '{0}?{1}'.format(path, parsed.query)
+
+        # Let the cookie jar add its headers the same way urllib would
+        cookie_request = UrllibRequest(url, headers=headers, method=method)
+        if self.cookies is not None:
+            self.cookies.add_cookie_header(cookie_request)
+        request_headers = dict(cookie_request.header_items())
+
+        with self._host_limit(key):
+            # A reused connection may have been closed by the server while it was idle, that is retried once on a new one
+            # Nothing else is retried, after a timeout or a partial response the server may already have acted on the request
+            for attempt in range(2):
+                connection, reused = self._checkout(key, timeout)
+                raw_response = None
+                try:
+                    connection.request(method, path, body=data, headers=request_headers)
+                    raw_response = connection.getresponse()
+                    body = raw_response.read()
+                except ssl.CertificateError as e:
+                    connection.close()
+                    raise SSLValidationError('Failed to validate the SSL certificate for {0}: {1}'.format(parsed.netloc, e))
+                except (http_client.HTTPException, OSError) as e:
+                    connection.close()
+                    if reused and attempt == 0 and raw_response is None and isinstance(e, self.STALE_CONNECTION_ERRORS):
+                        continue
+                    raise ConnectionError('Failed to connect to {0}: {1}'.format(parsed.netloc, e))
+                break
+
+            if raw_response.will_close:
+                connection.close()
+            else:
+                self._checkin(key, connection)
+
+        if self.cookies is not None:
+            self.cookies.extract_cookies(raw_response, cookie_request)
+        return KeepAliveResponse(url, raw_response, body)
@@ -3,21 +3,28 @@ from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
 from ansible.module_utils.basic import AnsibleModule, env_fallback
-from ansible.module_utils.urls import Request, SSLValidationError, ConnectionError
+from ansible.module_utils.urls import SSLValidationError, ConnectionError
 from ansible.module_utils.parsing.convert_bool import boolean as strtobool
 from ansible.module_utils.six import PY2
 from ansible.module_utils.six import raise_from
 from ansible.module_utils.six.moves import StringIO
 from ansible.module_utils.six.moves.urllib.error import HTTPError
 from ansible.module_utils.six.moves.http_cookiejar import CookieJar
-from ansible.module_utils.six.moves.urllib.parse import urlparse, urlencode, quote
+from ansible.module_utils.six.moves.urllib.parse import urlparse, urlencode, quote, parse_qsl
 from ansible.module_utils.six.moves.configparser import ConfigParser, NoOptionError
 from base64 import b64encode
+from hashlib import sha256
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from socket import getaddrinfo, IPPROTO_TCP
+import random
+import threading
 import time
 from json import loads, dumps
-from os.path import isfile, expanduser, split, join, exists, isdir
-from os import access, R_OK, getcwd, environ, getenv
+from os.path import isfile, expanduser, split, join, exists, isdir, dirname
+from os import access, R_OK, getcwd, environ, getenv, getpid, makedirs, replace as replace_file
+
+from .connection_pool import KeepAliveRequest
 
 
 try:
@@ -46,6 +53,86 @@ class ItemNotDefined(Exception):
     pass
 
 
+class WorkerFailure(Exception):
+    """Raised by fail_json in place of exiting when it is called from a worker thread of ControllerModule.run_in_worker."""
+
+    def __init__(self, kwargs):
+        super().__init__(kwargs.get('msg'))
+        self.kwargs = kwargs
+
+
+class NameCache:
+    """Maps (controller host, identity, endpoint path, name) to the id of the object with that name.
+
+    Names are only unique within an organization and lookups only see what the authenticated user may see,
+    so entries are kept per identity and per full endpoint path (i.e. organizations/1/teams is not teams).
+    Entries are always kept for the life of the module. With a ttl they are also written to a JSON file at path,
+    which is shared by later module invocations until the entries are ttl seconds old.
+    """
+
+    def __init__(self, path=None, ttl=0, identity=None):
+        self.path = path
+        self.ttl = ttl or 0
+        self.identity = identity
+        self._entries = {}
+        self._loaded = False
+
+    def _key(self, host, endpoint, name):
+        return dumps([host, self.identity, endpoint.strip('/'), str(name)])
+
+    def _read_file(self):
+        try:
+            with open(self.path, 'r') as f:
+                entries = loads(f.read())
+        except (IOError, OSError, ValueError):
+            return {}
+        now = time.time()
+        return dict((key, value) for key, value in entries.items() if isinstance(value, list) and len(value) == 2 and value[1] > now)
+
+    def _write_file(self, update, discard=()):
+        # Merge with what other invocations wrote since we read the file, then replace the file in one step
+        entries = self._read_file()
+        entries.update(update)
+        for key in discard:
+            entries.pop(key, None)
+        try:
+            directory = dirname(self.path)
+            if directory and not isdir(directory):
+                makedirs(directory)
+            temp_path = '{0}.{1}.tmp'.format(self.path, getpid())
+            with open(temp_path, 'w') as f:
+                f.write(dumps(entries))
+            replace_file(temp_path, self.path)
+        except (IOError, OSError):
+            # The cache is only an optimization, the module works the same without it
+            pass
+
+    def get(self, host, endpoint, name):
+        key = self._key(host, endpoint, name)
+        if key not in self._entries and self.ttl > 0 and not self._loaded:
+            self._entries.update((k, v[0]) for k, v in self._read_file().items())
+            self._loaded = True
+        return self._entries.get(key)
+
+    def set(self, host, endpoint, name, object_id):
+        key = self._key(host, endpoint, name)
+        self._entries[key] = object_id
+        if self.ttl > 0:
+            self._write_file({key: [object_id, time.time() + self.ttl]})
+
+    def discard_id(self, host, endpoint, object_id):
+        # Forget every name that resolved to object_id, i.e. because the object was deleted or renamed
+        prefix = dumps([host, self.identity, endpoint.strip('/')])[:-1]
+        stale = [key for key, value in self._entries.items() if value == object_id and key.startswith(prefix)]
+        for key in stale:
+            del self._entries[key]
+        if self.ttl > 0:
+            # Earlier invocations may have written names of the object which this one never read
+            stale.extend(key for key, value in self._read_file().items() if value[0] == object_id and key.startswith(prefix) and key not in stale)
+            if stale:
+                self._write_file({}, discard=stale)
+
+
 class ControllerModule(AnsibleModule):
     url = None
     AUTH_ARGSPEC = dict(
@@ -83,6 +170,14 @@ class ControllerModule(AnsibleModule):
             aliases=['tower_config_file'],
             required=False,
             default=None),
+        resolve_cache_ttl=dict(
+            type='int',
+            required=False,
+            fallback=(env_fallback, ['CONTROLLER_RESOLVE_CACHE_TTL'])),
+        resolve_cache_path=dict(
+            type='path',
+            required=False,
+            fallback=(env_fallback, ['CONTROLLER_RESOLVE_CACHE_PATH'])),
     )
     # Associations of these types are ordered and have special consideration in the modified associations function
     ordered_associations = ['instance_groups', 'galaxy_credentials', 'input_inventories']
@@ -103,6 +198,8 @@ class ControllerModule(AnsibleModule):
     version_checked = False
     error_callback = None
     warn_callback = None
+    # Set per thread while run_in_worker runs a function, so fail_json raises WorkerFailure instead of exiting
+    _worker_state = threading.local()
     apps_api_versions = {
         "awx": "v2",
         "gateway": "v1",
@@ -189,7 +286,10 @@ class ControllerModule(AnsibleModule):
 
         # If we have a specified  tower config, load it
         if self.params.get('controller_config_file'):
-            duplicated_params = [fn for fn in self.AUTH_ARGSPEC if fn != 'controller_config_file' and self.params.get(fn) is not None]
+            duplicated_params = [
+                fn for fn in self.AUTH_ARGSPEC
+                if fn not in ('controller_config_file', 'resolve_cache_ttl', 'resolve_cache_path') and self.params.get(fn) is not None
+            ]
             if duplicated_params:
                 self.warn(
                     (
@@ -285,6 +385,9 @@ class ControllerModule(AnsibleModule):
         pass
 
     def fail_json(self, **kwargs):
+        # Worker threads must not log out or exit while other workers still use the session, the caller fails for them
+        if getattr(self._worker_state, 'active', False):
+            raise WorkerFailure(kwargs)
         # Try to log out if we are authenticated
         self.logout()
         if self.error_callback:
@@ -297,6 +400,39 @@ class ControllerModule(AnsibleModule):
         self.logout()
         super().exit_json(**kwargs)
 
+    def run_in_worker(self, function, *args):
+        # Runs function(*args) in a worker thread of a ThreadPoolExecutor, fail_json raises WorkerFailure there
+        # The thread which collects the results cancels the requests which have not been started, lets the executor
+        # wait for the running ones and then calls fail_json with WorkerFailure.kwargs, so the module fails only once
+        self._worker_state.active = True
+        try:
+            return function(*args)
+        finally:
+            self._worker_state.active = False
+
+    def map_in_workers(self, function, items, workers):
+        # Like ThreadPoolExecutor.map, but if function fails in a worker the other items are cancelled
+        # and the module fails once from the calling thread
+        items = list(items)
+        if workers <= 1 or len(items) <= 1:
+            return [function(item) for item in items]
+
+        results = []
+        failure = None
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(self.run_in_worker, function, item) for item in items]
+            try:
+                for future in futures:
+                    results.append(future.result())
+            except WorkerFailure as e:
+                failure = e.kwargs
+            finally:
+                for future in futures:
+                    future.cancel()
+        if failure is not None:
+            self.fail_json(**failure)
+        return results
+
     def warn(self, warning):
         if self.warn_callback is not None:
             self.warn_callback(warning)
@@ -318,18 +454,54 @@ class ControllerAPIModule(ControllerModule):
     session = None
     IDENTITY_FIELDS = {'users': 'username', 'workflow_job_template_nodes': 'identifier', 'instances': 'hostname'}
     ENCRYPTED_STRING = "$encrypted$"
+    # The number of list view pages that get_all_endpoint and friends will request at the same time
+    page_workers = 4
+    # The number of association changes that modify_associations will send at the same time
+    association_workers = 4
+    # The number of chunks of a bulk request that post_bulk_chunks will send at the same time
+    bulk_workers = 4
+    # Chunks of a bulk request that got one of these back are sent again, the controller (or the proxy in front of it)
+    # has not acted on the request then. After a network error or another server error the hosts of a chunk may already
+    # have been created, sending the chunk again would only fail on the duplicate names, so those are not retried
+    bulk_retry_status_codes = (429, 503)
+    # The number of keep-alive connections the session may hold open to the controller
+    max_connections_per_host = 8
+    # While waiting on jobs the poll interval grows by wait_backoff up to wait_max_interval seconds, +/- wait_jitter
+    wait_backoff = 1.5
+    wait_max_interval = 30
+    wait_jitter = 0.1
 
     def __init__(self, argument_spec, direct_params=None, error_callback=None, warn_callback=None, **kwargs):
         kwargs['supports_check_mode'] = True
 
         super().__init__(argument_spec=argument_spec, direct_params=direct_params, error_callback=error_callback, warn_callback=warn_callback, **kwargs)
-        self.session = Request(cookies=CookieJar(), timeout=self.request_timeout, validate_certs=self.verify_ssl)
+        self.session = KeepAliveRequest(
+            cookies=CookieJar(), timeout=self.request_timeout, validate_certs=self.verify_ssl, max_connections_per_host=self.max_connections_per_host
+        )
+        self._basic_authorization_header = None
 
         if 'update_secrets' in self.params:
             self.update_secrets = self.params.pop('update_secrets')
         else:
             self.update_secrets = True
 
+        self.name_cache = NameCache(
+            path=self.params.get('resolve_cache_path') or join(expanduser('~'), '.ansible', 'tmp', 'controller_resolve_cache.json'),
+            ttl=self.params.get('resolve_cache_ttl'),
+            identity=self.name_cache_identity(),
+        )
+
+    def name_cache_identity(self):
+        # Other users may see other objects by the same name, the token is hashed to keep it out of the cache file
+        token = self.params.get('aap_token')
+        if token:
+            token = sha256(dumps(token, sort_keys=True).encode()).hexdigest()
+        return [self.username, token]
+
+    def name_cache_endpoint(self, endpoint):
+        # The full path, so that names under organizations/1/teams and teams, or teams and /api/v2/teams/, are told apart
+        return self.build_url(endpoint).path
+
     @staticmethod
     def get_name_field_from_endpoint(endpoint):
         return ControllerAPIModule.IDENTITY_FIELDS.get(endpoint, 'name')
@@ -384,21 +556,101 @@ class ControllerAPIModule(ControllerModule):
         return self.make_request('DELETE', endpoint, **kwargs)
 
     def get_all_endpoint(self, endpoint, *args, **kwargs):
+        # Returns the list view response with all pages folded into response['json']['results']
+        # max_objects is an optional limit, if the list view reports more objects than that the module will fail
+        max_objects = kwargs.pop('max_objects', None)
         response = self.get_endpoint(endpoint, *args, **kwargs)
         if 'next' not in response['json']:
             raise RuntimeError('Expected list from API at {0}, got: {1}'.format(endpoint, response))
-        next_page = response['json']['next']
-
-        if response['json']['count'] > 10000:
-            self.fail_json(msg='The number of items being queried for is higher than 10,000.')
+        self._check_max_objects(endpoint, response, max_objects)
 
-        while next_page is not None:
-            next_response = self.get_endpoint(next_page)
-            response['json']['results'] = response['json']['results'] + next_response['json']['results']
-            next_page = next_response['json']['next']
-            response['json']['next'] = next_page
+        response['json']['results'].extend(self.iter_remaining_pages(response))
+        response['json']['next'] = None
         return response
 
+    def iter_all_endpoint(self, endpoint, *args, **kwargs):
+        # Generator version of get_all_endpoint, yields the objects of a list view one at a time
+        # Pages after the first one are fetched concurrently but objects are still yielded in page order
+        max_objects = kwargs.pop('max_objects', None)
+        response = self.get_endpoint(endpoint, *args, **kwargs)
+        if 'next' not in response['json']:
+            raise RuntimeError('Expected list from API at {0}, got: {1}'.format(endpoint, response))
+        self._check_max_objects(endpoint, response, max_objects)
+
+        for item in response['json']['results']:
+            yield item
+        for item in self.iter_remaining_pages(response):
+            yield item
+
+    def _check_max_objects(self, endpoint, response, max_objects):
+        if max_objects is not None and response['json']['count'] > max_objects:
+            self.fail_json(
+                msg='The number of items being queried for at {0} ({1}) is higher than {2}.'.format(endpoint, response['json']['count'], max_objects)
+            )
+
+    def iter_remaining_pages(self, response):
+        # Given the response for one page of a list view, yield the objects of all of the following pages
+        # The page count is derived from count and the size of the first page so the remaining pages can be requested
+        # in parallel over a bounded pool of page_workers, at most twice that many pages are held in memory at once
+        next_page = response['json'].get('next')
+        page_size = len(response['json'].get('results', []))
+        if next_page is None or page_size == 0:
+            return
+
+        next_url = urlparse(next_page)
+        query = parse_qsl(next_url.query, keep_blank_values=True)
+        first_page_number = int(dict(query).get('page', 2))
+        # The page we were given has a next link, so it is full and every page of the list view has page_size objects
+        last_page_number = -(-response['json']['count'] // page_size)
+
+        def page_url(page_number):
+            page_query = [(k, v) for k, v in query if k != 'page'] + [('page', page_number)]
+            return next_url._replace(query=urlencode(page_query)).geturl()
+
+        page_urls = [page_url(page_number) for page_number in range(first_page_number, last_page_number + 1)]
+
+        if self.page_workers <= 1 or len(page_urls) == 1:
+            for url in page_urls:
+                for item in self._get_page_results(url):
+                    yield item
+            return
+
+        pages = iter(page_urls)
+        failure = None
+        with ThreadPoolExecutor(max_workers=self.page_workers) as executor:
+            in_flight = deque()
+            try:
+                for url in pages:
+                    in_flight.append(executor.submit(self.run_in_worker, self._get_page_results, url))
+                    if len(in_flight) >= self.page_workers * 2:
+                        break
+                while in_flight:
+                    try:
+                        results = in_flight.popleft().result()
+                    except WorkerFailure as e:
+                        failure = e.kwargs
+                        break
+                    url = next(pages, None)
+                    if url is not None:
+                        in_flight.append(executor.submit(self.run_in_worker, self._get_page_results, url))
+                    for item in results:
+                        yield item
+            finally:
+                # Also when the caller stops iterating early
+                for future in in_flight:
+                    future.cancel()
+        if failure is not None:
+            self.fail_json(**failure)
+
+    def _get_page_results(self, url):
+        # Objects may have been deleted since the first page was read, so a missing page is just an empty one
+        response = self.get_endpoint(url, return_none_on_404=True)
+        if response is None:
+            return []
+        if response['status_code'] != 200:
+            self.fail_json(msg="Got a {0} response when trying to get page {1}".format(response['status_code'], url))
+        return response['json']['results']
+
     def get_one(self, endpoint, name_or_id=None, allow_none=True, check_exists=False, **kwargs):
         new_kwargs = kwargs.copy()
         response = None
@@ -486,7 +738,30 @@ class ControllerAPIModule(ControllerModule):
         return self.get_one(endpoint, name_or_id=name_or_id, allow_none=False, **kwargs)
 
     def resolve_name_to_id(self, endpoint, name_or_id):
-        return self.get_exactly_one(endpoint, name_or_id)['id']
+        object_id = self.name_cache.get(self.host, self.name_cache_endpoint(endpoint), name_or_id)
+        if object_id is None:
+            object_id = self.get_exactly_one(endpoint, name_or_id)['id']
+            self.name_cache.set(self.host, self.name_cache_endpoint(endpoint), name_or_id, object_id)
+        return object_id
+
+    def prefetch_names(self, endpoint, names):
+        # Resolve many names at the same endpoint with one or__name query so later resolve_name_to_id calls hit the name cache
+        # Ids, named URLs and names which are not unique are left for resolve_name_to_id to deal with
+        name_field = self.get_name_field_from_endpoint(endpoint)
+        cache_endpoint = self.name_cache_endpoint(endpoint)
+        wanted = set(
+            str(name) for name in names or []
+            if not str(name).isdigit() and '++' not in str(name) and self.name_cache.get(self.host, cache_endpoint, name) is None
+        )
+        if not wanted:
+            return
+        query = [('or__{0}'.format(name_field), name) for name in sorted(wanted)] + [('page_size', 200)]
+        matches = {}
+        for item in self.iter_all_endpoint(endpoint, data=query):
+            matches.setdefault(item[name_field], []).append(item['id'])
+        for name, ids in matches.items():
+            if name in wanted and len(ids) == 1:
+                self.name_cache.set(self.host, cache_endpoint, name, ids[0])
 
     def make_request(self, method, endpoint, *args, **kwargs):
         # In case someone is calling us directly; make sure we were given a method, let's not just assume a GET
@@ -516,6 +791,9 @@ class ControllerAPIModule(ControllerModule):
         if headers.get('Content-Type', '') == 'application/json':
             data = dumps(kwargs.get('data', {}))
 
+        # With stream=True the body is not read, the response is returned as 'stream' for the caller to read
+        stream = kwargs.get('stream', False)
+
         try:
             response = self.session.open(
                 method, url.geturl(),
@@ -523,15 +801,21 @@ class ControllerAPIModule(ControllerModule):
                 timeout=self.request_timeout,
                 validate_certs=self.verify_ssl,
                 follow_redirects=True,
-                data=data
+                data=data,
+                stream=stream
             )
         except (SSLValidationError) as ssl_err:
             self.fail_json(msg="Could not establish a secure connection to your host ({1}): {0}.".format(url.netloc, ssl_err))
         except (ConnectionError) as con_err:
+            # With return_server_errors=True the caller retries network and server errors itself
+            if kwargs.get('return_server_errors', False):
+                return {'status_code': None, 'text': str(con_err)}
             self.fail_json(msg="There was a network error of some kind trying to connect to your host ({1}): {0}.".format(url.netloc, con_err))
         except (HTTPError) as he:
             # Sanity check: Did the server send back some kind of internal error?
             if he.code >= 500:
+                if kwargs.get('return_server_errors', False):
+                    return {'status_code': he.code, 'text': str(he)}
                 self.fail_json(msg='The host sent back a server error ({1}): {0}. Please check the logs and try again later'.format(url.path, he))
             # Sanity check: Did we fail to authenticate properly?  If so, fail out now; this is always a failure.
             elif he.code == 401:
@@ -598,6 +882,9 @@ class ControllerAPIModule(ControllerModule):
 
             self.version_checked = True
 
+        if stream:
+            return {'status_code': response.getcode() if PY2 else response.status, 'stream': response}
+
         response_body = ''
         try:
             response_body = response.read()
@@ -646,8 +933,10 @@ class ControllerAPIModule(ControllerModule):
         return prefix
 
     def _get_basic_authorization_header(self):
-        basic_credentials = b64encode("{0}:{1}".format(self.username, self.password).encode()).decode()
-        return "Basic {0}".format(basic_credentials)
+        if self._basic_authorization_header is None:
+            basic_credentials = b64encode("{0}:{1}".format(self.username, self.password).encode()).decode()
+            self._basic_authorization_header = "Basic {0}".format(basic_credentials)
+        return self._basic_authorization_header
 
     def _authenticate_with_basic_auth(self):
         if self.username and self.password:
@@ -695,6 +984,7 @@ class ControllerAPIModule(ControllerModule):
             response = self.delete_endpoint(item_url)
 
             if response['status_code'] in [202, 204]:
+                self.name_cache.discard_id(self.host, self.name_cache_endpoint(self.split_detail_url(item_url)[0]), item_id)
                 if on_delete:
                     on_delete(self, response['json'])
                 self.json_output['changed'] = True
@@ -721,40 +1011,128 @@ class ControllerAPIModule(ControllerModule):
             else:
                 return self.json_output
 
+    @staticmethod
+    def association_changes(existing_ids, new_ids, ordered=False):
+        # Returns the ids to disassociate and the ids to associate (in that order) to turn existing_ids into new_ids
+        if not ordered:
+            existing_set = set(existing_ids)
+            new_set = set(new_ids)
+            return [an_id for an_id in existing_ids if an_id not in new_set], [an_id for an_id in new_ids if an_id not in existing_set]
+
+        # The API appends to the end of an ordered association, so the items which can stay associated are
+        # the longest prefix of new_ids that appears in the same order within existing_ids, everything else is re-added
+        kept = 0
+        position = 0
+        for an_id in new_ids:
+            try:
+                position = existing_ids.index(an_id, position) + 1
+            except ValueError:
+                break
+            kept += 1
+        keep = set(new_ids[:kept])
+        return [an_id for an_id in existing_ids if an_id not in keep], list(new_ids[kept:])
+
     def modify_associations(self, association_endpoint, new_association_list):
         # if we got None instead of [] we are not modifying the association_list
         if new_association_list is None:
             return
 
+        start = time.time()
+
         # First get the existing associations
-        response = self.get_all_endpoint(association_endpoint)
-        existing_associated_ids = [association['id'] for association in response['json']['results']]
+        existing_associated_ids = [association['id'] for association in self.iter_all_endpoint(association_endpoint)]
+        new_association_ids = [int(an_id) for an_id in new_association_list]
 
         # Some associations can be ordered (like galaxy credentials)
-        if association_endpoint.strip('/').split('/')[-1] in self.ordered_associations:
-            if existing_associated_ids == new_association_list:
-                return  # If the current associations EXACTLY match the desired associations then we can return
-            removal_list = existing_associated_ids  # because of ordering, we have to remove everything
-            addition_list = new_association_list  # re-add everything back in-order
-        else:
-            if set(existing_associated_ids) == set(new_association_list):
-                return
-            removal_list = set(existing_associated_ids) - set(new_association_list)
-            addition_list = set(new_association_list) - set(existing_associated_ids)
+        ordered = association_endpoint.strip('/').split('/')[-1] in self.ordered_associations
+        removal_list, addition_list = self.association_changes(existing_associated_ids, new_association_ids, ordered=ordered)
+        if not removal_list and not addition_list:
+            return
 
-        for an_id in removal_list:
-            response = self.post_endpoint(association_endpoint, **{'data': {'id': int(an_id), 'disassociate': True}})
-            if response['status_code'] == 204:
-                self.json_output['changed'] = True
-            else:
-                self.fail_json(msg="Failed to disassociate item {0}".format(response['json'].get('detail', response['json'])))
+        # Handle check mode
+        if self.check_mode:
+            self.json_output['changed'] = True
+            self.exit_json(**self.json_output)
 
-        for an_id in addition_list:
-            response = self.post_endpoint(association_endpoint, **{'data': {'id': int(an_id)}})
-            if response['status_code'] == 204:
-                self.json_output['changed'] = True
-            else:
-                self.fail_json(msg="Failed to associate item {0}".format(response['json'].get('detail', response['json'])))
+        self._post_associations(association_endpoint, removal_list, disassociate=True)
+        # Additions to an ordered association have to be made one by one to keep their order
+        self._post_associations(association_endpoint, addition_list, concurrent=not ordered)
+        self.json_output['changed'] = True
+
+        self.json_output.setdefault('association_stats', {})[association_endpoint] = {
+            'associated': len(addition_list),
+            'disassociated': len(removal_list),
+            'elapsed': round(time.time() - start, 3),
+        }
+
+    def post_bulk_chunks(self, endpoint, items_key, items, data=None, chunk_size=100, workers=None, retries=2):
+        # POST items to a bulk endpoint in chunks of chunk_size, with at most workers (default bulk_workers) chunks in flight
+        # A chunk that gets a 429 or 503 back is sent again up to retries times, with backoff
+        # A network error or another server error is reported in the chunk's response, anything else fails the module
+        # Returns one report per chunk, in order, with the final response of the chunk in 'response'
+        # The reports without their responses and the overall throughput are recorded in json_output['bulk_stats']
+        if self.check_mode:
+            self.json_output['changed'] = True
+            self.exit_json(**self.json_output)
+
+        if chunk_size < 1:
+            self.fail_json(msg="The chunk size must be at least 1, got {0}".format(chunk_size))
+
+        workers = workers or self.bulk_workers
+        chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+
+        def post_chunk(index):
+            chunk_data = dict(data or {})
+            chunk_data[items_key] = chunks[index]
+            intervals = self.wait_intervals(1)
+            start = time.time()
+            attempts = 0
+            while True:
+                attempts += 1
+                response = self.make_request('POST', endpoint, data=chunk_data, return_server_errors=True)
+                if response['status_code'] not in self.bulk_retry_status_codes or attempts > retries:
+                    break
+                time.sleep(next(intervals))
+            elapsed = time.time() - start
+            return {
+                'chunk': index,
+                'items': len(chunks[index]),
+                'status_code': response['status_code'],
+                'attempts': attempts,
+                'elapsed': round(elapsed, 3),
+                'items_per_second': round(len(chunks[index]) / elapsed, 1) if elapsed else None,
+                'response': response,
+            }
+
+        start = time.time()
+        reports = self.map_in_workers(post_chunk, range(len(chunks)), workers)
+        elapsed = time.time() - start
+
+        self.json_output['bulk_stats'] = {
+            'items': len(items),
+            'chunks': [dict((k, v) for k, v in report.items() if k != 'response') for report in reports],
+            'elapsed': round(elapsed, 3),
+            'items_per_second': round(len(items) / elapsed, 1) if elapsed else None,
+            'slowest_chunk': max((report['elapsed'] for report in reports), default=0),
+            'retried_chunks': len([report for report in reports if report['attempts'] > 1]),
+        }
+        return reports
+
+    def _post_associations(self, association_endpoint, id_list, disassociate=False, concurrent=True):
+        def post_association(an_id):
+            data = {'id': an_id}
+            if disassociate:
+                data['disassociate'] = True
+            return self.make_request('POST', association_endpoint, **{'data': data})
+
+        # make_request fails from the worker threads through map_in_workers, so the module fails only once
+        responses = self.map_in_workers(post_association, id_list, self.association_workers if concurrent else 1)
+
+        for response in responses:
+            if response['status_code'] != 204:
+                self.fail_json(
+                    msg="Failed to {0} item {1}".format('disassociate' if disassociate else 'associate', response['json'].get('detail', response['json']))
+                )
 
     def copy_item(self, existing_item, copy_from_name_or_id, new_item_name, endpoint=None, item_type='unknown', copy_lookup_data=None):
 
@@ -970,6 +1348,9 @@ class ControllerAPIModule(ControllerModule):
                     # compare apples-to-apples, old API data to new API data
                     # but do so considering the fields given in parameters
                     self.json_output['changed'] |= self.objects_could_be_different(existing_item, response['json'], field_set=new_item.keys(), warning=True)
+                    # After a rename the old name must no longer resolve to this object
+                    if str(self.get_item_name(response['json'], allow_unknown=True)) != str(item_name):
+                        self.name_cache.discard_id(self.host, self.name_cache_endpoint(self.split_detail_url(item_url)[0]), item_id)
                 elif 'json' in response and '__all__' in response['json']:
                     self.fail_json(msg=response['json']['__all__'])
                 else:
@@ -1021,6 +1402,8 @@ class ControllerAPIModule(ControllerModule):
 
     def logout(self):
         self.authenticated = False
+        if self.session is not None:
+            self.session.close()
 
     def is_job_done(self, job_status):
         if job_status in ['new', 'pending', 'waiting', 'running']:
@@ -1028,9 +1411,67 @@ class ControllerAPIModule(ControllerModule):
         else:
             return True
 
+    def wait_intervals(self, interval, max_interval=None):
+        # Yields the time to sleep between polls, it starts at interval and backs off up to max_interval
+        # A bit of random jitter keeps many tasks waiting at the same time from polling the controller in lockstep
+        if max_interval is None:
+            max_interval = max(interval, self.wait_max_interval)
+        delay = interval
+        while True:
+            yield delay * random.uniform(1 - self.wait_jitter, 1 + self.wait_jitter)
+            delay = min(max_interval, delay * self.wait_backoff)
+
+    def sleep_before_poll(self, intervals, start, timeout):
+        delay = next(intervals)
+        if timeout:
+            # Never sleep past the timeout
+            delay = min(delay, max(0, timeout - (time.time() - start)))
+        time.sleep(delay)
+
+    @staticmethod
+    def split_detail_url(url):
+        # Splits the detail url of an object (i.e. /api/v2/jobs/42/) into its list endpoint and id
+        list_endpoint, object_id = url.rstrip('/').rsplit('/', 1)
+        return '{0}/'.format(list_endpoint), int(object_id)
+
+    def wait_on_jobs(self, endpoint, job_ids, timeout=30, interval=2):
+        # Waits for all of the unified jobs in job_ids at the list endpoint (i.e. jobs) with one list query per poll
+        # The list view leaves out the large fields of the job detail and only the jobs which are not done yet are polled again
+        # Returns a dict of job id to the last list view data for that job, ids the list view did not return are left out
+        start = time.time()
+        intervals = self.wait_intervals(interval)
+        jobs = {}
+        pending = [int(job_id) for job_id in job_ids]
+        while pending:
+            query = {'id__in': ','.join(str(job_id) for job_id in pending), 'page_size': 200}
+            for job in self.iter_all_endpoint(endpoint, data=query):
+                jobs[job['id']] = job
+            pending = [job_id for job_id in pending if job_id in jobs and not self.is_job_done(jobs[job_id]['status'])]
+            if not pending or (timeout and timeout < time.time() - start):
+                break
+            self.sleep_before_poll(intervals, start, timeout)
+        return jobs
+
+    def wait_timed_out(self, object_name, object_type, result):
+        # Account for Legacy messages
+        if object_type == 'legacy_job_wait':
+            self.json_output['msg'] = 'Monitoring of Job - {0} aborted due to timeout'.format(object_name)
+        else:
+            self.json_output['msg'] = 'Monitoring of {0} - {1} aborted due to timeout'.format(object_type, object_name)
+        self.wait_output(result)
+        self.fail_json(**self.json_output)
+
     def wait_on_url(self, url, object_name, object_type, timeout=30, interval=2):
         # Grab our start time to compare against for the timeout
         start = time.time()
+
+        # Wait until the job is done polling the lightweight list view, then only the detail is read
+        list_endpoint, job_id = self.split_detail_url(url)
+        job = self.wait_on_jobs(list_endpoint, [job_id], timeout=timeout, interval=interval).get(job_id)
+        if job is not None and not self.is_job_done(job['status']):
+            self.wait_timed_out(object_name, object_type, {'json': job})
+
+        intervals = self.wait_intervals(interval)
         result = self.get_endpoint(url)
         wait_on_field = 'event_processing_finished'
         if wait_on_field not in result['json']:
@@ -1038,16 +1479,10 @@ class ControllerAPIModule(ControllerModule):
         while not result['json'][wait_on_field]:
             # If we are past our time out fail with a message
             if timeout and timeout < time.time() - start:
-                # Account for Legacy messages
-                if object_type == 'legacy_job_wait':
-                    self.json_output['msg'] = 'Monitoring of Job - {0} aborted due to timeout'.format(object_name)
-                else:
-                    self.json_output['msg'] = 'Monitoring of {0} - {1} aborted due to timeout'.format(object_type, object_name)
-                self.wait_output(result)
-                self.fail_json(**self.json_output)
+                self.wait_timed_out(object_name, object_type, result)
 
-            # Put the process to sleep for our interval
-            time.sleep(interval)
+            # Put the process to sleep until the next poll
+            self.sleep_before_poll(intervals, start, timeout)
 
             result = self.get_endpoint(url)
             self.json_output['status'] = result['json']['status']
@@ -1074,6 +1509,7 @@ class ControllerAPIModule(ControllerModule):
     def wait_on_workflow_node_url(self, url, object_name, object_type, timeout=30, interval=2, **kwargs):
         # Grab our start time to compare against for the timeout
         start = time.time()
+        intervals = self.wait_intervals(interval)
         result = self.get_endpoint(url, **kwargs)
 
         while result["json"]["count"] == 0:
@@ -1084,8 +1520,8 @@ class ControllerAPIModule(ControllerModule):
                 self.wait_output(result)
                 self.fail_json(**self.json_output)
 
-            # Put the process to sleep for our interval
-            time.sleep(interval)
+            # Put the process to sleep until the next poll
+            self.sleep_before_poll(intervals, start, timeout)
             result = self.get_endpoint(url, **kwargs)
 
         if object_type == "Workflow Approval":
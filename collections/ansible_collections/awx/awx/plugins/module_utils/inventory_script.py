@@ -0,0 +1,103 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import codecs
+import re
+from json import JSONDecoder
+
+
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+class ScriptStreamReader:
+    """Reads JSON values one at a time from a stream of bytes.
+
+    Only the value being decoded and the unread part of the last chunk are held in memory.
+    """
+
+    def __init__(self, read, chunk_size=65536):
+        self._read = read
+        self._chunk_size = chunk_size
+        self._decoder = JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self._text = ''
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self, min_available=0):
+        # Read chunks until at least min_available characters are buffered past the current position, or the stream ends
+        while not self._eof:
+            data = self._read(self._chunk_size)
+            if not data:
+                self._eof = True
+            self._text = self._text[self._pos:] + self._text_decoder.decode(data or b'', final=self._eof)
+            self._pos = 0
+            if len(self._text) > min_available:
+                return
+
+    def _peek(self):
+        while True:
+            self._pos = WHITESPACE.match(self._text, self._pos).end()
+            if self._pos < len(self._text):
+                return self._text[self._pos]
+            if self._eof:
+                raise ValueError('Unexpected end of the inventory script')
+            self._fill()
+
+    def expect(self, char):
+        if self._peek() != char:
+            raise ValueError('Expected {0!r} at {1!r} in the inventory script'.format(char, self._text[self._pos:self._pos + 20]))
+        self._pos += 1
+
+    def value(self):
+        self._peek()
+        while True:
+            available = len(self._text) - self._pos
+            try:
+                value, end = self._decoder.raw_decode(self._text, self._pos)
+            except ValueError:
+                if self._eof:
+                    raise
+            else:
+                # A number at the very end of the buffer may continue in the next chunk
+                if end < len(self._text) or self._eof:
+                    self._pos = end
+                    return value
+            # Wait for twice as much data before trying again, so a large value is not decoded over and over
+            self._fill(min_available=available * 2)
+
+    def iter_object_keys(self):
+        # Yields the keys of the object whose opening brace was just read, the caller has to read each value
+        first = True
+        while True:
+            char = self._peek()
+            if char == '}':
+                self._pos += 1
+                return
+            if not first:
+                self.expect(',')
+            first = False
+            key = self.value()
+            self.expect(':')
+            yield key
+
+
+def iter_inventory_script(read, chunk_size=65536):
+    """Yields ('group', name, data) and ('host', name, hostvars) tuples from an inventory script document
+    as they are read from read(size), without loading the whole document into memory.
+    """
+    reader = ScriptStreamReader(read, chunk_size=chunk_size)
+    reader.expect('{')
+    for key in reader.iter_object_keys():
+        if key != '_meta':
+            yield 'group', key, reader.value()
+            continue
+        reader.expect('{')
+        for meta_key in reader.iter_object_keys():
+            if meta_key != 'hostvars':
+                reader.value()
+                continue
+            reader.expect('{')
+            for host_name in reader.iter_object_keys():
+                yield 'host', host_name, reader.value()
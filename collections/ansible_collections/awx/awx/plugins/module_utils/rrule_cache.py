@@ -0,0 +1,57 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from collections import OrderedDict
+import threading
+
+
+def freeze(value):
+    # Returns a hashable copy of a lookup parameter so that it can be part of a cache key
+    if isinstance(value, dict):
+        return tuple(sorted((key, freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+class RuleCache:
+    """A least recently used cache of compiled schedule rules.
+
+    Lookup plugins are instantiated for every call, so the caches live at module level and are shared by
+    every call made by the same process, for example all of the items of a loop.
+    Errors are not cached, a parameter set that failed to compile fails again the next time.
+    """
+
+    def __init__(self, max_size=1024):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, compile_function):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+
+        value = compile_function()
+
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = value
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
@@ -15,7 +15,7 @@ module: bulk_host_delete
 author: "Avi Layani (@Avilir)"
 short_description: Bulk host delete in Automation Platform Controller
 description:
-    - Single-request bulk host deletion in Automation Platform Controller.
+    - Chunked bulk host deletion in Automation Platform Controller.
     - Provides a way to delete many hosts at once from inventories in Controller.
 options:
     hosts:
@@ -24,6 +24,24 @@ options:
       required: True
       type: list
       elements: int
+    chunk_size:
+      description:
+        - The number of hosts sent to the controller in one request.
+        - The controller rejects requests with more than BULK_HOST_MAX_DELETE hosts, which defaults to 250.
+      type: int
+      default: 250
+    concurrent_chunks:
+      description:
+        - The number of requests in flight at the same time.
+        - Defaults to 4.
+      type: int
+    chunk_retries:
+      description:
+        - The number of times a request is sent again after an HTTP 429 or 503, which the controller returns without acting on it.
+        - Chunks which fail in any other way, including network errors and timeouts, are not retried because the controller may
+          already have processed them. The other chunks are still sent.
+      type: int
+      default: 2
 extends_documentation_fragment: awx.awx.auth
 '''
 
@@ -33,6 +51,45 @@ EXAMPLES = '''
     hosts:
       - 1
       - 2
+
+- name: Bulk host delete, 100 hosts per request
+  bulk_host_delete:
+    hosts: "{{ old_host_ids }}"
+    chunk_size: 100
+'''
+
+RETURN = '''
+bulk_stats:
+    description: Timing of the requests, to help choosing I(chunk_size) and I(concurrent_chunks)
+    returned: success
+    type: dict
+    contains:
+        items:
+            description: The number of hosts sent
+            type: int
+        chunks:
+            description: One entry per request with its chunk index, items, status_code, attempts, elapsed seconds and items_per_second
+            type: list
+            elements: dict
+        elapsed:
+            description: Seconds taken by all of the requests
+            type: float
+        items_per_second:
+            description: Hosts processed per second over all of the requests
+            type: float
+        slowest_chunk:
+            description: Seconds taken by the slowest request
+            type: float
+        retried_chunks:
+            description: The number of requests which had to be sent more than once
+            type: int
+    sample:
+        items: 2
+        chunks: [{'chunk': 0, 'items': 2, 'status_code': 201, 'attempts': 1, 'elapsed': 0.211, 'items_per_second': 9.5}]
+        elapsed: 0.212
+        items_per_second: 9.4
+        slowest_chunk: 0.211
+        retried_chunks: 0
 '''
 
 from ..module_utils.controller_api import ControllerAPIModule
@@ -42,6 +99,9 @@ def main():
     # Any additional arguments that are not fields of the item can be added here
     argument_spec = dict(
         hosts=dict(required=True, type='list', elements='int'),
+        chunk_size=dict(type='int', default=250),
+        concurrent_chunks=dict(type='int'),
+        chunk_retries=dict(type='int', default=2),
     )
 
     # Create a module for ourselves
@@ -50,13 +110,26 @@ def main():
     # Extract our parameters
     hosts = module.params.get('hosts')
 
-    # Delete the hosts
-    result = module.post_endpoint("bulk/host_delete", data={"hosts": hosts})
+    # Delete the hosts, a chunk at a time
+    reports = module.post_bulk_chunks(
+        "bulk/host_delete",
+        "hosts",
+        hosts,
+        chunk_size=module.params.get('chunk_size'),
+        workers=module.params.get('concurrent_chunks'),
+        retries=module.params.get('chunk_retries'),
+    )
+    failed = [report for report in reports if report['status_code'] != 201]
 
-    if result['status_code'] != 201:
-        module.fail_json(msg="Failed to delete hosts, see response for details", response=result)
+    module.json_output['changed'] = len(failed) < len(reports)
 
-    module.json_output['changed'] = True
+    if failed:
+        module.json_output['failed_chunks'] = [report['chunk'] for report in failed]
+        module.fail_json(
+            msg="Failed to delete hosts in {0} of {1} chunks, see response for details".format(len(failed), len(reports)),
+            response=failed[0]['response'],
+            **module.json_output
+        )
 
     module.exit_json(**module.json_output)
 
@@ -91,10 +91,18 @@ options:
         - schedule names, IDs, or named URLs to export
       type: list
       elements: str
+    dest:
+      description:
+        - Write the assets to this file instead of returning them.
+        - The file has one JSON object per line, with the resource type of the asset in C(resource) and the asset in C(asset).
+        - Assets are written as each resource type finishes exporting, so the full export is never held in memory.
+        - The import module reads this file with its C(src) option.
+      type: path
 requirements:
   - "awxkit >= 9.3.0"
 notes:
   - Specifying a name of "all" for any asset type will export all items of that asset type.
+  - Resource types are exported concurrently.
 extends_documentation_fragment: awx.awx.auth
 '''
 
@@ -115,11 +123,19 @@ EXAMPLES = '''
 - name: Export a list of inventories
   export:
     inventory: ['My Inventory 1', 'My Inventory 2']
+
+- name: Export all assets to a file
+  export:
+    all: true
+    dest: /tmp/controller_assets.jsonl
 '''
 
 import logging
+from tempfile import mkstemp
+from os import fdopen
 from ansible.module_utils.six.moves import StringIO
 from ..module_utils.awxkit import ControllerAWXKitModule
+from ..module_utils.asset_file import dump_asset_line
 
 try:
     from awxkit.api.pages.api import EXPORTABLE_RESOURCES
@@ -132,6 +148,7 @@ except ImportError:
 def main():
     argument_spec = dict(
         all=dict(type='bool', default=False),
+        dest=dict(type='path'),
     )
 
     # We are not going to raise an error here because the __init__ method of ControllerAWXKitModule will do that for us
@@ -161,6 +178,15 @@ def main():
             # Otherwise we take either the string or None (if the parameter was not passed) to get one or no items
             export_args[resource] = module.params.get(resource)
 
+    # Each resource type is exported by its own awxkit call so they can run at the same time
+    # awxkit exports everything if no asset type was given, that has to be spelled out when asking for one type at a time
+    if all(value is None for value in export_args.values()):
+        export_args = dict((resource, '') for resource in EXPORTABLE_RESOURCES)
+    resources = [resource for resource in EXPORTABLE_RESOURCES if export_args[resource] is not None]
+
+    def export_resource(resource):
+        return module.new_api_v2_object().export_assets(**{resource: export_args[resource]}).get(resource, [])
+
     # Currently the export process does not return anything on error
     # It simply just logs to Python's logger
     # Set up a log gobbler to get error messages from export_assets
@@ -175,8 +201,24 @@ def main():
     log_contents = ''
 
     # Run the export process
+    dest = module.params.get('dest')
     try:
-        module.json_output['assets'] = module.get_api_v2_object().export_assets(**export_args)
+        exported = module.run_concurrently(export_resource, resources, module.export_workers)
+        if dest:
+            # Stream each resource type to a temporary file as soon as it is exported, then move it into place
+            counts = {}
+            fd, tmp_path = mkstemp(dir=module.tmpdir)
+            with fdopen(fd, 'w') as f:
+                for resource, assets in exported:
+                    counts[resource] = len(assets)
+                    for asset in assets:
+                        f.write(dump_asset_line(resource, asset))
+            module.atomic_move(tmp_path, dest)
+            module.json_output['dest'] = dest
+            module.json_output['counts'] = counts
+        else:
+            assets = dict(exported)
+            module.json_output['assets'] = dict((resource, assets[resource]) for resource in resources)
         module.exit_json(**module.json_output)
     except Exception as e:
         module.fail_json(msg="Failed to export assets {0}".format(e))
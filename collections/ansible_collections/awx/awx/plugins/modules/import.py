@@ -26,10 +26,22 @@ options:
       description:
         - The assets to import.
         - This can be the output of the export module or loaded from a file
-      required: True
+        - Exactly one of I(assets) or I(src) is required.
       type: dict
+    src:
+      description:
+        - A JSON-lines file written by the export module with its C(dest) option.
+        - The file is indexed once and the assets of each resource type are read from it as they are imported.
+        - Exactly one of I(assets) or I(src) is required.
+      type: path
 requirements:
   - "awxkit >= 9.3.0"
+notes:
+  - I(assets) are imported with a single awxkit import call.
+  - With I(src), resource types are imported one after another in the order of their dependencies, with users and teams last.
+    The assets of a resource type are imported in chunks which are sent to the controller concurrently,
+    except for inventories and workflow job templates which may refer to each other.
+    Related objects, memberships and roles are assigned once all assets have been imported, so they can refer to assets of any type.
 extends_documentation_fragment: awx.awx.auth
 '''
 
@@ -46,33 +58,110 @@ EXAMPLES = '''
 - name: Load data from a json file created by a command like awx export --organization Default
   import:
     assets: "{{ lookup('file', 'org.json') | from_json() }}"
+
+- name: Export all assets to a file
+  export:
+    all: true
+    dest: /tmp/controller_assets.jsonl
+
+- name: Import all assets from that file
+  import:
+    src: /tmp/controller_assets.jsonl
 '''
 
 from ..module_utils.awxkit import ControllerAWXKitModule
+from ..module_utils.asset_file import AssetFileIndex, iter_chunks
 
 # These two lines are not needed if awxkit changes to do programatic notifications on issues
 from ansible.module_utils.six.moves import StringIO
 import logging
 
-# In this module we don't use EXPORTABLE_RESOURCES, we just want to validate that our installed awxkit has import/export
 try:
-    from awxkit.api.pages.api import EXPORTABLE_RESOURCES  # noqa: F401; pylint: disable=unused-import
+    from awxkit.api.pages.api import EXPORTABLE_RESOURCES
+    from awxkit.api.pages.page import PageCache
 
     HAS_EXPORTABLE_RESOURCES = True
 except ImportError:
     HAS_EXPORTABLE_RESOURCES = False
 
+# The roles of users and teams can refer to any other asset, so they are imported after everything else
+ROLE_RESOURCES = ['teams', 'users']
+# Assets of these types can refer to other assets of the same type, so all of them go to awxkit in a single call
+UNCHUNKED_RESOURCES = ['inventory', 'workflow_job_templates']
 
-def main():
-    argument_spec = dict(assets=dict(type='dict', required=True))
 
-    module = ControllerAWXKitModule(argument_spec=argument_spec, supports_check_mode=False)
+def import_order(api):
+    # awxkit orders the resource types by their dependencies when it imports everything at once
+    try:
+        resources = list(api._dependent_resources())
+    except AttributeError:
+        resources = list(EXPORTABLE_RESOURCES)
+    return [r for r in resources if r not in ROLE_RESOURCES] + [r for r in ROLE_RESOURCES if r in resources]
+
+
+def new_import_api(module):
+    # The state import_assets sets up before it imports anything, on an ApiV2 object of its own
+    api = module.new_api_v2_object()
+    api._cache = PageCache(api.connection)
+    api._related = []
+    api._roles = []
+    return api
+
+
+def import_file(module, index):
+    # Imports the assets of a file in the same steps as awxkit's import_assets, with the assets of each resource type
+    # imported in chunks and concurrently. The related objects, memberships and roles that the chunks queue up refer
+    # to assets of any type, so like import_assets they are only assigned once all of the assets exist.
+    def import_chunk(chunk):
+        resource, chunk_assets = chunk
+        api = new_import_api(module)
+        return api, api._import_list(getattr(api, resource), chunk_assets)
+
+    changed = False
+    assign_api = new_import_api(module)
+    for resource in import_order(module.get_api_v2_object()):
+        chunk_size = None if resource in UNCHUNKED_RESOURCES else module.import_chunk_size
+        chunks = ((resource, chunk) for chunk in iter_chunks(index.iter_assets(resource), chunk_size))
+        for dummy, (api, chunk_changed) in module.run_concurrently(import_chunk, chunks, module.import_workers):
+            changed = changed or bool(chunk_changed)
+            assign_api._related.extend(api._related)
+            assign_api._roles.extend(api._roles)
+
+    assign_api._assign_related()
+    assign_api._assign_membership()
+    assign_api._assign_roles()
+    return changed
+
+
+def main():
+    argument_spec = dict(
+        assets=dict(type='dict'),
+        src=dict(type='path'),
+    )
+
+    module = ControllerAWXKitModule(
+        argument_spec=argument_spec,
+        supports_check_mode=False,
+        mutually_exclusive=[('assets', 'src')],
+        required_one_of=[('assets', 'src')],
+    )
 
     assets = module.params.get('assets')
+    src = module.params.get('src')
 
     if not HAS_EXPORTABLE_RESOURCES:
         module.fail_json(msg="Your version of awxkit does not appear to have import/export")
 
+    index = None
+    if src:
+        try:
+            index = AssetFileIndex(src)
+        except (IOError, OSError, ValueError) as e:
+            module.fail_json(msg="Unable to read assets from {0}: {1}".format(src, e))
+        unknown_resources = set(index.resources) - set(EXPORTABLE_RESOURCES)
+        if unknown_resources:
+            module.fail_json(msg="Unable to import unknown resource types: {0}".format(', '.join(sorted(unknown_resources))))
+
     # Currently the import process does not return anything on error
     # It simply just logs to Python's logger
     # Set up a log gobbler to get error messages from import_assets
@@ -87,8 +176,12 @@ def main():
     log_contents = ''
 
     # Run the import process
+    # Only the chunks being imported are held in memory when reading from a file
     try:
-        module.json_output['changed'] = module.get_api_v2_object().import_assets(assets)
+        if index is not None:
+            module.json_output['changed'] = import_file(module, index)
+        else:
+            module.json_output['changed'] = module.get_api_v2_object().import_assets(assets)
     except Exception as e:
         module.fail_json(msg="Failed to import assets {0}".format(e))
     finally:
@@ -580,6 +580,16 @@ def main():
 
     association_fields = {}
 
+    # Resolve the names of the related lists with one query per endpoint
+    module.prefetch_names('credentials', credentials)
+    module.prefetch_names(
+        'notification_templates',
+        (module.params.get('notification_templates_started') or [])
+        + (module.params.get('notification_templates_success') or [])
+        + (module.params.get('notification_templates_error') or []),
+    )
+    module.prefetch_names('instance_groups', module.params.get('instance_groups'))
+
     if credentials is not None:
         association_fields['credentials'] = []
         for item in credentials:
@@ -24,12 +24,20 @@ options:
     job_id:
       description:
         - ID of the job to monitor.
-      required: True
+        - One of I(job_id) or I(job_ids) is required.
       type: int
+    job_ids:
+      description:
+        - IDs of several jobs of the same I(job_type) to monitor together.
+        - All of the jobs are requested from the controller in a single query on each poll.
+        - Their details are returned in I(jobs) and the task fails if any of them failed.
+      type: list
+      elements: int
     interval:
       description:
         - The interval in sections, to request an update from the controller.
         - For backwards compatibility if unset this will be set to the average of min and max intervals
+        - The interval grows with each poll while the job is still running, up to 30 seconds.
       required: False
       default: 2
       type: float
@@ -56,6 +64,19 @@ EXAMPLES = '''
   job_wait:
     job_id: "{{ job.id }}"
     timeout: 120
+
+- name: Launch several jobs
+  job_launch:
+    job_template: "{{ item }}"
+  loop:
+    - "My Job Template"
+    - "My Other Job Template"
+  register: jobs
+
+- name: Wait for all of them at once
+  job_wait:
+    job_ids: "{{ jobs.results | map(attribute='id') | list }}"
+    timeout: 600
 '''
 
 RETURN = '''
@@ -84,6 +105,13 @@ status:
     returned: success
     type: str
     sample: successful
+jobs:
+    description: id, status, elapsed, started and finished of each job when waiting on job_ids
+    returned: when job_ids is given
+    type: list
+    elements: dict
+    sample: [{"id": 99, "status": "successful", "elapsed": 10.879,
+              "started": "2017-03-01T17:03:53.200234Z", "finished": "2017-03-01T17:04:04.078782Z"}]
 '''
 
 
@@ -93,21 +121,47 @@ from ..module_utils.controller_api import ControllerAPIModule
 def main():
     # Any additional arguments that are not fields of the item can be added here
     argument_spec = dict(
-        job_id=dict(type='int', required=True),
+        job_id=dict(type='int'),
+        job_ids=dict(type='list', elements='int'),
         job_type=dict(choices=['project_updates', 'jobs', 'inventory_updates', 'workflow_jobs'], default='jobs'),
         timeout=dict(type='int'),
         interval=dict(type='float', default=2),
     )
 
     # Create a module for ourselves
-    module = ControllerAPIModule(argument_spec=argument_spec)
+    module = ControllerAPIModule(
+        argument_spec=argument_spec,
+        mutually_exclusive=[('job_id', 'job_ids')],
+        required_one_of=[('job_id', 'job_ids')],
+    )
 
     # Extract our parameters
     job_id = module.params.get('job_id')
+    job_ids = module.params.get('job_ids')
     job_type = module.params.get('job_type')
     timeout = module.params.get('timeout')
     interval = module.params.get('interval')
 
+    if job_ids is not None:
+        # Wait on all of the jobs with one query per poll
+        jobs = module.wait_on_jobs(job_type, job_ids, timeout=timeout, interval=interval)
+
+        missing_ids = [an_id for an_id in job_ids if an_id not in jobs]
+        if missing_ids:
+            module.fail_json(msg='Unable to wait on ' + job_type + ' {0}; those IDs do not exist.'.format(', '.join(str(an_id) for an_id in missing_ids)))
+
+        module.json_output['jobs'] = [dict((k, jobs[an_id].get(k)) for k in ('id', 'status', 'elapsed', 'started', 'finished')) for an_id in job_ids]
+        running_ids = [an_id for an_id in job_ids if not module.is_job_done(jobs[an_id]['status'])]
+        failed_ids = [an_id for an_id in job_ids if jobs[an_id]['failed']]
+        if running_ids:
+            module.json_output['msg'] = 'Monitoring of Jobs - {0} aborted due to timeout'.format(', '.join(str(an_id) for an_id in running_ids))
+            module.fail_json(**module.json_output)
+        elif failed_ids:
+            module.json_output['msg'] = 'Jobs with ids {0} failed'.format(', '.join(str(an_id) for an_id in failed_ids))
+            module.fail_json(**module.json_output)
+
+        module.exit_json(**module.json_output)
+
     # Attempt to look up job based on the provided id
     job = module.get_one(
         job_type,
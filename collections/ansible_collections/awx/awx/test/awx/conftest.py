@@ -100,6 +100,21 @@ def collection_path_set(monkeypatch):
     monkeypatch.syspath_prepend(base_folder)
 
 
+@pytest.fixture(autouse=True)
+def serial_requests(collection_path_set):
+    """The Django test database is only visible to the thread running the test,
+    so requests that the module utils would otherwise make from worker threads
+    are made one after another in the test thread.
+    """
+    ControllerAPIModule = importlib.import_module('plugins.module_utils.controller_api').ControllerAPIModule
+    ControllerAWXKitModule = importlib.import_module('plugins.module_utils.awxkit').ControllerAWXKitModule
+    with mock.patch.object(ControllerAPIModule, 'page_workers', 1), mock.patch.object(ControllerAPIModule, 'association_workers', 1), mock.patch.object(
+        ControllerAPIModule, 'bulk_workers', 1
+    ):
+        with mock.patch.object(ControllerAWXKitModule, 'export_workers', 1), mock.patch.object(ControllerAWXKitModule, 'import_workers', 1):
+            yield
+
+
 @pytest.fixture
 def collection_import():
     """These tests run assuming that the awx_collection folder is inserted
@@ -190,7 +205,7 @@ def run_module(request, collection_import):
 
         with mock.patch.object(resource_class, '_load_params', new=mock_load_params):
             # Call the test utility (like a mock server) instead of issuing HTTP requests
-            with mock.patch('ansible.module_utils.urls.Request.open', new=new_open):
+            with mock.patch('plugins.module_utils.connection_pool.KeepAliveRequest.open', new=new_open):
                 if HAS_TOWER_CLI:
                     tower_cli_mgr = mock.patch('tower_cli.api.Session.request', new=new_request)
                 elif HAS_AWX_KIT:
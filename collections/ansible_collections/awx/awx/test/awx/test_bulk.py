@@ -70,3 +70,53 @@ def test_bulk_host_delete(run_module, admin_user, inventory):
     )
     assert not result.get('failed', False), result.get('msg', result)
     assert result.get('changed'), result
+
+
+@pytest.mark.django_db
+def test_bulk_host_create_chunked(run_module, admin_user, inventory):
+    hosts = [dict(name="host{0}.example.org".format(i)) for i in range(5)]
+    result = run_module(
+        'bulk_host_create',
+        {
+            'inventory': inventory.name,
+            'hosts': hosts,
+            'chunk_size': 2,
+        },
+        admin_user,
+    )
+    assert not result.get('failed', False), result.get('msg', result)
+    assert result.get('changed'), result
+    assert [chunk['items'] for chunk in result['bulk_stats']['chunks']] == [2, 2, 1]
+    assert result['bulk_stats']['items'] == 5
+    assert set(inventory.hosts.values_list('name', flat=True)) == set(h['name'] for h in hosts)
+
+    result = run_module(
+        'bulk_host_delete',
+        {
+            'hosts': list(inventory.hosts.values_list('id', flat=True)),
+            'chunk_size': 3,
+        },
+        admin_user,
+    )
+    assert not result.get('failed', False), result.get('msg', result)
+    assert len(result['bulk_stats']['chunks']) == 2
+    assert inventory.hosts.count() == 0
+
+
+@pytest.mark.django_db
+def test_bulk_host_create_failed_chunk(run_module, admin_user, inventory):
+    inventory.hosts.create(name="taken.example.org")
+    hosts = [dict(name="free.example.org"), dict(name="taken.example.org")]
+    result = run_module(
+        'bulk_host_create',
+        {
+            'inventory': inventory.name,
+            'hosts': hosts,
+            'chunk_size': 1,
+        },
+        admin_user,
+    )
+    assert result.get('failed', False), result
+    assert result['failed_chunks'] == [1]
+    assert result['changed']
+    assert inventory.hosts.filter(name="free.example.org").exists()
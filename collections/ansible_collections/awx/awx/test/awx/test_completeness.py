@@ -84,6 +84,9 @@ no_api_parameter_ok = {
     'workflow_approval': ['action', 'interval', 'timeout', 'workflow_job_id'],
     # bulk
     'bulk_job_launch': ['interval', 'wait'],
+    # the hosts are sent in chunks, these tune how
+    'bulk_host_create': ['chunk_size', 'concurrent_chunks', 'chunk_retries'],
+    'bulk_host_delete': ['chunk_size', 'concurrent_chunks', 'chunk_retries'],
 }
 
 # When this tool was created we were not feature complete. Adding something in here indicates a module
@@ -0,0 +1,111 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from ansible.module_utils.six.moves.urllib.error import HTTPError
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    connections = 0
+    posts = 0
+
+    def setup(self):
+        super().setup()
+        KeepAliveHandler.connections += 1
+
+    def do_GET(self):
+        if self.path.startswith('/missing'):
+            self.send_response(404)
+            body = b'{"detail": "Not found."}'
+        elif self.path.startswith('/moved'):
+            self.send_response(302)
+            self.send_header('Location', '/api/v2/ping/')
+            body = b''
+        else:
+            self.send_response(200)
+            body = json.dumps({'path': self.path}).encode()
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        KeepAliveHandler.posts += 1
+        self.rfile.read(int(self.headers['Content-Length']))
+        if self.path.startswith('/slow'):
+            time.sleep(0.5)
+        self.send_response(201)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+        if self.path.startswith('/drop'):
+            # Close the connection without telling the client, like a server whose keep-alive timeout expired
+            self.close_connection = True
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def keep_alive_server():
+    KeepAliveHandler.connections = 0
+    KeepAliveHandler.posts = 0
+    server = HTTPServer(('127.0.0.1', 0), KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield 'http://127.0.0.1:{0}'.format(server.server_address[1])
+    server.shutdown()
+    server.server_close()
+
+
+def test_connection_is_reused(collection_import, keep_alive_server):
+    KeepAliveRequest = collection_import('plugins.module_utils.connection_pool').KeepAliveRequest
+    session = KeepAliveRequest(use_proxy=False)
+    for page in range(1, 4):
+        response = session.open('GET', '{0}/api/v2/hosts/?page={1}'.format(keep_alive_server, page), follow_redirects=True)
+        assert response.status == 200
+        assert json.loads(response.read()) == {'path': '/api/v2/hosts/?page={0}'.format(page)}
+    session.close()
+    assert KeepAliveHandler.connections == 1
+
+
+def test_redirect_and_error(collection_import, keep_alive_server):
+    KeepAliveRequest = collection_import('plugins.module_utils.connection_pool').KeepAliveRequest
+    session = KeepAliveRequest(use_proxy=False)
+    response = session.open('GET', '{0}/moved/'.format(keep_alive_server), follow_redirects=True)
+    assert json.loads(response.read()) == {'path': '/api/v2/ping/'}
+    with pytest.raises(HTTPError) as excinfo:
+        session.open('GET', '{0}/missing/'.format(keep_alive_server), follow_redirects=True)
+    assert excinfo.value.code == 404
+    assert json.loads(excinfo.value.read()) == {'detail': 'Not found.'}
+    session.close()
+    assert KeepAliveHandler.connections == 1
+
+
+def test_stale_connection_is_retried(collection_import, keep_alive_server):
+    KeepAliveRequest = collection_import('plugins.module_utils.connection_pool').KeepAliveRequest
+    session = KeepAliveRequest(use_proxy=False)
+    assert session.open('POST', '{0}/drop/'.format(keep_alive_server), data='{}').status == 201
+    assert session.open('POST', '{0}/api/v2/hosts/'.format(keep_alive_server), data='{}').status == 201
+    session.close()
+    assert KeepAliveHandler.posts == 2
+    assert KeepAliveHandler.connections == 2
+
+
+def test_timeout_is_not_retried(collection_import, keep_alive_server):
+    ConnectionError = collection_import('plugins.module_utils.connection_pool').ConnectionError
+    KeepAliveRequest = collection_import('plugins.module_utils.connection_pool').KeepAliveRequest
+    session = KeepAliveRequest(use_proxy=False)
+    assert session.open('POST', '{0}/api/v2/hosts/'.format(keep_alive_server), data='{}').status == 201
+    with pytest.raises(ConnectionError):
+        session.open('POST', '{0}/slow/'.format(keep_alive_server), data='{}', timeout=0.1)
+    session.close()
+    # The POST which timed out on the reused connection was sent only once
+    assert KeepAliveHandler.posts == 2
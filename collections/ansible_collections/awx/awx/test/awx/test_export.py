@@ -2,6 +2,8 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
+import json
+
 import pytest
 
 from awx.main.models.execution_environments import ExecutionEnvironment
@@ -147,3 +149,26 @@ def test_export_system_auditor(run_module, organization, system_auditor):  # noq
     assert 'assets' in result
 
     find_by(result['assets'], 'organizations', 'name', 'Default')
+
+
+@pytest.mark.django_db
+def test_export_import_file(run_module, organization, project, inventory, job_template, admin_user, tmp_path):
+    dest = str(tmp_path / 'assets.jsonl')
+    result = run_module('export', dict(all=True, dest=dest), admin_user)
+    assert not result.get('failed', False), result.get('msg', result)
+    assert 'assets' not in result
+    assert result['dest'] == dest
+    assert result['counts']['job_templates'] == 1
+
+    with open(dest) as f:
+        lines = [json.loads(line) for line in f]
+    assert len(lines) == sum(result['counts'].values())
+    r = find_by({'job_templates': [line['asset'] for line in lines if line['resource'] == 'job_templates']}, 'job_templates', 'name', 'test-jt')
+    assert r['project']['name'] == 'test-proj'
+
+    JobTemplate.objects.all().delete()
+
+    result = run_module('import', dict(src=dest), admin_user)
+    assert not result.get('failed', False), result.get('msg', result)
+    assert result['changed']
+    assert JobTemplate.objects.get(name='test-jt').project == project
@@ -0,0 +1,37 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import io
+import json
+
+import pytest
+
+
+SCRIPT = {
+    'all': {'hosts': [], 'children': ['web', 'ungrouped'], 'vars': {'region': 'eu'}},
+    'web': {'hosts': ['web{0}'.format(i) for i in range(50)], 'vars': {'port': 8080123456789}},
+    '_meta': {'hostvars': dict(('web{0}'.format(i), {'ansible_host': '10.0.0.{0}'.format(i), 'motd': u'héllo'}) for i in range(50))},
+}
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 65536])
+def test_iter_inventory_script(collection_import, chunk_size):
+    iter_inventory_script = collection_import('plugins.module_utils.inventory_script').iter_inventory_script
+    stream = io.BytesIO(json.dumps(SCRIPT, indent=2, ensure_ascii=False).encode('utf-8'))
+    groups = {}
+    hostvars = {}
+    for kind, name, data in iter_inventory_script(stream.read, chunk_size=chunk_size):
+        if kind == 'group':
+            groups[name] = data
+        else:
+            hostvars[name] = data
+    assert groups == dict((k, v) for k, v in SCRIPT.items() if k != '_meta')
+    assert hostvars == SCRIPT['_meta']['hostvars']
+
+
+def test_iter_inventory_script_truncated(collection_import):
+    iter_inventory_script = collection_import('plugins.module_utils.inventory_script').iter_inventory_script
+    stream = io.BytesIO(json.dumps(SCRIPT).encode('utf-8')[:-20])
+    with pytest.raises(ValueError):
+        list(iter_inventory_script(stream.read))
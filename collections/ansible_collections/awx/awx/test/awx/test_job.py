@@ -35,3 +35,21 @@ def test_job_wait_not_found(run_module, admin_user):
     result = run_module('job_wait', dict(job_id=42), admin_user)
     result.pop('invocation', None)
     assert result == {"failed": True, "msg": "Unable to wait on job 42; that ID does not exist."}
+
+
+@pytest.mark.django_db
+def test_job_wait_multiple(run_module, admin_user):
+    jobs = [Job.objects.create(status=status, started=now(), finished=now()) for status in ('successful', 'failed', 'successful')]
+    result = run_module('job_wait', dict(job_ids=[job.id for job in jobs]), admin_user)
+    assert result.get('failed') is True
+    assert result['msg'] == "Jobs with ids {0} failed".format(jobs[1].id)
+    assert [job['id'] for job in result['jobs']] == [job.id for job in jobs]
+    assert [job['status'] for job in result['jobs']] == ['successful', 'failed', 'successful']
+
+
+@pytest.mark.django_db
+def test_job_wait_multiple_not_found(run_module, admin_user):
+    job = Job.objects.create(status='successful', started=now(), finished=now())
+    result = run_module('job_wait', dict(job_ids=[job.id, 42]), admin_user)
+    result.pop('invocation', None)
+    assert result == {"failed": True, "msg": "Unable to wait on jobs 42; those IDs do not exist."}
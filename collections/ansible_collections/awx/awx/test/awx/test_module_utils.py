@@ -5,6 +5,8 @@ __metaclass__ = type
 import json
 import sys
 
+import pytest
+
 from awx.main.models import Organization, Team, Project, Inventory
 from requests.models import Response
 from unittest import mock
@@ -66,7 +68,7 @@ def test_version_warning(collection_import, silence_warning):
     cli_data = {'ANSIBLE_MODULE_ARGS': {}}
     testargs = ['module_file2.py', json.dumps(cli_data)]
     with mock.patch.object(sys, 'argv', testargs):
-        with mock.patch('ansible.module_utils.urls.Request.open', new=mock_awx_ping_response):
+        with mock.patch('plugins.module_utils.connection_pool.KeepAliveRequest.open', new=mock_awx_ping_response):
             my_module = ControllerAPIModule(argument_spec=dict())
             my_module._COLLECTION_VERSION = "2.0.0"
             my_module._COLLECTION_TYPE = "awx"
@@ -82,7 +84,7 @@ def test_version_warning_strictness_awx(collection_import, silence_warning):
     testargs = ['module_file2.py', json.dumps(cli_data)]
     # Compare 1.0.0 to 1.2.3 (major matches)
     with mock.patch.object(sys, 'argv', testargs):
-        with mock.patch('ansible.module_utils.urls.Request.open', new=mock_awx_ping_response):
+        with mock.patch('plugins.module_utils.connection_pool.KeepAliveRequest.open', new=mock_awx_ping_response):
             my_module = ControllerAPIModule(argument_spec=dict())
             my_module._COLLECTION_VERSION = "1.0.0"
             my_module._COLLECTION_TYPE = "awx"
@@ -91,7 +93,7 @@ def test_version_warning_strictness_awx(collection_import, silence_warning):
 
     # Compare 1.2.0 to 1.2.3 (major matches minor does not count)
     with mock.patch.object(sys, 'argv', testargs):
-        with mock.patch('ansible.module_utils.urls.Request.open', new=mock_awx_ping_response):
+        with mock.patch('plugins.module_utils.connection_pool.KeepAliveRequest.open', new=mock_awx_ping_response):
             my_module = ControllerAPIModule(argument_spec=dict())
             my_module._COLLECTION_VERSION = "1.2.0"
             my_module._COLLECTION_TYPE = "awx"
@@ -105,7 +107,7 @@ def test_version_warning_strictness_controller(collection_import, silence_warnin
     testargs = ['module_file2.py', json.dumps(cli_data)]
     # Compare 1.2.0 to 1.2.3 (major/minor matches)
     with mock.patch.object(sys, 'argv', testargs):
-        with mock.patch('ansible.module_utils.urls.Request.open', new=mock_controller_ping_response):
+        with mock.patch('plugins.module_utils.connection_pool.KeepAliveRequest.open', new=mock_controller_ping_response):
             my_module = ControllerAPIModule(argument_spec=dict())
             my_module._COLLECTION_VERSION = "1.2.0"
             my_module._COLLECTION_TYPE = "controller"
@@ -114,7 +116,7 @@ def test_version_warning_strictness_controller(collection_import, silence_warnin
 
     # Compare 1.0.0 to 1.2.3 (major/minor fail to match)
     with mock.patch.object(sys, 'argv', testargs):
-        with mock.patch('ansible.module_utils.urls.Request.open', new=mock_controller_ping_response):
+        with mock.patch('plugins.module_utils.connection_pool.KeepAliveRequest.open', new=mock_controller_ping_response):
             my_module = ControllerAPIModule(argument_spec=dict())
             my_module._COLLECTION_VERSION = "1.0.0"
             my_module._COLLECTION_TYPE = "controller"
@@ -129,7 +131,7 @@ def test_type_warning(collection_import, silence_warning):
     cli_data = {'ANSIBLE_MODULE_ARGS': {}}
     testargs = ['module_file2.py', json.dumps(cli_data)]
     with mock.patch.object(sys, 'argv', testargs):
-        with mock.patch('ansible.module_utils.urls.Request.open', new=mock_awx_ping_response):
+        with mock.patch('plugins.module_utils.connection_pool.KeepAliveRequest.open', new=mock_awx_ping_response):
             my_module = ControllerAPIModule(argument_spec={})
             my_module._COLLECTION_VERSION = ping_version
             my_module._COLLECTION_TYPE = "controller"
@@ -214,3 +216,160 @@ def test_multiple_lookup(run_module, admin_user):
     assert 'foo' in result['msg']
     assert 'returned 2 items, expected 1' in result['msg']
     assert 'query' in result
+
+
+def fake_paginated_endpoint(count, page_size):
+    objects = [{'id': i + 1} for i in range(count)]
+
+    def get_endpoint(endpoint, *args, **kwargs):
+        page = 1
+        if '?' in endpoint:
+            page = int(dict(part.split('=') for part in endpoint.split('?', 1)[1].split('&'))['page'])
+        results = objects[(page - 1) * page_size:page * page_size]
+        next_page = '/api/v2/hosts/?page={0}'.format(page + 1) if page * page_size < count else None
+        return {'status_code': 200, 'json': {'count': count, 'next': next_page, 'results': results}}
+
+    return get_endpoint
+
+
+def test_get_all_endpoint_pages(collection_import):
+    ControllerAPIModule = collection_import('plugins.module_utils.controller_api').ControllerAPIModule
+    my_module = ControllerAPIModule(argument_spec={}, direct_params={})
+    with mock.patch.object(my_module, 'get_endpoint', side_effect=fake_paginated_endpoint(count=253, page_size=25)):
+        response = my_module.get_all_endpoint('hosts')
+    assert [item['id'] for item in response['json']['results']] == list(range(1, 254))
+    assert response['json']['next'] is None
+
+
+def test_iter_all_endpoint_max_objects(collection_import):
+    ControllerAPIModule = collection_import('plugins.module_utils.controller_api').ControllerAPIModule
+    my_module = ControllerAPIModule(argument_spec={}, direct_params={}, error_callback=mock.MagicMock(side_effect=RuntimeError))
+    with mock.patch.object(my_module, 'get_endpoint', side_effect=fake_paginated_endpoint(count=30, page_size=25)):
+        assert len(list(my_module.iter_all_endpoint('hosts'))) == 30
+        with pytest.raises(RuntimeError):
+            list(my_module.iter_all_endpoint('hosts', max_objects=10))
+
+
+@pytest.mark.parametrize(
+    'existing, new, ordered, expected',
+    [
+        ([1, 2, 3], [2, 3, 4], False, ([1], [4])),
+        ([1, 2, 3], [3, 2, 1], False, ([], [])),
+        ([1, 2, 3], [1, 2, 3, 4], True, ([], [4])),
+        ([1, 2, 3], [1, 3, 2], True, ([2], [2])),
+        ([1, 2, 3], [2, 3, 1], True, ([1], [1])),
+        ([1, 2, 3], [3, 2, 1], True, ([1, 2], [2, 1])),
+        ([1, 2, 3], [4, 1, 2, 3], True, ([1, 2, 3], [4, 1, 2, 3])),
+    ],
+)
+def test_association_changes(collection_import, existing, new, ordered, expected):
+    ControllerAPIModule = collection_import('plugins.module_utils.controller_api').ControllerAPIModule
+    assert ControllerAPIModule.association_changes(existing, new, ordered=ordered) == expected
+
+
+def test_name_cache_shared_between_modules(collection_import, tmp_path):
+    NameCache = collection_import('plugins.module_utils.controller_api').NameCache
+    path = str(tmp_path / 'resolve_cache.json')
+    NameCache(path=path, ttl=60, identity='alice').set('https://controller', '/api/v2/organizations/', 'Default', 1)
+    assert NameCache(path=path, ttl=60, identity='alice').get('https://controller', '/api/v2/organizations/', 'Default') == 1
+    assert NameCache(path=path, ttl=60, identity='alice').get('https://other', '/api/v2/organizations/', 'Default') is None
+    # Other users may see other objects by the same name
+    assert NameCache(path=path, ttl=60, identity='bob').get('https://controller', '/api/v2/organizations/', 'Default') is None
+
+    NameCache(path=path, ttl=60, identity='alice').discard_id('https://controller', '/api/v2/organizations/', 1)
+    assert NameCache(path=path, ttl=60, identity='alice').get('https://controller', '/api/v2/organizations/', 'Default') is None
+
+    # Without a ttl nothing is written to the file
+    NameCache(path=path, identity='alice').set('https://controller', '/api/v2/organizations/', 'Default', 1)
+    assert NameCache(path=path, ttl=60, identity='alice').get('https://controller', '/api/v2/organizations/', 'Default') is None
+
+
+def test_name_cache_keys(collection_import, tmp_path):
+    ControllerAPIModule = collection_import('plugins.module_utils.controller_api').ControllerAPIModule
+    cache_params = {'resolve_cache_ttl': 60, 'resolve_cache_path': str(tmp_path / 'resolve_cache.json')}
+    alice = ControllerAPIModule(argument_spec={}, direct_params=dict(cache_params, controller_username='alice'))
+    with mock.patch.object(alice, 'get_exactly_one', return_value={'id': 7}):
+        assert alice.resolve_name_to_id('organizations/1/teams', 'Demo') == 7
+
+    bob = ControllerAPIModule(argument_spec={}, direct_params=dict(cache_params, controller_username='bob'))
+    token = ControllerAPIModule(argument_spec={}, direct_params=dict(cache_params, aap_token='secret'))
+    again = ControllerAPIModule(argument_spec={}, direct_params=dict(cache_params, controller_username='alice'))
+    for my_module in (bob, token, again):
+        with mock.patch.object(my_module, 'get_exactly_one', return_value={'id': 8}):
+            # A sub-list does not share names with the top-level list
+            assert my_module.resolve_name_to_id('teams', 'Demo') == 8
+    with mock.patch.object(again, 'get_exactly_one', return_value={'id': 8}):
+        assert again.resolve_name_to_id('organizations/1/teams', 'Demo') == 7
+        assert again.resolve_name_to_id('/api/v2/organizations/1/teams/', 'Demo') == 7
+    with mock.patch.object(bob, 'get_exactly_one', return_value={'id': 9}):
+        assert bob.resolve_name_to_id('organizations/1/teams', 'Demo') == 9
+
+    # The token itself is not written to the file
+    with open(cache_params['resolve_cache_path']) as f:
+        assert 'secret' not in f.read()
+
+
+def test_iter_all_endpoint_fails_once_from_workers(collection_import):
+    ControllerAPIModule = collection_import('plugins.module_utils.controller_api').ControllerAPIModule
+    error_callback = mock.MagicMock(side_effect=RuntimeError)
+    my_module = ControllerAPIModule(argument_spec={}, direct_params={}, error_callback=error_callback)
+    get_page = fake_paginated_endpoint(count=250, page_size=25)
+
+    def get_endpoint(endpoint, *args, **kwargs):
+        if 'page=' in endpoint:
+            my_module.fail_json(msg='Failed to get {0}'.format(endpoint))
+        return get_page(endpoint, *args, **kwargs)
+
+    with mock.patch.object(my_module, 'get_endpoint', side_effect=get_endpoint):
+        with pytest.raises(RuntimeError):
+            list(my_module.iter_all_endpoint('hosts'))
+    # Only the main thread fails, once
+    assert error_callback.call_count == 1
+
+
+def test_post_associations_fails_once_from_workers(collection_import):
+    ControllerAPIModule = collection_import('plugins.module_utils.controller_api').ControllerAPIModule
+    error_callback = mock.MagicMock(side_effect=RuntimeError)
+    my_module = ControllerAPIModule(argument_spec={}, direct_params={}, error_callback=error_callback)
+
+    def make_request(method, endpoint, *args, **kwargs):
+        my_module.fail_json(msg='You don\'t have permission to POST to {0} (HTTP 403).'.format(endpoint))
+
+    with mock.patch.object(my_module, 'make_request', side_effect=make_request):
+        with pytest.raises(RuntimeError):
+            my_module._post_associations('/api/v2/teams/1/users/', list(range(1, 20)))
+    assert error_callback.call_count == 1
+
+
+def test_rename_discards_cached_name(collection_import, tmp_path):
+    ControllerAPIModule = collection_import('plugins.module_utils.controller_api').ControllerAPIModule
+    cache_params = {'resolve_cache_ttl': 60, 'resolve_cache_path': str(tmp_path / 'resolve_cache.json')}
+    my_module = ControllerAPIModule(argument_spec={}, direct_params=cache_params)
+    ControllerAPIModule(argument_spec={}, direct_params=cache_params).name_cache.set(my_module.host, '/api/v2/teams/', 'Old', 5)
+    my_module.check_mode = False
+    existing_item = {'id': 5, 'type': 'team', 'name': 'Old', 'url': '/api/v2/teams/5/'}
+    renamed = dict(existing_item, name='New')
+    with mock.patch.object(my_module, 'make_request', return_value={'status_code': 200, 'json': renamed}):
+        my_module.update_if_needed(existing_item, {'name': 'New'}, auto_exit=False)
+
+    assert ControllerAPIModule(argument_spec={}, direct_params=cache_params).name_cache.get(my_module.host, '/api/v2/teams/', 'Old') is None
+
+
+def test_post_bulk_chunks_retries(collection_import):
+    controller_api = collection_import('plugins.module_utils.controller_api')
+    my_module = controller_api.ControllerAPIModule(argument_spec={}, direct_params={})
+    my_module.check_mode = False
+    responses = {
+        'a': [{'status_code': 503}, {'status_code': 201}],
+        'b': [{'status_code': 500}, {'status_code': 201}],
+        'c': [{'status_code': None, 'text': 'timed out'}, {'status_code': 201}],
+    }
+
+    def make_request(method, endpoint, data=None, **kwargs):
+        return responses[data['hosts'][0]].pop(0)
+
+    with mock.patch.object(my_module, 'make_request', side_effect=make_request):
+        with mock.patch.object(controller_api.time, 'sleep'):
+            reports = my_module.post_bulk_chunks('bulk/host_create', 'hosts', ['a', 'b', 'c'], chunk_size=1)
+    # Only the 503 is sent again, the other chunks may have been created already
+    assert [(report['status_code'], report['attempts']) for report in reports] == [(201, 2), (500, 1), (None, 1)]
@@ -140,3 +140,56 @@ def test_rrule_lookup_plugin_failure(collection_import, freq, kwargs, msg):
     with pytest.raises(AnsibleError) as e:
         assert LookupModule.get_rrule(freq, kwargs)
     assert msg in str(e.value)
+
+
+def test_rrule_lookup_plugin_cache(collection_import):
+    lookup = collection_import('plugins.lookup.schedule_rrule')
+    lookup.RRULE_CACHE.clear()
+    kwargs = {'start_date': '2020-4-16 03:45:07', 'on_days': 'saturday,monday'}
+    first = lookup.LookupModule().get_rrule('week', kwargs)
+    # A new plugin instance, as Ansible makes for every call, gets the rule from the cache
+    assert lookup.LookupModule().get_rrule('week', dict(kwargs)) == first
+    assert (lookup.RRULE_CACHE.hits, lookup.RRULE_CACHE.misses) == (1, 1)
+
+
+def test_rrule_lookup_plugin_no_start_date_not_cached(collection_import):
+    lookup = collection_import('plugins.lookup.schedule_rrule')
+    lookup.RRULE_CACHE.clear()
+    lookup.LookupModule().get_rrule('none', {})
+    lookup.LookupModule().get_rrule('none', {})
+    # The rule starts now, a cached one would keep the time of the first lookup
+    assert (lookup.RRULE_CACHE.hits, lookup.RRULE_CACHE.misses) == (0, 0)
+
+
+def test_rruleset_lookup_plugin_cache(collection_import):
+    lookup = collection_import('plugins.lookup.schedule_rruleset')
+    lookup.RULESET_CACHE.clear()
+    lookup.RULE_CACHE.clear()
+    rules = [{'frequency': 'day', 'byhour': '1, 2'}, {'frequency': 'day', 'byweekday': 'sunday', 'include': False}]
+    first = lookup.LookupModule().run(['2022-04-30 10:30:45'], rules=rules, timezone='UTC')
+    # The rules are not modified, so the same parameters hit the cache
+    assert rules[0]['byhour'] == '1, 2'
+    assert lookup.LookupModule().run(['2022-04-30 10:30:45'], rules=rules, timezone='UTC') == first
+    assert lookup.RULESET_CACHE.hits == 1
+    # A rule set sharing a rule with the previous one only builds the new rule
+    lookup.LookupModule().run(['2022-04-30 10:30:45'], rules=rules[:1] + [{'frequency': 'week'}], timezone='UTC')
+    assert (lookup.RULE_CACHE.hits, lookup.RULE_CACHE.misses) == (1, 3)
+
+
+def test_schedule_preview_lookup_plugin(collection_import):
+    LookupModule = collection_import('plugins.lookup.schedule_preview').LookupModule()
+    daily = 'DTSTART;TZID=America/New_York:20200416T034507 RRULE:FREQ=DAILY;INTERVAL=1'
+    until = 'DTSTART;TZID=America/New_York:20200416T034507 RRULE:FREQ=DAILY;UNTIL=20200418T034507;INTERVAL=1'
+    ruleset = 'DTSTART;TZID=UTC:20220430T103045 RRULE:FREQ=DAILY;INTERVAL=1 EXRULE:FREQ=DAILY;BYDAY=SU;INTERVAL=1'
+    result = LookupModule.run([daily, until, ruleset, daily], count=3, start_date='2020-04-17')
+    assert result[0] == ['2020-04-17T03:45:07-04:00', '2020-04-18T03:45:07-04:00', '2020-04-19T03:45:07-04:00']
+    # The UNTIL is in the timezone of DTSTART, as the controller treats it
+    assert result[1] == ['2020-04-17T03:45:07-04:00', '2020-04-18T03:45:07-04:00']
+    assert result[2] == ['2022-04-30T10:30:45+00:00', '2022-05-02T10:30:45+00:00', '2022-05-03T10:30:45+00:00']
+    assert result[3] == result[0]
+
+    assert LookupModule.run([daily], start_date='2020-04-17', end_date='2020-04-18 12:00:00') == [result[0][:2]]
+
+    with pytest.raises(AnsibleError) as e:
+        LookupModule.run(['junk'])
+    assert 'Unable to parse rule 1' in str(e.value)
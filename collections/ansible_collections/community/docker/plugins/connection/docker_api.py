@@ -103,6 +103,29 @@ options:
     type: boolean
     default: false
     version_added: 3.12.0
+  persistent_shell:
+    description:
+      - Keep a shell running in the container and run all commands through it, instead of creating, starting and
+        inspecting a new exec instance for every command.
+      - This saves several requests to the Docker daemon for every command, which adds up for tasks that run many
+        commands.
+      - Every command still runs in its own process, so changes to the environment or the current directory made by
+        one command do not affect the next one.
+      - Commands that need to answer a privilege escalation password prompt, and commands whose input contains NUL bytes
+        or does not end with a newline, are run with their own exec instance.
+      - The shell is restarted when O(remote_user), O(extra_env), O(working_dir), or O(privileged) change, and when it has
+        exited.
+      - This option is ignored for Windows containers.
+    env:
+      - name: ANSIBLE_DOCKER_PERSISTENT_SHELL
+    ini:
+      - key: persistent_shell
+        section: docker_connection
+    vars:
+      - name: ansible_docker_persistent_shell
+    type: boolean
+    default: false
+    version_added: 4.7.0
 """
 
 import os
@@ -124,6 +147,11 @@ from ansible_collections.community.docker.plugins.module_utils.copy import (
     put_file,
 )
 
+from ansible_collections.community.docker.plugins.plugin_utils.persistent_shell import (
+    PersistentShell,
+    PersistentShellError,
+    can_frame_input,
+)
 from ansible_collections.community.docker.plugins.plugin_utils.socket_handler import (
     DockerSocketHandler,
 )
@@ -183,6 +211,9 @@ class Connection(ConnectionBase):
 
         self.actual_user = None
 
+        self._persistent_shell = None
+        self._persistent_shell_key = None
+
     def _connect(self, port=None):
         """ Connect to the container. Nothing to do """
         super(Connection, self)._connect()
@@ -206,26 +237,7 @@ class Connection(ConnectionBase):
                     if self.actual_user is not None:
                         display.vvv(u"Actual user is '{0}'".format(self.actual_user))
 
-    def exec_command(self, cmd, in_data=None, sudoable=False):
-        """ Run a command on the docker host """
-
-        super(Connection, self).exec_command(cmd, in_data=in_data, sudoable=sudoable)
-
-        command = [self._play_context.executable, '-c', to_text(cmd)]
-
-        do_become = self.become and self.become.expect_prompt() and sudoable
-
-        display.vvv(
-            u"EXEC {0}{1}{2}".format(
-                to_text(command),
-                ', with stdin ({0} bytes)'.format(len(in_data)) if in_data is not None else '',
-                ', with become prompt' if do_become else '',
-            ),
-            host=self.get_option('remote_addr')
-        )
-
-        need_stdin = True if (in_data is not None) or do_become else False
-
+    def _get_exec_data(self, command, need_stdin):
         data = {
             'Container': self.get_option('remote_addr'),
             'User': self.get_option('remote_user') or '',
@@ -261,6 +273,75 @@ class Connection(ConnectionBase):
                     .format(self.client.docker_api_version_str)
                 )
 
+        return data
+
+    def _can_use_persistent_shell(self, do_become, in_data):
+        if not self.get_option('persistent_shell') or getattr(self._shell, "_IS_WINDOWS", False):
+            return False
+        # Password prompts need their own exec instance, and the shell can only pass on text ending with a newline
+        return not do_become and can_frame_input(in_data)
+
+    def _get_persistent_shell(self):
+        data = self._get_exec_data([self._play_context.executable], True)
+        key = repr(sorted(data.items()))
+        if self._persistent_shell is not None and (self._persistent_shell_key != key or not self._persistent_shell.is_alive()):
+            # The user, environment or working directory changed, or the shell is gone (for example since the container restarted)
+            self._close_persistent_shell()
+
+        if self._persistent_shell is None:
+            display.vvvv(u"Starting persistent shell {0}".format(to_text(data['Cmd'])), host=self.get_option('remote_addr'))
+            exec_data = self._call_client(lambda: self.client.post_json_to_json('/containers/{0}/exec', self.get_option('remote_addr'), data=data))
+            exec_socket = self._call_client(lambda: self.client.post_json_to_stream_socket(
+                '/exec/{0}/start', exec_data['Id'], data={'Tty': False, 'Detach': False}))
+            self._persistent_shell = PersistentShell(display, exec_socket, container=self.get_option('remote_addr'))
+            self._persistent_shell_key = key
+        return self._persistent_shell
+
+    def _close_persistent_shell(self):
+        if self._persistent_shell is not None:
+            display.vvvv(u"Stopping persistent shell", host=self.get_option('remote_addr'))
+            shell = self._persistent_shell
+            self._persistent_shell = None
+            self._persistent_shell_key = None
+            shell.close()
+
+    def _exec_persistent_command(self, command, in_data):
+        shell = self._get_persistent_shell()
+        try:
+            return shell.run(command, in_data)
+        except PersistentShellError as e:
+            self._close_persistent_shell()
+            raise AnsibleConnectionFailure('{0} in container "{1}"'.format(e, self.get_option('remote_addr')))
+        except Exception:
+            # The shell's input and output are no longer in sync
+            self._close_persistent_shell()
+            raise
+
+    def exec_command(self, cmd, in_data=None, sudoable=False):
+        """ Run a command on the docker host """
+
+        super(Connection, self).exec_command(cmd, in_data=in_data, sudoable=sudoable)
+
+        command = [self._play_context.executable, '-c', to_text(cmd)]
+
+        do_become = self.become and self.become.expect_prompt() and sudoable
+
+        display.vvv(
+            u"EXEC {0}{1}{2}".format(
+                to_text(command),
+                ', with stdin ({0} bytes)'.format(len(in_data)) if in_data is not None else '',
+                ', with become prompt' if do_become else '',
+            ),
+            host=self.get_option('remote_addr')
+        )
+
+        if self._can_use_persistent_shell(do_become, in_data):
+            return self._exec_persistent_command(command, in_data)
+
+        need_stdin = True if (in_data is not None) or do_become else False
+
+        data = self._get_exec_data(command, need_stdin)
+
         exec_data = self._call_client(lambda: self.client.post_json_to_json('/containers/{0}/exec', self.get_option('remote_addr'), data=data))
         exec_id = exec_data['Id']
 
@@ -324,6 +405,13 @@ class Connection(ConnectionBase):
                 remote_path = os.path.join(os.path.sep, remote_path)
             return os.path.normpath(remote_path)
 
+    @staticmethod
+    def _numeric_ids(user):
+        parts = (user or '').split(':')
+        if len(parts) == 2 and all(part.isdigit() for part in parts):
+            return int(parts[0]), int(parts[1])
+        return None
+
     def put_file(self, in_path, out_path):
         """ Transfer a file from local to docker container """
         super(Connection, self).put_file(in_path, out_path)
@@ -331,6 +419,9 @@ class Connection(ConnectionBase):
 
         out_path = self._prefix_login_path(out_path)
 
+        if self.actual_user not in self.ids and self._numeric_ids(self.actual_user):
+            # A user given as uid:gid does not need to be looked up in the container
+            self.ids[self.actual_user] = self._numeric_ids(self.actual_user)
         if self.actual_user not in self.ids:
             dummy, ids, dummy = self.exec_command(b'id -u && id -g')
             try:
@@ -393,7 +484,9 @@ class Connection(ConnectionBase):
     def close(self):
         """ Terminate the connection. Nothing to do for Docker"""
         super(Connection, self).close()
+        self._close_persistent_shell()
         self._connected = False
 
     def reset(self):
+        self._close_persistent_shell()
         self.ids.clear()
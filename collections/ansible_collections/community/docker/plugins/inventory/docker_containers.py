@@ -20,6 +20,7 @@ author:
   - Felix Fontein (@felixfontein)
 extends_documentation_fragment:
   - ansible.builtin.constructed
+  - ansible.builtin.inventory_cache
   - community.docker.docker.api_documentation
   - community.library_inventory_filtering_v1.inventory_filter
 description:
@@ -28,6 +29,11 @@ description:
 notes:
   - The configuration file must be a YAML file whose filename ends with V(docker.yml) or V(docker.yaml). Other filenames will
     not be accepted.
+  - If O(cache=true), the inspection results of the containers are stored in the inventory cache together with the time of
+    the Docker daemon. The next time, the containers are listed again and only containers that are new, whose state, name,
+    image or labels changed, or for which the daemon reported container events or network connect and disconnect events
+    since that time, are inspected again. The cache is only used if O(inspect_containers=true). It is discarded if the
+    Docker daemon is a different one, and when the inventory is refreshed or the cache is flushed.
 options:
   plugin:
     description:
@@ -107,6 +113,28 @@ options:
 
   filters:
     version_added: 3.5.0
+
+  inspect_containers:
+    description:
+      - Whether to inspect every container to get its full details.
+      - If set to V(false), only the summary returned by listing the containers is used. This needs a single request to the
+        Docker daemon no matter how many containers there are, and is much faster for daemons with many containers.
+      - The summary has different and fewer values than the inspection result. For example C(docker_state) is a string like
+        V(running) instead of a dictionary, C(docker_labels) contains the labels, and there is no C(docker_config) or
+        C(docker_hostconfig) besides its C(NetworkMode). O(compose), O(groups), O(keyed_groups), and O(filters) need to be
+        written for the summary values.
+    type: bool
+    default: true
+    version_added: 4.7.0
+
+  inspect_concurrency:
+    description:
+      - The number of containers inspected at the same time.
+      - The requests share the connection pool of the Docker client, which keeps up to 10 connections to the daemon.
+      - Only used if O(inspect_containers=true).
+    type: int
+    default: 8
+    version_added: 4.7.0
 """
 
 EXAMPLES = '''
@@ -157,6 +185,23 @@ compose:
   ansible_ssh_host: ansible_ssh_host | default(docker_name[1:], true)
   ansible_ssh_port: ansible_ssh_port | default(22, true)
 
+---
+# Build the inventory from the container list only, without inspecting every container
+plugin: community.docker.docker_containers
+inspect_containers: false
+keyed_groups:
+  # Add containers to groups by their state, like state_running or state_exited
+  - prefix: state
+    key: docker_state
+
+---
+# Keep the inspection results in a cache, only containers that changed are inspected again
+plugin: community.docker.docker_containers
+cache: true
+cache_plugin: ansible.builtin.jsonfile
+cache_connection: ~/.cache/ansible/docker_containers
+cache_timeout: 86400
+
 ---
 # Only consider containers which have a label 'foo', or whose name starts with 'a'
 plugin: community.docker.docker_containers
@@ -172,10 +217,12 @@ filters:
 '''
 
 import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 from ansible.errors import AnsibleError
 from ansible.module_utils.common.text.converters import to_native
-from ansible.plugins.inventory import BaseInventoryPlugin, Constructable
+from ansible.plugins.inventory import BaseInventoryPlugin, Constructable, Cacheable
 
 from ansible_collections.community.docker.plugins.module_utils.common_api import (
     RequestException,
@@ -188,13 +235,27 @@ from ansible_collections.community.docker.plugins.plugin_utils.common_api import
 )
 
 from ansible_collections.community.docker.plugins.module_utils._api.errors import APIError, DockerException
+from ansible_collections.community.docker.plugins.module_utils._api.utils.json_stream import json_stream
+from ansible_collections.community.docker.plugins.module_utils._api.utils.utils import convert_filters
+from ansible_collections.community.docker.plugins.plugin_utils.inventory_cache import (
+    CACHE_VERSION,
+    get_cached_state,
+    get_changed_ids,
+    parse_daemon_time,
+)
 from ansible_collections.community.docker.plugins.plugin_utils.unsafe import make_unsafe
 from ansible_collections.community.library_inventory_filtering_v1.plugins.plugin_utils.inventory_filter import parse_filters, filter_host
 
 MIN_DOCKER_API = None
 
+# Container events which do not change the inspection result
+IGNORED_CONTAINER_ACTIONS = ('archive-path', 'attach', 'commit', 'copy', 'exec', 'export', 'extract-to-dir', 'resize', 'top')
 
-class InventoryModule(BaseInventoryPlugin, Constructable):
+# Values of the container list which are compared with the cache, in case events were missed
+SUMMARY_KEYS = ('Names', 'Image', 'ImageID', 'State', 'Labels')
+
+
+class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
     ''' Host inventory parser for ansible using Docker daemon as source. '''
 
     NAME = 'community.docker.docker_containers'
@@ -202,9 +263,102 @@ class InventoryModule(BaseInventoryPlugin, Constructable):
     def _slugify(self, value):
         return 'docker_%s' % (re.sub(r'[^\w-]', '_', value).lower().lstrip('_'))
 
-    def _populate(self, client):
+    def _inspect_container(self, client, container):
+        try:
+            return client.get_json('/containers/{0}/json', container['Id'])
+        except APIError as exc:
+            name = (container.get('Names') or [container['Id']])[0].lstrip('/')
+            raise AnsibleError("Error inspecting container %s - %s" % (name, str(exc)))
+
+    def _container_details(self, client, container, known):
+        details = known.get(container['Id'])
+        if details is None:
+            details = self._inspect_container(client, container)
+        return details
+
+    def _iter_container_details(self, client, containers, known=None):
+        # Yields (container, details) in the order of containers. Details are the inspection result, or the summary from the
+        # container list if inspect_containers is false. Containers in known are not inspected, their value is used instead.
+        # Up to inspect_concurrency containers are inspected at the same time over the client's connection pool, and at most
+        # twice that many results are held at once.
+        if not self.get_option('inspect_containers'):
+            for container in containers:
+                yield container, container
+            return
+
+        known = known or {}
+        workers = max(1, self.get_option('inspect_concurrency') or 1)
+        if workers == 1 or len(containers) - len(known) <= 1:
+            for container in containers:
+                yield container, self._container_details(client, container, known)
+            return
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+            remaining = iter(containers)
+            for container in remaining:
+                pending.append((container, executor.submit(self._container_details, client, container, known)))
+                if len(pending) >= workers * 2:
+                    break
+            while pending:
+                container, future = pending.popleft()
+                for next_container in remaining:
+                    pending.append((next_container, executor.submit(self._container_details, client, next_container, known)))
+                    break
+                yield container, future.result()
+
+    def _get_daemon_state(self, client):
+        # Returns the ID of the daemon and its current time in UNIX seconds, the time is None if it is not known
+        try:
+            info = client.get_json('/info')
+        except APIError as exc:
+            raise AnsibleError("Error retrieving Docker daemon info: %s" % to_native(exc))
+        return info.get('ID'), parse_daemon_time(info.get('SystemTime'))
+
+    def _get_changed_container_ids(self, client, since, until):
+        params = {
+            'since': str(since),
+            'until': str(until),
+            # Connecting a container to a network or disconnecting it changes the container, but is reported as a network event
+            'filters': convert_filters({'type': ['container', 'network']}),
+        }
+        try:
+            # Since until is given, the daemon ends the response once it sent all events up to then
+            events = json_stream([client.get_text('/events', params=params)])
+            return get_changed_ids(events, ignored_actions=IGNORED_CONTAINER_ACTIONS)
+        except APIError as exc:
+            raise AnsibleError("Error retrieving Docker events: %s" % to_native(exc))
+
+    def _get_known_details(self, client, containers, cached, until):
+        # Returns the cached inspection results that are still valid for containers
+        if cached is None or until is None:
+            return {}
+        changed = self._get_changed_container_ids(client, cached['until'], until)
+        known = {}
+        for container in containers:
+            entry = cached['objects'].get(container['Id'])
+            if not isinstance(entry, dict) or container['Id'] in changed:
+                continue
+            if entry.get('summary') != [container.get(key) for key in SUMMARY_KEYS]:
+                continue
+            known[container['Id']] = entry['details']
+        self.display.vvv('docker_containers: using the cached inspection result for %d of %d containers' % (len(known), len(containers)))
+        return known
+
+    @staticmethod
+    def _summary_ssh_port(container, ssh_port):
+        # The container list has the published ports as a list, return the one for the SSH port like inspection has it
+        for port in container.get('Ports') or []:
+            if port.get('PrivatePort') == ssh_port and port.get('Type') == 'tcp' and port.get('PublicPort'):
+                return dict(HostIp=port.get('IP', ''), HostPort=str(port['PublicPort']))
+        return dict()
+
+    def _populate(self, client, cached=None):
+        # Returns the data for the inventory cache if the cache is enabled, otherwise None
         strict = self.get_option('strict')
+        use_cache = self.get_option('cache') and self.get_option('inspect_containers')
 
+        inspect_containers = self.get_option('inspect_containers')
         ssh_port = self.get_option('private_ssh_port')
         default_ip = self.get_option('default_ip')
         hostname = self.get_option('docker_host')
@@ -212,6 +366,13 @@ class InventoryModule(BaseInventoryPlugin, Constructable):
         connection_type = self.get_option('connection_type')
         add_legacy_groups = self.get_option('add_legacy_groups')
 
+        cache_data = None
+        if use_cache:
+            # Get the time before listing the containers, so that changes while listing are also reported as events next time
+            daemon_id, until = self._get_daemon_state(client)
+            cache_data = dict(version=CACHE_VERSION, daemon=daemon_id, until=until, objects=dict())
+            cached = get_cached_state(cached, daemon_id)
+
         try:
             params = {
                 'limit': -1,
@@ -236,11 +397,16 @@ class InventoryModule(BaseInventoryPlugin, Constructable):
                 if value is not None:
                     extra_facts[var_name] = value
 
+        known = self._get_known_details(client, containers, cached, until) if use_cache else None
+
         filters = parse_filters(self.get_option('filters'))
-        for container in containers:
+        for container, inspect in self._iter_container_details(client, containers, known):
             id = container.get('Id')
             short_id = id[:13]
 
+            if cache_data is not None:
+                cache_data['objects'][id] = dict(summary=[container.get(key) for key in SUMMARY_KEYS], details=inspect)
+
             try:
                 name = container.get('Names', list())[0].lstrip('/')
                 full_name = name
@@ -254,16 +420,15 @@ class InventoryModule(BaseInventoryPlugin, Constructable):
             )
             full_facts = dict()
 
-            try:
-                inspect = client.get_json('/containers/{0}/json', id)
-            except APIError as exc:
-                raise AnsibleError("Error inspecting container %s - %s" % (name, str(exc)))
-
-            state = inspect.get('State') or dict()
-            config = inspect.get('Config') or dict()
-            labels = config.get('Labels') or dict()
-
-            running = state.get('Running')
+            if inspect_containers:
+                state = inspect.get('State') or dict()
+                config = inspect.get('Config') or dict()
+                labels = config.get('Labels') or dict()
+                running = state.get('Running')
+            else:
+                config = dict(Image=container.get('Image'))
+                labels = container.get('Labels') or dict()
+                running = container.get('State') == 'running'
 
             groups = []
 
@@ -289,9 +454,12 @@ class InventoryModule(BaseInventoryPlugin, Constructable):
                 # Figure out ssh IP and Port
                 try:
                     # Lookup the public facing port Nat'ed to ssh port.
-                    network_settings = inspect.get('NetworkSettings') or {}
-                    port_settings = network_settings.get('Ports') or {}
-                    port = port_settings.get('%d/tcp' % (ssh_port, ))[0]
+                    if inspect_containers:
+                        network_settings = inspect.get('NetworkSettings') or {}
+                        port_settings = network_settings.get('Ports') or {}
+                        port = port_settings.get('%d/tcp' % (ssh_port, ))[0]
+                    else:
+                        port = self._summary_ssh_port(container, ssh_port)
                 except (IndexError, AttributeError, TypeError):
                     port = dict()
 
@@ -368,6 +536,8 @@ class InventoryModule(BaseInventoryPlugin, Constructable):
                 else:
                     self.inventory.add_host(name, group='stopped')
 
+        return cache_data
+
     def verify_file(self, path):
         """Return the possibly of a file being consumable by this plugin."""
         return (
@@ -380,9 +550,19 @@ class InventoryModule(BaseInventoryPlugin, Constructable):
     def parse(self, inventory, loader, path, cache=True):
         super(InventoryModule, self).parse(inventory, loader, path, cache)
         self._read_config_data(path)
+
+        cache_key = self.get_cache_key(path)
+        user_cache_setting = self.get_option('cache')
+        cached = None
+        if user_cache_setting and cache:
+            try:
+                cached = self._cache[cache_key]
+            except KeyError:
+                pass
+
         client = self._create_client()
         try:
-            self._populate(client)
+            cache_data = self._populate(client, cached)
         except DockerException as e:
             raise AnsibleError(
                 'An unexpected Docker error occurred: {0}'.format(e)
@@ -391,3 +571,6 @@ class InventoryModule(BaseInventoryPlugin, Constructable):
             raise AnsibleError(
                 'An unexpected requests error occurred when trying to talk to the Docker daemon: {0}'.format(e)
             )
+
+        if cache_data is not None:
+            self._cache[cache_key] = cache_data
@@ -18,6 +18,7 @@ requirements:
   - L(Docker SDK for Python,https://docker-py.readthedocs.io/en/stable/) >= 1.10.0
 extends_documentation_fragment:
   - ansible.builtin.constructed
+  - ansible.builtin.inventory_cache
   - community.library_inventory_filtering_v1.inventory_filter
 description:
   - Reads inventories from the Docker swarm API.
@@ -27,6 +28,10 @@ description:
 notes:
   - The configuration file must be a YAML file whose filename ends with V(docker_swarm.yml) or V(docker_swarm.yaml). Other
     filenames will not be accepted.
+  - If O(cache=true), the node attributes are stored in the inventory cache together with the time of the swarm manager.
+    The next time, the nodes are listed again and only nodes that are new, whose version changed, or for which the manager
+    reported events since that time, are retrieved again. The cache is discarded if the swarm is a different one, and when
+    the inventory is refreshed or the cache is flushed.
 options:
   plugin:
     description: The name of this plugin, it should always be set to V(community.docker.docker_swarm) for this plugin to recognize
@@ -149,15 +154,29 @@ keyed_groups:
   # hint: labels containing special characters will be converted to safe names
   - key: 'Spec.Labels'
     prefix: label
+
+---
+# Keep the node attributes in a cache, only nodes that changed are retrieved again
+plugin: community.docker.docker_swarm
+docker_host: unix:///var/run/docker.sock
+cache: true
+cache_plugin: ansible.builtin.jsonfile
+cache_connection: ~/.cache/ansible/docker_swarm
 '''
 
 from ansible.errors import AnsibleError
 from ansible.module_utils.common.text.converters import to_native
 from ansible_collections.community.docker.plugins.module_utils.common import get_connect_params
 from ansible_collections.community.docker.plugins.module_utils.util import update_tls_hostname
-from ansible.plugins.inventory import BaseInventoryPlugin, Constructable
+from ansible.plugins.inventory import BaseInventoryPlugin, Constructable, Cacheable
 from ansible.parsing.utils.addresses import parse_address
 
+from ansible_collections.community.docker.plugins.plugin_utils.inventory_cache import (
+    CACHE_VERSION,
+    get_cached_state,
+    get_changed_ids,
+    parse_daemon_time,
+)
 from ansible_collections.community.docker.plugins.plugin_utils.unsafe import make_unsafe
 from ansible_collections.community.library_inventory_filtering_v1.plugins.plugin_utils.inventory_filter import parse_filters, filter_host
 
@@ -168,7 +187,7 @@ except ImportError:
     HAS_DOCKER = False
 
 
-class InventoryModule(BaseInventoryPlugin, Constructable):
+class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
     ''' Host inventory parser for ansible using Docker swarm as source. '''
 
     NAME = 'community.docker.docker_swarm'
@@ -176,7 +195,27 @@ class InventoryModule(BaseInventoryPlugin, Constructable):
     def _fail(self, msg):
         raise AnsibleError(msg)
 
-    def _populate(self):
+    @staticmethod
+    def _node_version(node):
+        return (node.attrs.get('Version') or {}).get('Index')
+
+    def _get_known_attrs(self, cached, until):
+        # Returns the cached attributes of the nodes that did not change since the cache was written
+        if cached is None or until is None:
+            return {}
+        events = self.client.events(since=cached['until'], until=until, filters={'type': 'node'}, decode=True)
+        changed = get_changed_ids(events)
+        known = {}
+        for node in self.nodes:
+            entry = cached['objects'].get(node.id)
+            if not isinstance(entry, dict) or node.id in changed or entry.get('version') != self._node_version(node):
+                continue
+            known[node.id] = entry['attrs']
+        self.display.vvv('docker_swarm: using the cached attributes for %d of %d nodes' % (len(known), len(self.nodes)))
+        return known
+
+    def _populate(self, cached=None):
+        # Returns the data for the inventory cache if the cache is enabled, otherwise None
         raw_params = dict(
             docker_host=self.get_option('docker_host'),
             tls=self.get_option('tls'),
@@ -209,10 +248,23 @@ class InventoryModule(BaseInventoryPlugin, Constructable):
             else:
                 host_uri_port = '2375'
 
+        cache_data = None
         try:
+            if self.get_option('cache'):
+                # Get the time before listing the nodes, so that changes while listing are also reported as events next time
+                info = self.client.info()
+                swarm_id = ((info.get('Swarm') or {}).get('Cluster') or {}).get('ID')
+                until = parse_daemon_time(info.get('SystemTime'))
+                cache_data = dict(version=CACHE_VERSION, daemon=swarm_id, until=until, objects=dict())
+                cached = get_cached_state(cached, swarm_id)
             self.nodes = self.client.nodes.list()
+            known = self._get_known_attrs(cached, until) if cache_data is not None else {}
             for node in self.nodes:
-                node_attrs = self.client.nodes.get(node.id).attrs
+                node_attrs = known.get(node.id)
+                if node_attrs is None:
+                    node_attrs = self.client.nodes.get(node.id).attrs
+                if cache_data is not None:
+                    cache_data['objects'][node.id] = dict(version=self._node_version(node), attrs=node_attrs)
                 unsafe_node_attrs = make_unsafe(node_attrs)
                 if not filter_host(self, unsafe_node_attrs['ID'], unsafe_node_attrs, filters):
                     continue
@@ -260,6 +312,7 @@ class InventoryModule(BaseInventoryPlugin, Constructable):
         except Exception as e:
             raise AnsibleError('Unable to fetch hosts from Docker swarm API, this was the original exception: %s' %
                                to_native(e))
+        return cache_data
 
     def verify_file(self, path):
         """Return the possibly of a file being consumable by this plugin."""
@@ -273,4 +326,15 @@ class InventoryModule(BaseInventoryPlugin, Constructable):
                                'https://github.com/docker/docker-py.')
         super(InventoryModule, self).parse(inventory, loader, path, cache)
         self._read_config_data(path)
-        self._populate()
+
+        cache_key = self.get_cache_key(path)
+        cached = None
+        if self.get_option('cache') and cache:
+            try:
+                cached = self._cache[cache_key]
+            except KeyError:
+                pass
+
+        cache_data = self._populate(cached)
+        if cache_data is not None:
+            self._cache[cache_key] = cache_data
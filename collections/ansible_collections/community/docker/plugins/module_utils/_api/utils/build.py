@@ -151,7 +151,7 @@ def mkbuildcontext(dockerfile):
 
 
 def split_path(p):
-    return [pt for pt in re.split(_SEP, p) if pt and pt != '.']
+    return [pt for pt in _SEP.split(p) if pt and pt != '.']
 
 
 def normalize_slashes(p):
@@ -165,6 +165,52 @@ def walk(root, patterns, default=True):
     return pm.walk(root)
 
 
+# Python 2's re module does not support more than 100 named groups per expression
+_MAX_GROUPS_PER_EXPRESSION = 90
+
+
+def _compile_patterns(patterns, indexes):
+    """
+    Compile the patterns with the given indexes into a list of expressions.
+
+    The patterns are tried from the highest to the lowest index, and the name
+    of the group that matched is ``p`` followed by the index of the pattern.
+    """
+    indexes = sorted(indexes, reverse=True)
+    result = []
+    for start in range(0, len(indexes), _MAX_GROUPS_PER_EXPRESSION):
+        result.append(re.compile('^(?:%s)' % '|'.join(
+            # Strip the ^ and $ added by translate()
+            '(?P<p%d>%s)$' % (index, fnmatch.translate(patterns[index].cleaned_pattern.lower())[1:-1])
+            for index in indexes[start:start + _MAX_GROUPS_PER_EXPRESSION]
+        )))
+    return result
+
+
+def _last_match(expressions, path):
+    for expression in expressions:
+        m = expression.match(path)
+        if m:
+            return int(m.lastgroup[1:])
+    return -1
+
+
+def _list_directory(directory):
+    """
+    Return the names of the entries of a directory, and for every entry whether
+    it is a directory (and not a symlink to one).
+    """
+    if hasattr(os, 'scandir'):
+        # scandir() knows the file types from listing the directory in most cases,
+        # which saves two stat() calls per entry
+        return [(entry.name, entry.is_dir(follow_symlinks=False)) for entry in os.scandir(directory)]
+    result = []
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        result.append((name, os.path.isdir(path) and not os.path.islink(path)))
+    return result
+
+
 # Heavily based on
 # https://github.com/moby/moby/blob/master/pkg/fileutils/fileutils.go
 class PatternMatcher(object):
@@ -174,39 +220,55 @@ class PatternMatcher(object):
         ))
         self.patterns.append(Pattern('!.dockerignore'))
 
-    def matches(self, filepath):
-        matched = False
-        parent_path = os.path.dirname(filepath)
+        # Instead of matching every pattern on its own, all patterns are matched
+        # at once against the path. A pattern with N components also matches
+        # if it matches the first N components of the path's parent directory,
+        # so the patterns are also matched at once per number of components.
+        self._path_expressions = _compile_patterns(self.patterns, range(len(self.patterns)))
+        indexes_by_length = {}
+        for index, pattern in enumerate(self.patterns):
+            indexes_by_length.setdefault(len(pattern.dirs), []).append(index)
+        self._parent_expressions = [
+            (length, _compile_patterns(self.patterns, indexes))
+            for length, indexes in sorted(indexes_by_length.items())
+        ]
+        self._parent_matches = {}
+        self._exclusions = [pattern.cleaned_pattern for pattern in self.patterns if pattern.exclusion]
+
+    def _match_parent(self, parent_path):
+        # All entries of a directory share the parent, so the result is remembered
+        try:
+            return self._parent_matches[parent_path]
+        except KeyError:
+            pass
+        last = -1
         parent_path_dirs = split_path(parent_path)
+        for length, expressions in self._parent_expressions:
+            if length > len(parent_path_dirs):
+                break
+            parent_prefix = normalize_slashes(os.path.sep.join(parent_path_dirs[:length])).lower()
+            last = max(last, _last_match(expressions, parent_prefix))
+        self._parent_matches[parent_path] = last
+        return last
 
-        for pattern in self.patterns:
-            negative = pattern.exclusion
-            match = pattern.match(filepath)
-            if not match and parent_path != '':
-                if len(pattern.dirs) <= len(parent_path_dirs):
-                    match = pattern.match(
-                        os.path.sep.join(parent_path_dirs[:len(pattern.dirs)])
-                    )
-
-            if match:
-                matched = not negative
+    def matches(self, filepath):
+        # The last pattern that matches decides whether the path is excluded
+        last = _last_match(self._path_expressions, normalize_slashes(filepath).lower())
+        parent_path = os.path.dirname(filepath)
+        if parent_path != '':
+            last = max(last, self._match_parent(parent_path))
 
-        return matched
+        return last >= 0 and not self.patterns[last].exclusion
 
     def walk(self, root):
-        def rec_walk(current_dir):
-            for f in os.listdir(current_dir):
-                fpath = os.path.join(
-                    os.path.relpath(current_dir, root), f
-                )
-                if fpath.startswith('.' + os.path.sep):
-                    fpath = fpath[2:]
+        def rec_walk(current_dir, current_path):
+            for f, is_dir in _list_directory(current_dir):
+                fpath = os.path.join(current_path, f) if current_path else f
                 match = self.matches(fpath)
                 if not match:
                     yield fpath
 
-                cur = os.path.join(root, fpath)
-                if not os.path.isdir(cur) or os.path.islink(cur):
+                if not is_dir:
                     continue
 
                 if match:
@@ -214,21 +276,13 @@ class PatternMatcher(object):
                     # then we should first check to see if there's an
                     # excludes pattern (e.g. !dir/file) that starts with this
                     # dir. If so then we cannot skip this dir.
-                    skip = True
-
-                    for pat in self.patterns:
-                        if not pat.exclusion:
-                            continue
-                        if pat.cleaned_pattern.startswith(
-                                normalize_slashes(fpath)):
-                            skip = False
-                            break
-                    if skip:
+                    normalized_fpath = normalize_slashes(fpath)
+                    if not any(pattern.startswith(normalized_fpath) for pattern in self._exclusions):
                         continue
-                for sub in rec_walk(cur):
+                for sub in rec_walk(os.path.join(root, fpath), fpath):
                     yield sub
 
-        return rec_walk(root)
+        return rec_walk(root, '')
 
 
 class Pattern(object):
@@ -10,10 +10,11 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
+import codecs
 import json
 import json.decoder
 
-from ansible.module_utils.six import text_type
+from ansible.module_utils.six import binary_type, text_type
 
 from ..errors import StreamParseError
 
@@ -48,11 +49,47 @@ def json_splitter(buffer):
 
 
 def json_stream(stream):
-    """Given a stream of text, return a stream of json objects.
+    """Given a stream of text or bytes, return a stream of json objects.
     This handles streams which are inconsistently buffered (some entries may
     be newline delimited, and others are not).
+
+    Objects are decoded in place at an offset into the buffered text, so the
+    time needed is linear in the length of the stream, also when a single
+    chunk contains many objects. Bytes are decoded as UTF-8 while reading,
+    characters which are split between chunks are kept intact.
     """
-    return split_buffer(stream, json_splitter, json_decoder.decode)
+    decoder = codecs.getincrementaldecoder('utf-8')('replace')
+    whitespace = json.decoder.WHITESPACE.match
+    buffered = text_type('')
+    index = 0
+
+    for data in stream:
+        if isinstance(data, binary_type):
+            data = decoder.decode(data)
+        if not data:
+            continue
+        # Only the start of an object which is not complete yet is carried over
+        buffered = buffered[index:] + data if index < len(buffered) else data
+        index = 0
+        while True:
+            index = whitespace(buffered, index).end()
+            if index == len(buffered):
+                break
+            try:
+                obj, index = json_decoder.raw_decode(buffered, index)
+            except ValueError:
+                break
+            yield obj
+
+    buffered = buffered[index:] + decoder.decode(b'', final=True)
+    index = whitespace(buffered, 0).end()
+    while index < len(buffered):
+        try:
+            obj, index = json_decoder.raw_decode(buffered, index)
+        except ValueError as e:
+            raise StreamParseError(e)
+        yield obj
+        index = whitespace(buffered, index).end()
 
 
 def line_splitter(buffer, separator=u'\n'):
@@ -25,6 +25,11 @@ except ImportError:
     class RequestException(Exception):
         pass
 
+from ansible_collections.community.docker.plugins.module_utils.image_transfer import (
+    ImageTransferError,
+    stream_pull,
+)
+
 from ansible_collections.community.docker.plugins.module_utils._api import auth
 from ansible_collections.community.docker.plugins.module_utils._api.api.client import APIClient as Client
 from ansible_collections.community.docker.plugins.module_utils._api.errors import (
@@ -430,33 +435,9 @@ class AnsibleDockerClientBase(Client):
         try:
             repository, image_tag = parse_repository_tag(name)
             registry, repo_name = auth.resolve_repository_name(repository)
-            params = {
-                'tag': tag or image_tag or 'latest',
-                'fromImage': repository,
-            }
-            if platform is not None:
-                params['platform'] = platform
-
-            headers = {}
-            header = auth.get_config_header(self, registry)
-            if header:
-                headers['X-Registry-Auth'] = header
-
-            response = self._post(
-                self._url('/images/create'), params=params, headers=headers,
-                stream=True, timeout=None
-            )
-            self._raise_for_status(response)
-            for line in self._stream_helper(response, decode=True):
-                self.log(line, pretty_print=True)
-                if line.get('error'):
-                    if line.get('errorDetail'):
-                        error_detail = line.get('errorDetail')
-                        self.fail("Error pulling %s - code: %s message: %s" % (name,
-                                                                               error_detail.get('code'),
-                                                                               error_detail.get('message')))
-                    else:
-                        self.fail("Error pulling %s - %s" % (name, line.get('error')))
+            stream_pull(self, name, tag=tag, platform=platform, auth_header=auth.get_config_header(self, registry))
+        except ImageTransferError as exc:
+            self.fail("Error pulling %s - %s" % (name, exc))
         except Exception as exc:
             self.fail("Error pulling image %s:%s - %s" % (name, tag, str(exc)))
 
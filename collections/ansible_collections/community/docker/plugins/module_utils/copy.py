@@ -70,7 +70,7 @@ def _symlink_tar_generator(b_in_path, file_stat, out_file, user_id, group_id, mo
     yield _symlink_tar_creator(b_in_path, file_stat, out_file, user_id, group_id, mode, user_name)
 
 
-def _regular_file_tar_generator(b_in_path, file_stat, out_file, user_id, group_id, mode=None, user_name=None):
+def _regular_file_tar_member(b_in_path, file_stat, out_file, user_id, group_id, mode=None, user_name=None):
     if not stat.S_ISREG(file_stat.st_mode):
         raise DockerUnexpectedError('stat information is not for a regular file')
     tarinfo = tarfile.TarInfo()
@@ -85,12 +85,9 @@ def _regular_file_tar_generator(b_in_path, file_stat, out_file, user_id, group_i
     if user_name:
         tarinfo.uname = user_name
 
-    tarinfo_buf = tarinfo.tobuf()
-    total_size = len(tarinfo_buf)
-    yield tarinfo_buf
+    yield tarinfo.tobuf()
 
     size = tarinfo.size
-    total_size += size
     with open(b_in_path, 'rb') as f:
         while size > 0:
             to_read = min(size, 65536)
@@ -108,7 +105,46 @@ def _regular_file_tar_generator(b_in_path, file_stat, out_file, user_id, group_i
     if remainder:
         # We need to write a multiple of 512 bytes. Fill up with zeros.
         yield tarfile.NUL * (tarfile.BLOCKSIZE - remainder)
-        total_size += tarfile.BLOCKSIZE - remainder
+
+
+def _symlink_tar_member(b_in_path, file_stat, out_file, user_id, group_id, mode=None, user_name=None):
+    if not stat.S_ISLNK(file_stat.st_mode):
+        raise DockerUnexpectedError('stat information is not for a symlink')
+    tarinfo = tarfile.TarInfo()
+    tarinfo.name = out_file
+    tarinfo.mode = (file_stat.st_mode & 0o700) if mode is None else mode
+    tarinfo.uid = user_id
+    tarinfo.gid = group_id
+    tarinfo.mtime = file_stat.st_mtime
+    tarinfo.type = tarfile.SYMTYPE
+    tarinfo.linkname = to_text(os.readlink(b_in_path), errors='surrogate_or_strict')
+    if user_name:
+        tarinfo.uname = user_name
+    yield tarinfo.tobuf()
+
+
+def _directory_tar_member(file_stat, out_file, user_id, group_id, mode=None, user_name=None):
+    if not stat.S_ISDIR(file_stat.st_mode):
+        raise DockerUnexpectedError('stat information is not for a directory')
+    tarinfo = tarfile.TarInfo()
+    tarinfo.name = out_file
+    tarinfo.mode = stat.S_IMODE(file_stat.st_mode) if mode is None else mode
+    tarinfo.uid = user_id
+    tarinfo.gid = group_id
+    tarinfo.mtime = file_stat.st_mtime
+    tarinfo.type = tarfile.DIRTYPE
+    if user_name:
+        tarinfo.uname = user_name
+    yield tarinfo.tobuf()
+
+
+def _tar_stream(members):
+    """Join the blocks of the given tar members to a complete tar stream."""
+    total_size = 0
+    for member in members:
+        for buf in member:
+            total_size += len(buf)
+            yield buf
 
     # End with two zeroed blocks
     yield tarfile.NUL * (2 * tarfile.BLOCKSIZE)
@@ -119,6 +155,10 @@ def _regular_file_tar_generator(b_in_path, file_stat, out_file, user_id, group_i
         yield tarfile.NUL * (tarfile.RECORDSIZE - remainder)
 
 
+def _regular_file_tar_generator(b_in_path, file_stat, out_file, user_id, group_id, mode=None, user_name=None):
+    return _tar_stream([_regular_file_tar_member(b_in_path, file_stat, out_file, user_id, group_id, mode=mode, user_name=user_name)])
+
+
 def _regular_content_tar_generator(content, out_file, user_id, group_id, mode, user_name=None):
     tarinfo = tarfile.TarInfo()
     tarinfo.name = os.path.splitdrive(to_text(out_file))[1].replace(os.sep, '/').lstrip('/')
@@ -188,6 +228,64 @@ def put_file(client, container, in_path, out_path, user_id, group_id, mode=None,
         raise DockerUnexpectedError('Unknown error while creating file "{0}" in container "{1}".'.format(out_path, container))
 
 
+def walk_directory(in_path, follow_links=False):
+    """List a local directory and everything below it.
+
+    Return a list of tuples ``(b_path, relative_path, file_stat)``, where ``relative_path`` uses ``/``
+    as separator and is empty for ``in_path`` itself. Directories come before their content.
+    """
+    b_root = to_bytes(in_path, errors='surrogate_or_strict')
+    result = [(b_root, u'', os.stat(b_root))]
+    for b_dir, b_dirnames, b_filenames in os.walk(b_root, followlinks=follow_links):
+        b_dirnames.sort()
+        b_rel_dir = os.path.relpath(b_dir, b_root)
+        for b_name in sorted(b_dirnames + b_filenames):
+            b_path = os.path.join(b_dir, b_name)
+            file_stat = os.lstat(b_path)
+            if follow_links and stat.S_ISLNK(file_stat.st_mode):
+                try:
+                    file_stat = os.stat(b_path)
+                except OSError:
+                    # Broken links are copied as links
+                    pass
+            if not (stat.S_ISDIR(file_stat.st_mode) or stat.S_ISREG(file_stat.st_mode) or stat.S_ISLNK(file_stat.st_mode)):
+                raise DockerFileCopyError(
+                    'File {0} is neither a directory, a regular file, nor a symlink (stat mode {1}).'.format(
+                        to_native(b_path), oct(file_stat.st_mode)))
+            b_rel_path = b_name if b_rel_dir == b'.' else os.path.join(b_rel_dir, b_name)
+            result.append((b_path, to_text(b_rel_path, errors='surrogate_or_strict').replace(os.sep, '/'), file_stat))
+    return result
+
+
+def put_files(client, container, entries, out_path, user_id, group_id, mode=None, user_name=None):
+    """Transfer many files, symlinks, and directories from local to Docker container as a single archive.
+
+    ``entries`` is a list of tuples ``(b_path, relative_path, file_stat)`` as returned by ``walk_directory()``.
+    They are created below ``out_path``, an empty ``relative_path`` is ``out_path`` itself. The parent
+    directory of ``out_path`` must exist. ``mode`` is used for regular files. If it is not provided,
+    the modes of the local files are used.
+    """
+    out_dir, out_name = os.path.split(out_path.rstrip('/') or '/')
+
+    def members():
+        for b_path, relative_path, file_stat in entries:
+            arcname = u'/'.join(part for part in (to_text(out_name), relative_path) if part)
+            if not arcname:
+                # out_path is the root directory, which cannot be created
+                continue
+            if stat.S_ISDIR(file_stat.st_mode):
+                yield _directory_tar_member(file_stat, arcname, user_id, group_id, user_name=user_name)
+            elif stat.S_ISLNK(file_stat.st_mode):
+                yield _symlink_tar_member(b_path, file_stat, arcname, user_id, group_id, mode=stat.S_IMODE(file_stat.st_mode), user_name=user_name)
+            else:
+                file_mode = stat.S_IMODE(file_stat.st_mode) if mode is None else mode
+                yield _regular_file_tar_member(b_path, file_stat, arcname, user_id, group_id, mode=file_mode, user_name=user_name)
+
+    ok = _put_archive(client, container, out_dir or '/', _tar_stream(members()))
+    if not ok:
+        raise DockerUnexpectedError('Unknown error while creating files in "{0}" in container "{1}".'.format(out_path, container))
+
+
 def put_file_content(client, container, content, out_path, user_id, group_id, mode, user_name=None):
     """Transfer a file from local to Docker container."""
     out_dir, out_file = os.path.split(out_path)
@@ -333,6 +431,27 @@ def fetch_file_ex(client, container, in_path, process_none, process_regular, pro
             raise DockerUnexpectedError('Received tarfile is empty!')
 
 
+def fetch_archive_ex(client, container, in_path, process_tar, log=None):
+    """Fetch a filesystem object and everything below it (as a tar file) from a Docker container.
+
+    Return the result of ``process_tar(tar)``, which is called with the streamed tar file,
+    or ``None`` if ``in_path`` does not exist. Symbolic links are not followed.
+    """
+    if log:
+        log('FETCH: Fetching "%s"' % in_path)
+    try:
+        stream = client.get_raw_stream(
+            '/containers/{0}/archive', container,
+            params={'path': in_path},
+            headers={'Accept-Encoding': 'identity'},
+        )
+    except NotFound:
+        return None
+
+    with tarfile.open(fileobj=_stream_generator_to_fileobj(stream), mode='r|') as tar:
+        return process_tar(tar)
+
+
 def fetch_file(client, container, in_path, out_path, follow_links=False, log=None):
     b_out_path = to_bytes(out_path, errors='surrogate_or_strict')
 
@@ -440,3 +559,32 @@ def determine_user_group(client, container, log=None):
             'Expected two-line output with numeric IDs to obtain user and group ID for container {container}, but got "{l1}" and "{l2}" instead'
             .format(container=container, l1=user_id, l2=group_id)
         )
+
+
+def _parse_file_digest(stdout):
+    lines = stdout.splitlines()
+    if len(lines) != 2:
+        return None
+    owner = lines[0].split()
+    digest = lines[1].split(None, 1)[0] if lines[1].strip() else b''
+    if len(owner) != 2 or len(digest) != 64:
+        return None
+    try:
+        int(digest, 16)
+        return int(owner[0]), int(owner[1]), to_native(digest).lower()
+    except ValueError:
+        return None
+
+
+def get_file_digest(client, container, in_path, log=None):
+    '''
+    Determine the owner, group, and SHA-256 digest of a regular file in the container without transferring it.
+
+    Returns a tuple ``(user_id, group_id, hexdigest)``, or ``None`` if the container has no C(/bin/sh), C(stat),
+    or C(sha256sum) that can be used for this.
+    '''
+    rc, stdout, stderr = _execute_command(
+        client, container, ['/bin/sh', '-c', 'stat -c "%u %g" "$1" && sha256sum "$1"', 'sh', in_path], log=log)
+    if rc != 0:
+        return None
+    return _parse_file_digest(stdout)
@@ -5,6 +5,7 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
+import hashlib
 import json
 import os
 import tarfile
@@ -12,6 +13,10 @@ import tarfile
 from ansible.module_utils.common.text.converters import to_native
 
 
+# Increase when the layout of the manifest index file changes, index files with another version are ignored
+MANIFEST_INDEX_VERSION = 1
+
+
 class ImageArchiveManifestSummary(object):
     '''
     Represents data extracted from a manifest.json found in the tar archive output of the
@@ -60,7 +65,125 @@ def api_image_id(archive_image_id):
     return 'sha256:%s' % archive_image_id
 
 
-def load_archived_image_manifest(archive_path):
+def manifest_index_path(archive_path):
+    '''
+    Return the path of the file that caches where manifest.json is stored in the archive at archive_path.
+    '''
+
+    return '%s.manifest-index.json' % archive_path
+
+
+def _get_archive_key(archive_path):
+    stat = os.stat(archive_path)
+    return {
+        'path': os.path.abspath(archive_path),
+        'size': stat.st_size,
+        # st_mtime_ns does not exist in Python 2
+        'mtime': getattr(stat, 'st_mtime_ns', None) or repr(stat.st_mtime),
+    }
+
+
+def _read_range(archive_path, offset, size):
+    with open(archive_path, 'rb') as f:
+        f.seek(offset)
+        return f.read(size)
+
+
+def _read_indexed_manifest(archive_path, key):
+    '''
+    Read manifest.json at the position recorded in the index file, if that is still valid for the archive.
+
+    Returns None if there is no usable index.
+    '''
+
+    try:
+        with open(manifest_index_path(archive_path), 'rb') as f:
+            index = json.loads(f.read().decode('utf-8'))
+        if not isinstance(index, dict) or index.get('version') != MANIFEST_INDEX_VERSION or index.get('archive') != key:
+            return None
+        offset = index['manifest']['offset']
+        size = index['manifest']['size']
+        digest = index['manifest']['sha256']
+        data = _read_range(archive_path, offset, size)
+    except Exception:
+        return None
+    if len(data) != size or hashlib.sha256(data).hexdigest() != digest:
+        return None
+    return data
+
+
+def _write_manifest_index(archive_path, key, offset, data):
+    index = {
+        'version': MANIFEST_INDEX_VERSION,
+        'archive': key,
+        'manifest': {
+            'offset': offset,
+            'size': len(data),
+            'sha256': hashlib.sha256(data).hexdigest(),
+        },
+    }
+    index_path = manifest_index_path(archive_path)
+    tmp_path = '%s.%d.tmp' % (index_path, os.getpid())
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(json.dumps(index).encode('utf-8'))
+        os.rename(tmp_path, index_path)
+    except (IOError, OSError):
+        # The index is only an optimization, for example the directory might not be writable
+        try:
+            os.unlink(tmp_path)
+        except (IOError, OSError):
+            pass
+
+
+def _read_archived_manifest(archive_path):
+    '''
+    Find manifest.json in the tar file and return its contents and the offset of the contents in the file.
+
+    The offset is None if the contents cannot be read directly from the file, for example since the
+    archive is compressed.
+    '''
+
+    try:
+        tf = tarfile.open(archive_path, 'r')
+    except Exception as exc:
+        raise ImageArchiveInvalidException("Failed to open tar file %s: %s" % (archive_path, to_native(exc)), exc)
+
+    try:
+        try:
+            # Only read member headers until manifest.json is found, instead of indexing the whole archive
+            for member in tf:
+                if member.name == 'manifest.json':
+                    break
+            else:
+                raise KeyError("filename 'manifest.json' not found")
+            ef = tf.extractfile(member)
+            if ef is None:
+                raise KeyError("manifest.json is not a regular file")
+            try:
+                data = ef.read()
+            finally:
+                # In Python 2.6, this does not have __exit__
+                ef.close()
+        except Exception as exc:
+            raise ImageArchiveInvalidException(
+                "Failed to extract manifest.json from tar file %s: %s" % (archive_path, to_native(exc)),
+                exc
+            )
+        offset = member.offset_data
+    finally:
+        # In Python 2.6, TarFile does not have __exit__
+        tf.close()
+
+    try:
+        if _read_range(archive_path, offset, len(data)) != data:
+            offset = None
+    except (IOError, OSError):
+        offset = None
+    return data, offset
+
+
+def load_archived_image_manifest(archive_path, use_index=False, write_index=True):
     '''
     Attempts to get image IDs and image names from metadata stored in the image
     archive tar file.
@@ -69,102 +192,98 @@ def load_archived_image_manifest(archive_path):
     and every entry should have a Config field with the image ID in its file name, as
     well as a RepoTags list, which typically has only one entry.
 
+    If use_index is true, the position of manifest.json in the archive is stored in a file next
+    to the archive (see manifest_index_path()). As long as the archive's size and modification time
+    do not change, later calls read manifest.json directly from that position instead of searching
+    the archive for it. If write_index is false, for example in check mode, an existing index is
+    used, but the index file is never created or updated.
+
     :raises:
         ImageArchiveInvalidException: A file already exists at archive_path, but could not extract an image ID from it.
 
     :param archive_path: Tar file to read
     :type archive_path: str
+    :param use_index: Whether to use and update the manifest index file
+    :type use_index: bool
+    :param write_index: Whether the manifest index file may be created or updated if use_index is true
+    :type write_index: bool
 
     :return: None, if no file at archive_path, or a list of ImageArchiveManifestSummary objects.
     :rtype: ImageArchiveManifestSummary
     '''
 
-    try:
-        # FileNotFoundError does not exist in Python 2
-        if not os.path.isfile(archive_path):
-            return None
+    # FileNotFoundError does not exist in Python 2
+    if not os.path.isfile(archive_path):
+        return None
 
-        tf = tarfile.open(archive_path, 'r')
+    data = None
+    if use_index:
         try:
-            try:
-                ef = tf.extractfile('manifest.json')
-                try:
-                    text = ef.read().decode('utf-8')
-                    manifest = json.loads(text)
-                except Exception as exc:
-                    raise ImageArchiveInvalidException(
-                        "Failed to decode and deserialize manifest.json: %s" % to_native(exc),
-                        exc
-                    )
-                finally:
-                    # In Python 2.6, this does not have __exit__
-                    ef.close()
-
-                if len(manifest) == 0:
-                    raise ImageArchiveInvalidException(
-                        "Expected to have at least one entry in manifest.json but found none",
-                        None
-                    )
-
-                result = []
-                for index, meta in enumerate(manifest):
-                    try:
-                        config_file = meta['Config']
-                    except KeyError as exc:
-                        raise ImageArchiveInvalidException(
-                            "Failed to get Config entry from {0}th manifest in manifest.json: {1}".format(index + 1, to_native(exc)),
-                            exc
-                        )
-
-                    # Extracts hash without 'sha256:' prefix
-                    try:
-                        # Strip off .json filename extension, leaving just the hash.
-                        image_id = os.path.splitext(config_file)[0]
-                    except Exception as exc:
-                        raise ImageArchiveInvalidException(
-                            "Failed to extract image id from config file name %s: %s" % (config_file, to_native(exc)),
-                            exc
-                        )
-
-                    for prefix in (
-                        'blobs/sha256/',  # Moby 25.0.0, Docker API 1.44
-                    ):
-                        if image_id.startswith(prefix):
-                            image_id = image_id[len(prefix):]
-
-                    try:
-                        repo_tags = meta['RepoTags']
-                    except KeyError as exc:
-                        raise ImageArchiveInvalidException(
-                            "Failed to get RepoTags entry from {0}th manifest in manifest.json: {1}".format(index + 1, to_native(exc)),
-                            exc
-                        )
-
-                    result.append(ImageArchiveManifestSummary(
-                        image_id=image_id,
-                        repo_tags=repo_tags
-                    ))
-                return result
-
-            except ImageArchiveInvalidException:
-                raise
-            except Exception as exc:
-                raise ImageArchiveInvalidException(
-                    "Failed to extract manifest.json from tar file %s: %s" % (archive_path, to_native(exc)),
-                    exc
-                )
-
-        finally:
-            # In Python 2.6, TarFile does not have __exit__
-            tf.close()
-
-    except ImageArchiveInvalidException:
-        raise
+            key = _get_archive_key(archive_path)
+        except Exception as exc:
+            raise ImageArchiveInvalidException("Failed to open tar file %s: %s" % (archive_path, to_native(exc)), exc)
+        data = _read_indexed_manifest(archive_path, key)
+    if data is None:
+        data, offset = _read_archived_manifest(archive_path)
+        if use_index and write_index and offset is not None:
+            _write_manifest_index(archive_path, key, offset, data)
+
+    try:
+        manifest = json.loads(data.decode('utf-8'))
     except Exception as exc:
-        raise ImageArchiveInvalidException("Failed to open tar file %s: %s" % (archive_path, to_native(exc)), exc)
+        raise ImageArchiveInvalidException(
+            "Failed to decode and deserialize manifest.json: %s" % to_native(exc),
+            exc
+        )
+
+    if len(manifest) == 0:
+        raise ImageArchiveInvalidException(
+            "Expected to have at least one entry in manifest.json but found none",
+            None
+        )
+
+    result = []
+    for index, meta in enumerate(manifest):
+        try:
+            config_file = meta['Config']
+        except KeyError as exc:
+            raise ImageArchiveInvalidException(
+                "Failed to get Config entry from {0}th manifest in manifest.json: {1}".format(index + 1, to_native(exc)),
+                exc
+            )
+
+        # Extracts hash without 'sha256:' prefix
+        try:
+            # Strip off .json filename extension, leaving just the hash.
+            image_id = os.path.splitext(config_file)[0]
+        except Exception as exc:
+            raise ImageArchiveInvalidException(
+                "Failed to extract image id from config file name %s: %s" % (config_file, to_native(exc)),
+                exc
+            )
+
+        for prefix in (
+            'blobs/sha256/',  # Moby 25.0.0, Docker API 1.44
+        ):
+            if image_id.startswith(prefix):
+                image_id = image_id[len(prefix):]
+
+        try:
+            repo_tags = meta['RepoTags']
+        except KeyError as exc:
+            raise ImageArchiveInvalidException(
+                "Failed to get RepoTags entry from {0}th manifest in manifest.json: {1}".format(index + 1, to_native(exc)),
+                exc
+            )
+
+        result.append(ImageArchiveManifestSummary(
+            image_id=image_id,
+            repo_tags=repo_tags
+        ))
+    return result
 
 
-def archived_image_manifest(archive_path):
+def archived_image_manifest(archive_path, use_index=False, write_index=True):
     '''
     Attempts to get Image.Id and image name from metadata stored in the image
     archive tar file.
@@ -178,12 +297,16 @@ def archived_image_manifest(archive_path):
 
     :param archive_path: Tar file to read
     :type archive_path: str
+    :param use_index: Whether to use and update the manifest index file, see load_archived_image_manifest()
+    :type use_index: bool
+    :param write_index: Whether the manifest index file may be created or updated if use_index is true
+    :type write_index: bool
 
     :return: None, if no file at archive_path, or the extracted image ID, which will not have a sha256: prefix.
     :rtype: ImageArchiveManifestSummary
     '''
 
-    results = load_archived_image_manifest(archive_path)
+    results = load_archived_image_manifest(archive_path, use_index=use_index, write_index=write_index)
     if results is None:
         return None
     if len(results) == 1:
@@ -0,0 +1,199 @@
+# Copyright (c) 2025, Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+import threading
+import time
+
+from ansible.module_utils.six.moves import queue
+
+from ansible_collections.community.docker.plugins.module_utils._api.utils.utils import (
+    parse_repository_tag,
+)
+
+
+# Progress statuses of a layer that is being downloaded or uploaded
+_TRANSFER_STATUSES = ('Downloading', 'Pushing')
+# Progress statuses of a layer whose transfer is complete
+_DONE_STATUSES = ('Download complete', 'Verifying Checksum', 'Extracting', 'Pull complete', 'Pushed')
+# Progress statuses of a layer that did not need to be transferred
+_EXISTING_STATUSES = ('Already exists', 'Layer already exists')
+# Other progress statuses that refer to a layer
+_LAYER_STATUSES = ('Pulling fs layer', 'Waiting', 'Preparing', 'Retrying')
+
+
+class ImageTransferError(Exception):
+    pass
+
+
+class ImageTransferProgress(object):
+    '''
+    Collects the progress events of a pull or a push of one image, per layer.
+    '''
+
+    def __init__(self):
+        self.layers = {}
+        self.start = time.time()
+        self.end = None
+
+    def _get_layer(self, layer_id):
+        if layer_id not in self.layers:
+            self.layers[layer_id] = {'state': 'pending', 'bytes': 0, 'total': None}
+        return self.layers[layer_id]
+
+    def add_event(self, event):
+        status = event.get('status') or ''
+        layer_id = event.get('id')
+        if not layer_id:
+            return
+        if status in _TRANSFER_STATUSES:
+            layer = self._get_layer(layer_id)
+            detail = event.get('progressDetail') or {}
+            layer['state'] = 'transferred'
+            layer['bytes'] = max(layer['bytes'], detail.get('current') or 0)
+            if detail.get('total'):
+                layer['total'] = detail['total']
+        elif status in _DONE_STATUSES:
+            layer = self._get_layer(layer_id)
+            if layer['state'] != 'existing':
+                layer['state'] = 'transferred'
+                if layer['total'] and status != 'Extracting':
+                    layer['bytes'] = max(layer['bytes'], layer['total'])
+        elif status in _EXISTING_STATUSES or status.startswith('Mounted from '):
+            self._get_layer(layer_id)['state'] = 'existing'
+        elif status in _LAYER_STATUSES:
+            self._get_layer(layer_id)
+
+    def finish(self):
+        self.end = time.time()
+
+    @property
+    def transferred(self):
+        return any(layer['state'] == 'transferred' for layer in self.layers.values())
+
+    def get_summary(self):
+        return {
+            'duration': round((self.end or time.time()) - self.start, 3),
+            'layers': len(self.layers),
+            'layers_transferred': len([layer for layer in self.layers.values() if layer['state'] == 'transferred']),
+            'layers_existing': len([layer for layer in self.layers.values() if layer['state'] == 'existing']),
+            'bytes': sum(layer['bytes'] for layer in self.layers.values()),
+        }
+
+
+def get_transferred_bytes(progresses):
+    '''
+    Return the number of bytes transferred for all given progresses.
+
+    Layers that are shared by several images are only transferred once by the daemon, even if every pull
+    reports progress for them, so they are only counted once.
+    '''
+    layers = {}
+    for progress in progresses:
+        for layer_id, layer in progress.layers.items():
+            layers[layer_id] = max(layers.get(layer_id, 0), layer['bytes'])
+    return sum(layers.values())
+
+
+def _raise_for_pull_error(event):
+    if event.get('error'):
+        error_detail = event.get('errorDetail')
+        if error_detail:
+            raise ImageTransferError('code: %s message: %s' % (error_detail.get('code'), error_detail.get('message')))
+        raise ImageTransferError(event['error'])
+
+
+def stream_pull(client, name, tag='latest', platform=None, auth_header=None, progress=None):
+    '''
+    Pull an image and wait for the pull to finish.
+
+    Errors reported by the daemon are raised as ``ImageTransferError``. Unlike the client's
+    ``pull_image()``, this never calls ``client.fail()``, so it can be used from other threads.
+    '''
+    repository, image_tag = parse_repository_tag(name)
+    params = {
+        'tag': tag or image_tag or 'latest',
+        'fromImage': repository,
+    }
+    if platform is not None:
+        params['platform'] = platform
+
+    headers = {}
+    if auth_header:
+        headers['X-Registry-Auth'] = auth_header
+
+    response = client._post(
+        client._url('/images/create'), params=params, headers=headers,
+        stream=True, timeout=None
+    )
+    client._raise_for_status(response)
+    for line in client._stream_helper(response, decode=True):
+        client.log(line, pretty_print=True)
+        _raise_for_pull_error(line)
+        if progress is not None:
+            progress.add_event(line)
+    if progress is not None:
+        progress.finish()
+
+
+def stream_push(client, name, tag, auth_header=None, progress=None):
+    '''
+    Push an image and wait for the push to finish.
+
+    Errors reported by the daemon are raised as ``ImageTransferError``. This never calls
+    ``client.fail()``, so it can be used from other threads.
+    '''
+    headers = {}
+    if auth_header:
+        headers['X-Registry-Auth'] = auth_header
+    response = client._post_json(
+        client._url("/images/{0}/push", name),
+        data=None,
+        headers=headers,
+        stream=True,
+        params={'tag': tag},
+    )
+    client._raise_for_status(response)
+    for line in client._stream_helper(response, decode=True):
+        client.log(line, pretty_print=True)
+        if line.get('errorDetail'):
+            raise ImageTransferError(line['errorDetail']['message'])
+        if progress is not None:
+            progress.add_event(line)
+    if progress is not None:
+        progress.finish()
+
+
+def run_in_parallel(function, items, parallelism):
+    '''
+    Call ``function`` for every item, with at most ``parallelism`` calls running at the same time.
+
+    Returns a list with a ``(result, exception)`` tuple for every item, in the order of ``items``.
+    '''
+    results = [None] * len(items)
+    work = queue.Queue()
+    for index, item in enumerate(items):
+        work.put((index, item))
+
+    def worker():
+        while True:
+            try:
+                index, item = work.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                results[index] = (function(item), None)
+            except Exception as exc:
+                results[index] = (None, exc)
+
+    threads = [threading.Thread(target=worker) for dummy in range(max(1, min(parallelism, len(items))))]
+    for thread in threads:
+        thread.daemon = True
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
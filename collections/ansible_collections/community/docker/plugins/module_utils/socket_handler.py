@@ -24,6 +24,11 @@ from ansible_collections.community.docker.plugins.module_utils.socket_helper imp
 
 PARAMIKO_POLL_TIMEOUT = 0.01  # 10 milliseconds
 
+READ_BUFFER_SIZE = 262144
+
+# Type (one byte), three unused bytes, and the length of the payload
+FRAME_HEADER = struct.Struct('>BxxxL')
+
 
 class DockerSocketHandlerBase(object):
     def __init__(self, sock, selectors, log=None):
@@ -40,13 +45,17 @@ class DockerSocketHandlerBase(object):
         self._block_done_callback = None
         self._block_buffer = []
         self._eof = False
-        self._read_buffer = b''
-        self._write_buffer = b''
+        # Data is received into this buffer, which is reused for every read
+        self._read_buffer = bytearray(READ_BUFFER_SIZE)
+        self._write_buffer = bytearray()
         self._end_of_writing = False
 
+        # A frame header which was split between two reads
+        self._current_header = bytearray()
         self._current_stream = None
         self._current_missing = 0
-        self._current_buffer = b''
+        # A payload which was split between two or more reads
+        self._current_buffer = bytearray()
 
         self._selector = self._selectors.DefaultSelector()
         self._selector.register(self._sock, self._selectors.EVENT_READ)
@@ -61,7 +70,7 @@ class DockerSocketHandlerBase(object):
         self._block_done_callback = block_done_callback
         if self._block_done_callback is not None:
             while self._block_buffer:
-                elt = self._block_buffer.remove(0)
+                elt = self._block_buffer.pop(0)
                 self._block_done_callback(*elt)
 
     def _add_block(self, stream_id, data):
@@ -70,47 +79,74 @@ class DockerSocketHandlerBase(object):
         else:
             self._block_buffer.append((stream_id, data))
 
-    def _read(self):
-        if self._eof:
-            return
+    def _receive(self):
+        # Returns a buffer and the number of bytes received into it, or None if no data is available
+        if hasattr(self._sock, 'recv_into'):
+            return self._read_buffer, self._sock.recv_into(self._read_buffer)
         if hasattr(self._sock, 'recv'):
-            try:
-                data = self._sock.recv(262144)
-            except Exception as e:
-                # After calling self._sock.shutdown(), OpenSSL's/urllib3's
-                # WrappedSocket seems to eventually raise ZeroReturnError in
-                # case of EOF
-                if 'OpenSSL.SSL.ZeroReturnError' in str(type(e)):
-                    self._eof = True
-                    return
-                else:
-                    raise
+            data = self._sock.recv(READ_BUFFER_SIZE)
         elif not PY2 and isinstance(self._sock, getattr(pysocket, 'SocketIO')):
-            data = self._sock.read()
+            return self._read_buffer, self._sock.readinto(self._read_buffer)
         else:
-            data = os.read(self._sock.fileno())
+            data = os.read(self._sock.fileno(), READ_BUFFER_SIZE)
         if data is None:
+            return None
+        return data, len(data)
+
+    def _read(self):
+        if self._eof:
+            return
+        try:
+            received = self._receive()
+        except Exception as e:
+            # After calling self._sock.shutdown(), OpenSSL's/urllib3's
+            # WrappedSocket seems to eventually raise ZeroReturnError in
+            # case of EOF
+            if 'OpenSSL.SSL.ZeroReturnError' in str(type(e)):
+                self._eof = True
+                return
+            else:
+                raise
+        if received is None or received[1] is None:
             # no data available
             return
-        self._log('read {0} bytes'.format(len(data)))
-        if len(data) == 0:
+        buffer, size = received
+        self._log('read {0} bytes'.format(size))
+        if size == 0:
             # Stream EOF
             self._eof = True
             return
-        self._read_buffer += data
-        while len(self._read_buffer) > 0:
+        self._demux(buffer, size)
+
+    def _demux(self, buffer, size):
+        # Splits the first size bytes of buffer into frames. Headers are parsed in place, and the payload of a
+        # frame that was received in one piece is copied exactly once, into the block that is passed on.
+        view = memoryview(buffer)
+        offset = 0
+        while offset < size:
             if self._current_missing > 0:
-                n = min(len(self._read_buffer), self._current_missing)
-                self._current_buffer += self._read_buffer[:n]
-                self._read_buffer = self._read_buffer[n:]
+                n = min(size - offset, self._current_missing)
                 self._current_missing -= n
-                if self._current_missing == 0:
-                    self._add_block(self._current_stream, self._current_buffer)
-                    self._current_buffer = b''
-            if len(self._read_buffer) < 8:
-                break
-            self._current_stream, self._current_missing = struct.unpack('>BxxxL', self._read_buffer[:8])
-            self._read_buffer = self._read_buffer[8:]
+                if self._current_missing == 0 and not self._current_buffer:
+                    self._add_block(self._current_stream, view[offset:offset + n].tobytes())
+                else:
+                    self._current_buffer += view[offset:offset + n]
+                    if self._current_missing == 0:
+                        self._add_block(self._current_stream, bytes(self._current_buffer))
+                        self._current_buffer = bytearray()
+                offset += n
+                continue
+            if self._current_header or size - offset < FRAME_HEADER.size:
+                n = min(size - offset, FRAME_HEADER.size - len(self._current_header))
+                self._current_header += view[offset:offset + n]
+                offset += n
+                if len(self._current_header) < FRAME_HEADER.size:
+                    break
+                self._current_stream, self._current_missing = FRAME_HEADER.unpack(bytes(self._current_header))
+                self._current_header = bytearray()
+            else:
+                self._current_stream, self._current_missing = FRAME_HEADER.unpack_from(buffer, offset)
+                offset += FRAME_HEADER.size
             if self._current_missing < 0:
                 # Stream EOF (as reported by docker daemon)
                 self._eof = True
@@ -124,8 +160,9 @@ class DockerSocketHandlerBase(object):
 
     def _write(self):
         if len(self._write_buffer) > 0:
-            written = write_to_socket(self._sock, self._write_buffer)
-            self._write_buffer = self._write_buffer[written:]
+            # Only pass as much as a single send can take, so that a large buffer is not copied for every send
+            written = write_to_socket(self._sock, bytes(self._write_buffer[:READ_BUFFER_SIZE]))
+            del self._write_buffer[:written]
             self._log('wrote {0} bytes, {1} are left'.format(written, len(self._write_buffer)))
             if len(self._write_buffer) > 0:
                 self._selector.modify(self._sock, self._selectors.EVENT_READ | self._selectors.EVENT_WRITE)
@@ -11,12 +11,12 @@ __metaclass__ = type
 DOCUMENTATION = r"""
 module: docker_container_copy_into
 
-short_description: Copy a file into a Docker container
+short_description: Copy a file or a directory into a Docker container
 
 version_added: 3.4.0
 
 description:
-  - Copy a file into a Docker container.
+  - Copy a file or a directory into a Docker container.
   - Similar to C(docker cp).
   - To copy files in a non-running container, you must provide the O(owner_id) and O(group_id) options. This is also necessary
     if the container does not contain a C(/bin/sh) shell with an C(id) tool.
@@ -29,6 +29,8 @@ attributes:
       - Additional data will need to be transferred to compute diffs.
       - The module uses R(the MAX_FILE_SIZE_FOR_DIFF ansible-core configuration,MAX_FILE_SIZE_FOR_DIFF) to determine for how
         large files diffs should be computed.
+      - No diff is computed when O(path) is a directory. The RV(changed_paths) return value lists the paths that are written
+        instead.
   idempotent:
     support: partial
     details:
@@ -42,7 +44,11 @@ options:
     required: true
   path:
     description:
-      - Path to a file on the managed node.
+      - Path to a file or a directory on the managed node.
+      - If this is a directory, the directory and everything below it is copied to O(container_path), which will be a directory
+        in the container. All files, directories, and symbolic links that need to be written are sent to the Docker daemon
+        as a single archive. Files and directories that exist in the container but not in O(path) are not removed.
+      - Copying directories is supported since community.docker 4.7.0.
       - Mutually exclusive with O(content). One of O(content) and O(path) is required.
     type: path
   content:
@@ -61,6 +67,7 @@ options:
   container_path:
     description:
       - Path to a file inside the Docker container.
+      - If O(path) is a directory, the path of the directory inside the Docker container. Its parent directory must exist.
       - Must be an absolute path.
     type: str
     required: true
@@ -95,6 +102,8 @@ options:
     description:
       - The file mode to use when writing the file to disk.
       - Will use the file's mode from the source system if this option is not provided.
+      - If O(path) is a directory, this is used for all regular files in it. Directories and symbolic links always use the
+        mode from the source system.
       - This option is parsed depending on how O(mode_parse) is set.
     type: raw
   mode_parse:
@@ -124,6 +133,23 @@ options:
         on the filesystem object in the container, and if everything seems to match will download the file from the container
         to compare it to the file to upload.
     type: bool
+  content_comparison:
+    description:
+      - Determines how the content of an existing regular file in the container is compared to the file to upload when
+        O(force) is not specified. This is only done when size and mode of both files already match.
+    type: str
+    choices:
+      download:
+        - Download the file from the container and compare it byte by byte to the file to upload.
+      sha256:
+        - Compute the SHA-256 digest and owner of the file in the container by executing C(stat) and C(sha256sum) with
+          C(/bin/sh) in the container, and compare them to the file to upload. The file is only downloaded if the digests
+          differ and a diff has been requested.
+        - This avoids transferring large files that did not change. The container must be running.
+        - If the container has no C(/bin/sh), C(stat), or C(sha256sum), or if they fail, the module falls back to V(download).
+        - If O(path) is a directory, it is always compared by downloading the directory from the container as a single archive.
+    default: download
+    version_added: 4.7.0
 
 extends_documentation_fragment:
   - community.docker.docker.api_documentation
@@ -154,6 +180,21 @@ EXAMPLES = r"""
     group_id: 0 # root
     mode: "0755" # readable and executable by all users, writable by root
     mode_parse: modern # ensure that strings passed for 'mode' are passed as octal numbers
+
+- name: Copy a large file into the container, only compare checksums to see whether it changed
+  community.docker.docker_container_copy_into:
+    container: mydata
+    path: /home/user/data/archive.tar.gz
+    container_path: /data/archive.tar.gz
+    content_comparison: sha256
+
+- name: Copy a directory into the container, only changed files are transferred
+  community.docker.docker_container_copy_into:
+    container: mydata
+    path: /home/user/site/
+    container_path: /usr/share/nginx/html
+    owner_id: 0
+    group_id: 0
 """
 
 RETURN = r"""
@@ -163,11 +204,23 @@ container_path:
     - Can only be different from O(container_path) when O(follow=true).
   type: str
   returned: success
+changed_paths:
+  description:
+    - The paths in the container that have been written, or would have been written in check mode.
+  type: list
+  elements: str
+  returned: success and O(path) is a directory
+  sample:
+    - /usr/share/nginx/html/index.html
+    - /usr/share/nginx/html/images
+  version_added: 4.7.0
 """
 
 import base64
+import hashlib
 import io
 import os
+import posixpath
 import stat
 import traceback
 
@@ -187,10 +240,14 @@ from ansible_collections.community.docker.plugins.module_utils.copy import (
     DockerFileNotFound,
     DockerUnexpectedError,
     determine_user_group,
+    fetch_archive_ex,
     fetch_file_ex,
+    get_file_digest,
     put_file,
     put_file_content,
+    put_files,
     stat_file,
+    walk_directory,
 )
 
 from ansible_collections.community.docker.plugins.module_utils._scramble import generate_insecure_key, scramble
@@ -445,8 +502,46 @@ def copy_dst_to_src(diff):
             diff.pop(t)
 
 
+def copy_src_to_dst(diff, container_path):
+    if diff is None:
+        return
+    for f, t in [
+        ('src_larger', 'dst_larger'),
+        ('src_binary', 'dst_binary'),
+        ('after', 'before'),
+    ]:
+        if f in diff:
+            diff[t] = diff[f]
+        elif t in diff:
+            diff.pop(t)
+    if 'before' in diff:
+        diff['before_header'] = container_path
+
+
+def get_local_file_digest(managed_path):
+    digest = hashlib.sha256()
+    with open(managed_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def is_digest_equal(client, container, container_path, owner_id, group_id, get_local_digest):
+    '''Compare owner, group, and SHA-256 digest of a regular file in the container without downloading it.
+
+    Returns ``None`` if the digest of the file in the container cannot be determined.'''
+    try:
+        container_digest = get_file_digest(client, container, container_path)
+    except (APIError, DockerFileCopyError):
+        # For example, the container is not running
+        return None
+    if container_digest is None:
+        return None
+    return container_digest == (owner_id, group_id, get_local_digest())
+
+
 def is_file_idempotent(client, container, managed_path, container_path, follow_links, local_follow_links, owner_id, group_id, mode,
-                       force=False, diff=None, max_file_size_for_diff=1):
+                       force=False, diff=None, max_file_size_for_diff=1, content_comparison='download'):
     # Retrieve information of local file
     try:
         file_stat = os.stat(managed_path) if local_follow_links else os.lstat(managed_path)
@@ -530,6 +625,15 @@ def is_file_idempotent(client, container, managed_path, container_path, follow_l
         retrieve_diff(client, container, container_path, follow_links, diff, max_file_size_for_diff, regular_stat, link_target)
         return container_path, mode, False
 
+    # Compare digests instead of downloading the file (if requested)
+    if content_comparison == 'sha256':
+        is_equal = is_digest_equal(client, container, container_path, owner_id, group_id, lambda: get_local_file_digest(managed_path))
+        if is_equal:
+            copy_src_to_dst(diff, container_path)
+            return container_path, mode, True
+        if is_equal is False and diff is None:
+            return container_path, mode, False
+
     # Fetch file from container
     def process_none(in_path):
         return container_path, mode, False
@@ -587,7 +691,7 @@ def is_file_idempotent(client, container, managed_path, container_path, follow_l
 
 
 def copy_file_into_container(client, container, managed_path, container_path, follow_links, local_follow_links,
-                             owner_id, group_id, mode, force=False, diff=False, max_file_size_for_diff=1):
+                             owner_id, group_id, mode, force=False, diff=False, max_file_size_for_diff=1, content_comparison='download'):
     if diff:
         diff = {}
     else:
@@ -606,6 +710,7 @@ def copy_file_into_container(client, container, managed_path, container_path, fo
         force=force,
         diff=diff,
         max_file_size_for_diff=max_file_size_for_diff,
+        content_comparison=content_comparison,
     )
     changed = not idempotent
 
@@ -630,8 +735,81 @@ def copy_file_into_container(client, container, managed_path, container_path, fo
     client.module.exit_json(**result)
 
 
+def compare_directory(client, container, container_path, entries, owner_id, group_id, mode):
+    '''Compare a directory in the container with local entries, downloading it as a single archive.
+
+    Returns a tuple of two sets of relative paths: the ones that exist in the container, and the ones
+    that exist with the same type, owner, mode, and content.'''
+    local = dict((relative_path, (b_path, file_stat)) for b_path, relative_path, file_stat in entries)
+
+    def process_tar(tar):
+        existing = set()
+        equal = set()
+        for member in tar:
+            parts = member.name.rstrip('/').split('/', 1)
+            relative_path = parts[1] if len(parts) > 1 else ''
+            existing.add(relative_path)
+            if relative_path not in local or member.uid != owner_id or member.gid != group_id:
+                continue
+            b_path, file_stat = local[relative_path]
+            if stat.S_ISDIR(file_stat.st_mode):
+                is_equal = member.isdir() and member.mode & 0xFFF == stat.S_IMODE(file_stat.st_mode)
+            elif stat.S_ISLNK(file_stat.st_mode):
+                is_equal = member.issym() and member.linkname == to_text(os.readlink(b_path), errors='surrogate_or_strict')
+            else:
+                file_mode = stat.S_IMODE(file_stat.st_mode) if mode is None else mode
+                is_equal = member.isfile() and member.mode & 0xFFF == file_mode and member.size == file_stat.st_size
+                if is_equal:
+                    tar_f = tar.extractfile(member)  # in Python 2, this *cannot* be used in `with`...
+                    with open(b_path, 'rb') as local_f:
+                        is_equal = are_fileobjs_equal(tar_f, local_f)
+            if is_equal:
+                equal.add(relative_path)
+        return existing, equal
+
+    result = fetch_archive_ex(client, container, container_path, process_tar)
+    return result if result is not None else (set(), set())
+
+
+def copy_directory_into_container(client, container, managed_path, container_path, follow_links, local_follow_links,
+                                  owner_id, group_id, mode, force=False):
+    entries = walk_directory(managed_path, follow_links=local_follow_links)
+
+    # Resolve symlinks in the container (if requested), and get information on container's directory
+    real_container_path, regular_stat, link_target = stat_file(
+        client,
+        container,
+        in_path=container_path,
+        follow_links=follow_links,
+    )
+    if follow_links:
+        container_path = real_container_path
+    if regular_stat is not None and (link_target is not None or regular_stat['mode'] & (1 << (32 - 1)) == 0):
+        raise DockerFileCopyError(
+            'Cannot copy directory {0} to {1} in container, since {1} exists and is not a directory'.format(managed_path, container_path))
+
+    if force or regular_stat is None:
+        write_entries = entries
+    else:
+        existing, equal = compare_directory(client, container, container_path, entries, owner_id, group_id, mode)
+        # If force is set to False, only write what does not exist yet
+        keep = existing if force is False else equal
+        write_entries = [entry for entry in entries if entry[1] not in keep]
+
+    changed = len(write_entries) > 0
+    if changed and not client.module.check_mode:
+        put_files(client, container, write_entries, container_path, owner_id, group_id, mode=mode)
+
+    client.module.exit_json(
+        container_path=container_path,
+        changed=changed,
+        changed_paths=[posixpath.join(container_path, relative_path) if relative_path else container_path
+                       for dummy, relative_path, dummy2 in write_entries],
+    )
+
+
 def is_content_idempotent(client, container, content, container_path, follow_links, owner_id, group_id, mode,
-                          force=False, diff=None, max_file_size_for_diff=1):
+                          force=False, diff=None, max_file_size_for_diff=1, content_comparison='download'):
     if diff is not None:
         if len(content) > max_file_size_for_diff > 0:
             diff['src_larger'] = max_file_size_for_diff
@@ -690,6 +868,15 @@ def is_content_idempotent(client, container, content, container_path, follow_lin
         retrieve_diff(client, container, container_path, follow_links, diff, max_file_size_for_diff, regular_stat, link_target)
         return container_path, mode, False
 
+    # Compare digests instead of downloading the file (if requested)
+    if content_comparison == 'sha256':
+        is_equal = is_digest_equal(client, container, container_path, owner_id, group_id, lambda: hashlib.sha256(content).hexdigest())
+        if is_equal:
+            copy_src_to_dst(diff, container_path)
+            return container_path, mode, True
+        if is_equal is False and diff is None:
+            return container_path, mode, False
+
     # Fetch file from container
     def process_none(in_path):
         if diff is not None:
@@ -735,7 +922,8 @@ def is_content_idempotent(client, container, content, container_path, follow_lin
 
 
 def copy_content_into_container(client, container, content, container_path, follow_links,
-                                owner_id, group_id, mode, force=False, diff=False, max_file_size_for_diff=1):
+                                owner_id, group_id, mode, force=False, diff=False, max_file_size_for_diff=1,
+                                content_comparison='download'):
     if diff:
         diff = {}
     else:
@@ -753,6 +941,7 @@ def copy_content_into_container(client, container, content, container_path, foll
         force=force,
         diff=diff,
         max_file_size_for_diff=max_file_size_for_diff,
+        content_comparison=content_comparison,
     )
     changed = not idempotent
 
@@ -810,6 +999,7 @@ def main():
         force=dict(type='bool'),
         content=dict(type='str', no_log=True),
         content_is_b64=dict(type='bool', default=False),
+        content_comparison=dict(type='str', choices=['download', 'sha256'], default='download'),
 
         # Undocumented parameters for use by the action plugin
         _max_file_size_for_diff=dict(type='int'),
@@ -837,6 +1027,7 @@ def main():
     force = client.module.params['force']
     content = client.module.params['content']
     max_file_size_for_diff = client.module.params['_max_file_size_for_diff'] or 1
+    content_comparison = client.module.params['content_comparison']
 
     if mode is not None:
         mode_parse = client.module.params['mode_parse']
@@ -882,6 +1073,20 @@ def main():
                 force=force,
                 diff=client.module._diff,
                 max_file_size_for_diff=max_file_size_for_diff,
+                content_comparison=content_comparison,
+            )
+        elif managed_path is not None and os.path.isdir(managed_path) and (local_follow or not os.path.islink(managed_path)):
+            copy_directory_into_container(
+                client,
+                container,
+                managed_path,
+                container_path,
+                follow_links=follow,
+                local_follow_links=local_follow,
+                owner_id=owner_id,
+                group_id=group_id,
+                mode=mode,
+                force=force,
             )
         elif managed_path is not None:
             copy_file_into_container(
@@ -897,6 +1102,7 @@ def main():
                 force=force,
                 diff=client.module._diff,
                 max_file_size_for_diff=max_file_size_for_diff,
+                content_comparison=content_comparison,
             )
         else:
             # Can happen if a user explicitly passes `content: null` or `path: null`...
@@ -171,6 +171,16 @@ options:
     description:
       - Use with O(state=present) to archive an image to a C(.tar) file.
     type: path
+  archive_manifest_index:
+    description:
+      - Whether to remember where the image list (C(manifest.json)) is stored in the O(archive_path) file.
+      - If set to V(true), the position is stored in a file next to O(archive_path) whose name is O(archive_path) followed
+        by C(.manifest-index.json). As long as the size and modification time of O(archive_path) do not change, later runs
+        read the image list from there instead of searching the whole C(.tar) file for it, which is faster for large archives.
+      - In check mode, an existing index file is used, but it is neither created nor updated.
+    type: bool
+    default: false
+    version_added: 4.7.0
   load_path:
     description:
       - Use with O(state=present) to load an image from a C(.tar) file.
@@ -443,6 +453,7 @@ class ImageManager(DockerBaseClass):
         build = parameters['build'] or dict()
         pull = parameters['pull'] or dict()
         self.archive_path = parameters['archive_path']
+        self.archive_manifest_index = parameters['archive_manifest_index']
         self.cache_from = build.get('cache_from')
         self.container_limits = build.get('container_limits')
         if self.container_limits and 'memory' in self.container_limits:
@@ -594,7 +605,7 @@ class ImageManager(DockerBaseClass):
             self.results['image']['state'] = 'Deleted'
 
     @staticmethod
-    def archived_image_action(failure_logger, archive_path, current_image_name, current_image_id):
+    def archived_image_action(failure_logger, archive_path, current_image_name, current_image_id, use_manifest_index=False, write_manifest_index=True):
         '''
         If the archive is missing or requires replacement, return an action message.
 
@@ -606,6 +617,10 @@ class ImageManager(DockerBaseClass):
         :type current_image_name: str
         :param current_image_id: Hash, including hash type prefix such as "sha256:"
         :type current_image_id: str
+        :param use_manifest_index: Whether to use and update the manifest index file of the archive
+        :type use_manifest_index: bool
+        :param write_manifest_index: Whether the manifest index file may be created or updated, false in check mode
+        :type write_manifest_index: bool
 
         :returns: Either None, or an Ansible action message.
         :rtype: str
@@ -615,7 +630,7 @@ class ImageManager(DockerBaseClass):
             return 'Archived image %s to %s, %s' % (current_image_name, archive_path, reason)
 
         try:
-            archived = archived_image_manifest(archive_path)
+            archived = archived_image_manifest(archive_path, use_index=use_manifest_index, write_index=write_manifest_index)
         except ImageArchiveInvalidException as exc:
             failure_logger('Unable to extract manifest summary from archive: %s' % to_native(exc))
             return build_msg('overwriting an unreadable archive file')
@@ -656,7 +671,9 @@ class ImageManager(DockerBaseClass):
         # Will have a 'sha256:' prefix
         image_id = image['Id']
 
-        action = self.archived_image_action(self.client.module.debug, self.archive_path, image_name, image_id)
+        action = self.archived_image_action(
+            self.client.module.debug, self.archive_path, image_name, image_id,
+            use_manifest_index=self.archive_manifest_index, write_manifest_index=not self.check_mode)
 
         if action:
             self.results['actions'].append(action)
@@ -1023,6 +1040,7 @@ def main():
             labels=dict(type='dict'),
         )),
         archive_path=dict(type='path'),
+        archive_manifest_index=dict(type='bool', default=False),
         force_source=dict(type='bool', default=False),
         force_absent=dict(type='bool', default=False),
         force_tag=dict(type='bool', default=False),
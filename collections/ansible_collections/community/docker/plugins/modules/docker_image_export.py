@@ -57,6 +57,16 @@ options:
       - Export the image even if the C(.tar) file already exists and seems to contain the right image.
     type: bool
     default: false
+  manifest_index:
+    description:
+      - Whether to remember where the image list (C(manifest.json)) is stored in the C(.tar) file.
+      - If set to V(true), the position is stored in a file next to O(path) whose name is O(path) followed by
+        C(.manifest-index.json). As long as the size and modification time of O(path) do not change, later runs read the
+        image list from there instead of searching the whole C(.tar) file for it, which is faster for large archives.
+      - In check mode, an existing index file is used, but it is neither created nor updated.
+    type: bool
+    default: false
+    version_added: 4.7.0
 
 requirements:
   - "Docker API >= 1.25"
@@ -83,6 +93,12 @@ EXAMPLES = r"""
       - hello-world:latest
       - pacur/centos-7:latest
     path: /tmp/various.tar
+
+- name: Export a large image, and remember where the image list is stored in the archive
+  community.docker.docker_image_export:
+    name: pacur/centos-7
+    path: /tmp/centos-7.tar
+    manifest_index: true
 """
 
 RETURN = r"""
@@ -133,6 +149,7 @@ class ImageExportManager(DockerBaseClass):
 
         self.path = parameters['path']
         self.force = parameters['force']
+        self.manifest_index = parameters['manifest_index']
         self.tag = parameters['tag']
 
         if not is_valid_tag(self.tag, allow_empty=True):
@@ -160,7 +177,7 @@ class ImageExportManager(DockerBaseClass):
             return 'Exporting since force=true'
 
         try:
-            archived_images = load_archived_image_manifest(self.path)
+            archived_images = load_archived_image_manifest(self.path, use_index=self.manifest_index, write_index=not self.check_mode)
             if archived_images is None:
                 return 'Overwriting since no image is present in archive'
         except ImageArchiveInvalidException as exc:
@@ -260,6 +277,7 @@ def main():
     argument_spec = dict(
         path=dict(type='path'),
         force=dict(type='bool', default=False),
+        manifest_index=dict(type='bool', default=False),
         names=dict(type='list', elements='str', required=True, aliases=['name']),
         tag=dict(type='str', default='latest'),
     )
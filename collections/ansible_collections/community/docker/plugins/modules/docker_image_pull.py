@@ -17,6 +17,7 @@ version_added: 3.6.0
 
 description:
   - Pulls a Docker image from a registry.
+  - Can also pull several images at the same time, see O(names).
 extends_documentation_fragment:
   - community.docker.docker.api_documentation
   - community.docker.attributes
@@ -38,12 +39,28 @@ options:
     description:
       - Image name. Name format must be one of V(name), V(repository/name), or V(registry_server:port/name).
       - The name can optionally include the tag by appending V(:tag_name), or it can contain a digest by appending V(@hash:digest).
+      - Exactly one of O(name) and O(names) must be provided.
     type: str
-    required: true
+  names:
+    description:
+      - A list of images to pull. Every entry has the same format as O(name).
+      - The images are pulled at the same time, see O(parallelism). Layers that several of the images share are downloaded
+        only once by the Docker daemon.
+      - Exactly one of O(name) and O(names) must be provided.
+    type: list
+    elements: str
+    version_added: 4.7.0
+  parallelism:
+    description:
+      - The maximum number of images from O(names) that are pulled at the same time.
+    type: int
+    default: 4
+    version_added: 4.7.0
   tag:
     description:
       - Used to select an image when pulling. Defaults to V(latest).
       - If O(name) parameter format is C(name:tag) or C(image@hash:digest), then O(tag) will be ignored.
+      - For O(names), this is used for all entries that do not contain a tag or digest.
     type: str
     default: latest
   platform:
@@ -81,14 +98,78 @@ EXAMPLES = r"""
     name: pacur/centos-7
     # Select platform for pulling. If not specified, will pull whatever docker prefers.
     platform: amd64
+
+- name: Pre-warm a host with several images, pulling up to eight at the same time
+  community.docker.docker_image_pull:
+    names:
+      - alpine:3.21
+      - debian:bookworm-slim
+      - python:3.13
+      - nginx:stable
+    parallelism: 8
+    pull: not_present
+  register: result
+
+- name: Show how long every pull took
+  ansible.builtin.debug:
+    msg: "{{ item.name }}: {{ item.duration }} seconds, {{ item.bytes }} bytes"
+  loop: "{{ result.transfers }}"
 """
 
 RETURN = r"""
 image:
   description: Image inspection results for the affected image.
-  returned: success
+  returned: success and O(name) is provided
   type: dict
   sample: {}
+images:
+  description: Image inspection results for the images in O(names), in the same order.
+  returned: success and O(names) is provided
+  type: list
+  elements: dict
+  sample: []
+  version_added: 4.7.0
+transfers:
+  description:
+    - One entry for every image from O(names) that was pulled.
+  returned: success, O(names) is provided, and not in check mode
+  type: list
+  elements: dict
+  contains:
+    name:
+      description: The name and tag of the image.
+      type: str
+      sample: alpine:3.21
+    duration:
+      description: The number of seconds the pull took.
+      type: float
+      sample: 2.512
+    layers:
+      description: The number of layers of the image.
+      type: int
+      sample: 3
+    layers_transferred:
+      description: The number of layers that were downloaded.
+      type: int
+      sample: 2
+    layers_existing:
+      description: The number of layers that already existed on the Docker daemon.
+      type: int
+      sample: 1
+    bytes:
+      description:
+        - The number of bytes downloaded for this image, as reported by the Docker daemon.
+        - Layers that are shared with other images pulled at the same time are counted for every one of these images.
+      type: int
+      sample: 3623807
+  version_added: 4.7.0
+transferred_bytes:
+  description:
+    - The number of bytes downloaded for all images from O(names). Layers shared by several images are only counted once.
+  returned: success, O(names) is provided, and not in check mode
+  type: int
+  sample: 3623807
+  version_added: 4.7.0
 """
 
 import traceback
@@ -106,6 +187,17 @@ from ansible_collections.community.docker.plugins.module_utils.util import (
     is_valid_tag,
 )
 
+from ansible_collections.community.docker.plugins.module_utils.image_transfer import (
+    ImageTransferProgress,
+    get_transferred_bytes,
+    run_in_parallel,
+    stream_pull,
+)
+
+from ansible_collections.community.docker.plugins.module_utils._api.auth import (
+    get_config_header,
+    resolve_repository_name,
+)
 from ansible_collections.community.docker.plugins.module_utils._api.errors import DockerException
 from ansible_collections.community.docker.plugins.module_utils._api.utils.utils import (
     parse_repository_tag,
@@ -136,22 +228,63 @@ class ImagePuller(DockerBaseClass):
 
         parameters = self.client.module.params
         self.name = parameters['name']
+        self.names = parameters['names']
         self.tag = parameters['tag']
         self.platform = parameters['platform']
         self.pull_mode = parameters['pull']
+        self.parallelism = parameters['parallelism']
+        self._host_info = None
 
-        if is_image_name_id(self.name):
-            self.client.fail("Cannot pull an image by ID")
         if not is_valid_tag(self.tag, allow_empty=True):
             self.client.fail('"{0}" is not a valid docker tag!'.format(self.tag))
+        if self.parallelism < 1:
+            self.client.fail('parallelism must be at least 1')
+
+        if self.names is not None:
+            # The same image can be listed more than once, it is pulled only once
+            self.references = []
+            for name in self.names:
+                reference = self._parse_name(name)
+                if reference not in self.references:
+                    self.references.append(reference)
+        else:
+            self.name, self.tag = self._parse_name(self.name)
+
+    def _parse_name(self, name):
+        if is_image_name_id(name):
+            self.client.fail("Cannot pull an image by ID")
 
         # If name contains a tag, it takes precedence over tag parameter.
-        repo, repo_tag = parse_repository_tag(self.name)
+        repo, repo_tag = parse_repository_tag(name)
         if repo_tag:
-            self.name = repo
-            self.tag = repo_tag
+            return repo, repo_tag
+        return name, self.tag
+
+    def _needs_pull(self, image):
+        if not image or self.pull_mode != 'not_present':
+            return True
+        if self.platform is None:
+            return False
+        if self._host_info is None:
+            self._host_info = self.client.info()
+        wanted_platform = normalize_platform_string(
+            self.platform,
+            daemon_os=self._host_info.get('OSType'),
+            daemon_arch=self._host_info.get('Architecture'),
+        )
+        image_platform = compose_platform_string(
+            os=image.get('Os'),
+            arch=image.get('Architecture'),
+            variant=image.get('Variant'),
+            daemon_os=self._host_info.get('OSType'),
+            daemon_arch=self._host_info.get('Architecture'),
+        )
+        return not compare_platform_strings(wanted_platform, image_platform)
 
     def pull(self):
+        if self.names is not None:
+            return self.pull_many()
+
         image = self.client.find_image(name=self.name, tag=self.tag)
         results = dict(
             changed=False,
@@ -160,24 +293,8 @@ class ImagePuller(DockerBaseClass):
             diff=dict(before=image_info(image), after=image_info(image)),
         )
 
-        if image and self.pull_mode == 'not_present':
-            if self.platform is None:
-                return results
-            host_info = self.client.info()
-            wanted_platform = normalize_platform_string(
-                self.platform,
-                daemon_os=host_info.get('OSType'),
-                daemon_arch=host_info.get('Architecture'),
-            )
-            image_platform = compose_platform_string(
-                os=image.get('Os'),
-                arch=image.get('Architecture'),
-                variant=image.get('Variant'),
-                daemon_os=host_info.get('OSType'),
-                daemon_arch=host_info.get('Architecture'),
-            )
-            if compare_platform_strings(wanted_platform, image_platform):
-                return results
+        if not self._needs_pull(image):
+            return results
 
         results['actions'].append('Pulled image %s:%s' % (self.name, self.tag))
         if self.check_mode:
@@ -190,10 +307,84 @@ class ImagePuller(DockerBaseClass):
 
         return results
 
+    def pull_many(self):
+        results = dict(
+            changed=False,
+            actions=[],
+            images=[],
+            diff=dict(before={}, after={}),
+        )
+
+        # Only look up what is needed here; the client's methods must not be used from the threads doing the pulls
+        old_images = {}
+        to_pull = []
+        auth_headers = {}
+        for reference in self.references:
+            old_images[reference] = self.client.find_image(name=reference[0], tag=reference[1])
+            if self._needs_pull(old_images[reference]):
+                to_pull.append(reference)
+                registry = resolve_repository_name(reference[0])[0]
+                if registry not in auth_headers:
+                    auth_headers[registry] = get_config_header(self.client, registry)
+
+        progresses = {}
+        errors = []
+        if to_pull and not self.check_mode:
+            def pull_one(reference):
+                self.log('Pulling image %s:%s' % reference)
+                progress = ImageTransferProgress()
+                stream_pull(
+                    self.client,
+                    reference[0],
+                    tag=reference[1],
+                    platform=self.platform,
+                    auth_header=auth_headers[resolve_repository_name(reference[0])[0]],
+                    progress=progress,
+                )
+                return progress
+
+            for reference, (progress, exc) in zip(to_pull, run_in_parallel(pull_one, to_pull, self.parallelism)):
+                if exc is not None:
+                    errors.append('%s:%s - %s' % (reference[0], reference[1], to_native(exc)))
+                else:
+                    progresses[reference] = progress
+
+        for reference in self.references:
+            name = '%s:%s' % reference
+            image = old_images[reference]
+            results['diff']['before'][name] = image_info(image)
+            if reference in to_pull and self.check_mode:
+                results['actions'].append('Pulled image %s' % name)
+                results['changed'] = True
+                results['diff']['after'][name] = image_info(dict(Id='unknown'))
+            else:
+                if reference in progresses:
+                    results['actions'].append('Pulled image %s' % name)
+                    new_image = self.client.find_image(name=reference[0], tag=reference[1])
+                    if new_image != image:
+                        results['changed'] = True
+                    image = new_image
+                results['diff']['after'][name] = image_info(image)
+            results['images'].append(image or {})
+
+        if not self.check_mode:
+            results['transfers'] = [
+                dict(name='%s:%s' % reference, **progresses[reference].get_summary())
+                for reference in to_pull if reference in progresses
+            ]
+            results['transferred_bytes'] = get_transferred_bytes(progresses.values())
+
+        if errors:
+            self.client.fail('Error pulling image(s): %s' % '; '.join(errors), **results)
+
+        return results
+
 
 def main():
     argument_spec = dict(
-        name=dict(type='str', required=True),
+        name=dict(type='str'),
+        names=dict(type='list', elements='str'),
+        parallelism=dict(type='int', default=4),
         tag=dict(type='str', default='latest'),
         platform=dict(type='str'),
         pull=dict(type='str', choices=['always', 'not_present'], default='always'),
@@ -206,6 +397,8 @@ def main():
     client = AnsibleDockerClient(
         argument_spec=argument_spec,
         supports_check_mode=True,
+        mutually_exclusive=[('name', 'names')],
+        required_one_of=[('name', 'names')],
         option_minimal_versions=option_minimal_versions,
     )
 
@@ -17,6 +17,7 @@ version_added: 3.6.0
 
 description:
   - Pushes a Docker image to a registry.
+  - Can also push several images at the same time, see O(names).
 extends_documentation_fragment:
   - community.docker.docker.api_documentation
   - community.docker.attributes
@@ -35,12 +36,27 @@ options:
     description:
       - Image name. Name format must be one of V(name), V(repository/name), or V(registry_server:port/name).
       - The name can optionally include the tag by appending V(:tag_name), or it can contain a digest by appending V(@hash:digest).
+      - Exactly one of O(name) and O(names) must be provided.
     type: str
-    required: true
+  names:
+    description:
+      - A list of images to push. Every entry has the same format as O(name).
+      - The images are pushed at the same time, see O(parallelism).
+      - Exactly one of O(name) and O(names) must be provided.
+    type: list
+    elements: str
+    version_added: 4.7.0
+  parallelism:
+    description:
+      - The maximum number of images from O(names) that are pushed at the same time.
+    type: int
+    default: 4
+    version_added: 4.7.0
   tag:
     description:
       - Select which image to push. Defaults to V(latest).
       - If O(name) parameter format is C(name:tag) or C(image@hash:digest), then O(tag) will be ignored.
+      - For O(names), this is used for all entries that do not contain a tag.
     type: str
     default: latest
 
@@ -62,14 +78,69 @@ EXAMPLES = r"""
   community.docker.docker_image_push:
     name: registry.example.com:5000/repo/image
     tag: latest
+
+- name: Push several images at the same time
+  community.docker.docker_image_push:
+    names:
+      - registry.example.com:5000/repo/frontend:1.2.0
+      - registry.example.com:5000/repo/backend:1.2.0
+      - registry.example.com:5000/repo/worker:1.2.0
 """
 
 RETURN = r"""
 image:
   description: Image inspection results for the affected image.
-  returned: success
+  returned: success and O(name) is provided
   type: dict
   sample: {}
+images:
+  description: Image inspection results for the images in O(names), in the same order.
+  returned: success and O(names) is provided
+  type: list
+  elements: dict
+  sample: []
+  version_added: 4.7.0
+transfers:
+  description:
+    - One entry for every image from O(names).
+  returned: success and O(names) is provided
+  type: list
+  elements: dict
+  contains:
+    name:
+      description: The name and tag of the image.
+      type: str
+      sample: registry.example.com:5000/repo/frontend:1.2.0
+    duration:
+      description: The number of seconds the push took.
+      type: float
+      sample: 2.512
+    layers:
+      description: The number of layers of the image.
+      type: int
+      sample: 3
+    layers_transferred:
+      description: The number of layers that were uploaded.
+      type: int
+      sample: 2
+    layers_existing:
+      description: The number of layers that already existed in the registry.
+      type: int
+      sample: 1
+    bytes:
+      description:
+        - The number of bytes uploaded for this image, as reported by the Docker daemon.
+        - Layers that are shared with other images pushed at the same time are counted for every one of these images.
+      type: int
+      sample: 3623807
+  version_added: 4.7.0
+transferred_bytes:
+  description:
+    - The number of bytes uploaded for all images from O(names). Layers shared by several images are only counted once.
+  returned: success and O(names) is provided
+  type: int
+  sample: 3623807
+  version_added: 4.7.0
 """
 
 import traceback
@@ -87,6 +158,13 @@ from ansible_collections.community.docker.plugins.module_utils.util import (
     is_valid_tag,
 )
 
+from ansible_collections.community.docker.plugins.module_utils.image_transfer import (
+    ImageTransferProgress,
+    get_transferred_bytes,
+    run_in_parallel,
+    stream_push,
+)
+
 from ansible_collections.community.docker.plugins.module_utils._api.errors import DockerException
 from ansible_collections.community.docker.plugins.module_utils._api.utils.utils import (
     parse_repository_tag,
@@ -107,25 +185,55 @@ class ImagePusher(DockerBaseClass):
 
         parameters = self.client.module.params
         self.name = parameters['name']
+        self.names = parameters['names']
         self.tag = parameters['tag']
+        self.parallelism = parameters['parallelism']
 
-        if is_image_name_id(self.name):
-            self.client.fail("Cannot push an image by ID")
         if not is_valid_tag(self.tag, allow_empty=True):
             self.client.fail('"{0}" is not a valid docker tag!'.format(self.tag))
+        if self.parallelism < 1:
+            self.client.fail('parallelism must be at least 1')
+
+        if self.names is not None:
+            # The same image can be listed more than once, it is pushed only once
+            self.references = []
+            for name in self.names:
+                reference = self._parse_name(name)
+                if reference not in self.references:
+                    self.references.append(reference)
+        else:
+            self.name, self.tag = self._parse_name(self.name)
+
+    def _parse_name(self, name):
+        if is_image_name_id(name):
+            self.client.fail("Cannot push an image by ID")
 
         # If name contains a tag, it takes precedence over tag parameter.
-        repo, repo_tag = parse_repository_tag(self.name)
-        if repo_tag:
-            self.name = repo
-            self.tag = repo_tag
+        repo, tag = parse_repository_tag(name)
+        if not tag:
+            repo, tag = name, self.tag
 
-        if is_image_name_id(self.tag):
+        if is_image_name_id(tag):
             self.client.fail("Cannot push an image by digest")
-        if not is_valid_tag(self.tag, allow_empty=False):
-            self.client.fail('"{0}" is not a valid docker tag!'.format(self.tag))
+        if not is_valid_tag(tag, allow_empty=False):
+            self.client.fail('"{0}" is not a valid docker tag!'.format(tag))
+        return repo, tag
+
+    @staticmethod
+    def _get_error_message(name, tag, exc):
+        push_registry, push_repo = resolve_repository_name(name)
+        if 'unauthorized' in str(exc):
+            if 'authentication required' in str(exc):
+                return ("Error pushing image %s/%s:%s - %s. Try logging into %s first." %
+                        (push_registry, push_repo, tag, to_native(exc), push_registry))
+            return ("Error pushing image %s/%s:%s - %s. Does the repository exist?" %
+                    (push_registry, push_repo, tag, str(exc)))
+        return "Error pushing image %s:%s: %s" % (name, tag, to_native(exc))
 
     def push(self):
+        if self.names is not None:
+            return self.push_many()
+
         image = self.client.find_image(name=self.name, tag=self.tag)
         if not image:
             self.client.fail('Cannot find image %s:%s' % (self.name, self.tag))
@@ -140,47 +248,83 @@ class ImagePusher(DockerBaseClass):
         try:
             results['actions'].append('Pushed image %s:%s' % (self.name, self.tag))
 
-            headers = {}
-            header = get_config_header(self.client, push_registry)
-            if header:
-                headers['X-Registry-Auth'] = header
-            response = self.client._post_json(
-                self.client._url("/images/{0}/push", self.name),
-                data=None,
-                headers=headers,
-                stream=True,
-                params={'tag': self.tag},
+            progress = ImageTransferProgress()
+            stream_push(
+                self.client,
+                self.name,
+                self.tag,
+                auth_header=get_config_header(self.client, push_registry),
+                progress=progress,
             )
-            self.client._raise_for_status(response)
-            for line in self.client._stream_helper(response, decode=True):
-                self.log(line, pretty_print=True)
-                if line.get('errorDetail'):
-                    raise Exception(line['errorDetail']['message'])
-                status = line.get('status')
-                if status == 'Pushing':
-                    results['changed'] = True
+            results['changed'] = progress.transferred
         except Exception as exc:
-            if 'unauthorized' in str(exc):
-                if 'authentication required' in str(exc):
-                    self.client.fail("Error pushing image %s/%s:%s - %s. Try logging into %s first." %
-                                     (push_registry, push_repo, self.tag, to_native(exc), push_registry))
-                else:
-                    self.client.fail("Error pushing image %s/%s:%s - %s. Does the repository exist?" %
-                                     (push_registry, push_repo, self.tag, str(exc)))
-            self.client.fail("Error pushing image %s:%s: %s" % (self.name, self.tag, to_native(exc)))
+            self.client.fail(self._get_error_message(self.name, self.tag, exc))
+
+        return results
+
+    def push_many(self):
+        results = dict(
+            changed=False,
+            actions=[],
+            images=[],
+        )
+
+        # Only look up what is needed here; the client's methods must not be used from the threads doing the pushes
+        auth_headers = {}
+        for name, tag in self.references:
+            image = self.client.find_image(name=name, tag=tag)
+            if not image:
+                self.client.fail('Cannot find image %s:%s' % (name, tag))
+            results['images'].append(image)
+            registry = resolve_repository_name(name)[0]
+            if registry not in auth_headers:
+                auth_headers[registry] = get_config_header(self.client, registry)
+
+        def push_one(reference):
+            self.log('Pushing image %s:%s' % reference)
+            progress = ImageTransferProgress()
+            stream_push(
+                self.client,
+                reference[0],
+                reference[1],
+                auth_header=auth_headers[resolve_repository_name(reference[0])[0]],
+                progress=progress,
+            )
+            return progress
+
+        progresses = []
+        errors = []
+        results['transfers'] = []
+        for reference, (progress, exc) in zip(self.references, run_in_parallel(push_one, self.references, self.parallelism)):
+            if exc is not None:
+                errors.append(self._get_error_message(reference[0], reference[1], exc))
+                continue
+            results['actions'].append('Pushed image %s:%s' % reference)
+            if progress.transferred:
+                results['changed'] = True
+            progresses.append(progress)
+            results['transfers'].append(dict(name='%s:%s' % reference, **progress.get_summary()))
+        results['transferred_bytes'] = get_transferred_bytes(progresses)
+
+        if errors:
+            self.client.fail('; '.join(errors), **results)
 
         return results
 
 
 def main():
     argument_spec = dict(
-        name=dict(type='str', required=True),
+        name=dict(type='str'),
+        names=dict(type='list', elements='str'),
+        parallelism=dict(type='int', default=4),
         tag=dict(type='str', default='latest'),
     )
 
     client = AnsibleDockerClient(
         argument_spec=argument_spec,
         supports_check_mode=False,
+        mutually_exclusive=[('name', 'names')],
+        required_one_of=[('name', 'names')],
     )
 
     try:
@@ -0,0 +1,77 @@
+# Copyright (c) 2025, Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import calendar
+import re
+
+
+# Increase when the layout of the cached data changes, caches with another version are ignored
+CACHE_VERSION = 1
+
+_RE_DAEMON_TIME = re.compile(
+    r'^(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})(?:\.\d+)?(?:(Z)|([+-])(\d{2}):(\d{2}))$'
+)
+
+
+def parse_daemon_time(value):
+    '''
+    Convert the ``SystemTime`` value of the daemon's info (RFC 3339, possibly with nanoseconds) to UNIX seconds.
+
+    Returns ``None`` if the value cannot be parsed. Fractions of seconds are dropped; since the
+    result is used as the ``since`` of the next event query, this can only make event ranges overlap.
+    '''
+    if not isinstance(value, str):
+        return None
+    m = _RE_DAEMON_TIME.match(value)
+    if not m:
+        return None
+    result = calendar.timegm(tuple(int(part) for part in m.group(1, 2, 3, 4, 5, 6)))
+    if m.group(8):
+        offset = int(m.group(9)) * 3600 + int(m.group(10)) * 60
+        result += -offset if m.group(8) == '+' else offset
+    return result
+
+
+def get_cached_state(cached, daemon_id):
+    '''
+    Return the cached state if it can be used for an incremental update, otherwise ``None``.
+
+    The state can only be used if it was written by this version of the plugin for the same daemon,
+    and if it knows when it was taken.
+    '''
+    if not isinstance(cached, dict) or cached.get('version') != CACHE_VERSION:
+        return None
+    if cached.get('daemon') != daemon_id:
+        return None
+    if not isinstance(cached.get('until'), int) or not isinstance(cached.get('objects'), dict):
+        return None
+    return cached
+
+
+def get_changed_ids(events, ignored_actions=()):
+    '''
+    Return the set of object IDs that events report a change for.
+
+    Events whose action is in ``ignored_actions`` or starts with one of its entries followed by ``_``
+    (for example ``exec`` for ``exec_start``) are not considered a change.
+
+    Network events report a change for the container that was connected or disconnected, since that
+    changes the container's network settings. Network events without a container are skipped.
+    '''
+    changed = set()
+    for event in events:
+        action = (event.get('Action') or event.get('status') or '').split(':', 1)[0].strip()
+        if action in ignored_actions or action.split('_', 1)[0] in ignored_actions:
+            continue
+        actor = event.get('Actor') or {}
+        if event.get('Type') == 'network':
+            object_id = (actor.get('Attributes') or {}).get('container')
+        else:
+            object_id = actor.get('ID') or event.get('id')
+        if object_id:
+            changed.add(object_id)
+    return changed
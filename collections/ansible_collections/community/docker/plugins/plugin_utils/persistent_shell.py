@@ -0,0 +1,119 @@
+# Copyright (c) 2025, Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+import uuid
+
+from ansible.module_utils.common.text.converters import to_bytes
+from ansible.module_utils.six.moves import shlex_quote
+
+from ansible_collections.community.docker.plugins.module_utils._api.utils import socket as docker_socket
+
+from ansible_collections.community.docker.plugins.plugin_utils.socket_handler import (
+    DockerSocketHandler,
+)
+
+
+class PersistentShellError(Exception):
+    pass
+
+
+def can_frame_input(in_data):
+    '''
+    Whether ``in_data`` can be passed to a command through a here-document of the persistent shell.
+
+    Shells cannot pass on NUL bytes, and a here-document always ends with a newline.
+    '''
+    return in_data is None or (in_data.endswith(b'\n') and b'\0' not in in_data)
+
+
+def build_script(command, marker, in_data=None):
+    '''
+    Return the shell input that runs ``command`` (a list of arguments) with ``in_data`` as its standard input.
+
+    Once the command has finished, ``marker`` followed by the exit code is written to standard output,
+    and ``marker`` on its own is written to standard error, so that the end of both streams can be found.
+    '''
+    script = [to_bytes(' '.join(shlex_quote(arg) for arg in command), errors='surrogate_or_strict')]
+    if in_data is None:
+        script.append(b' </dev/null\n')
+    else:
+        script.append(b" <<'" + marker + b"_IN'\n")
+        script.append(in_data)
+        script.append(marker + b'_IN\n')
+    script.append(b"printf '%s %d\\n' '" + marker + b"' \"$?\"\n")
+    script.append(b"printf '%s\\n' '" + marker + b"' >&2\n")
+    return b''.join(script)
+
+
+class PersistentShell(object):
+    '''
+    A shell running in a container that reads the commands to run from its standard input.
+    '''
+
+    def __init__(self, display, sock, container=None):
+        self._sock = sock
+        self._handler = DockerSocketHandler(display, sock, container=container)
+        self._handler.set_block_done_callback(self._add_block)
+        self._stdout = bytearray()
+        self._stderr = bytearray()
+
+    def _add_block(self, stream_id, data):
+        if stream_id == docker_socket.STDOUT:
+            self._stdout += data
+        elif stream_id == docker_socket.STDERR:
+            self._stderr += data
+        else:
+            raise ValueError('{0} is not a valid stream ID'.format(stream_id))
+
+    def is_alive(self):
+        # Pick up output and EOF that arrived since the last command without waiting
+        while not self._handler.is_eof() and self._handler.select(0):
+            pass
+        return not self._handler.is_eof()
+
+    def run(self, command, in_data=None):
+        '''
+        Run ``command`` in the shell and return its exit code, standard output and standard error.
+
+        Raises ``PersistentShellError`` if the shell exits before the command finished.
+        '''
+        marker = to_bytes('__ANSIBLE_DOCKER_{0}__'.format(uuid.uuid4().hex))
+        # Anything a previous command left running in the background wrote is not part of this command's output
+        del self._stdout[:]
+        del self._stderr[:]
+        self._handler.write(build_script(command, marker, in_data))
+
+        stdout_end = stderr_end = -1
+        stdout_searched = stderr_searched = 0
+        while True:
+            # Only search the data that was added since the last search
+            if stdout_end < 0:
+                stdout_end = self._stdout.find(marker + b' ', max(0, stdout_searched - len(marker)))
+                stdout_searched = len(self._stdout)
+            if stderr_end < 0:
+                stderr_end = self._stderr.find(marker + b'\n', max(0, stderr_searched - len(marker)))
+                stderr_searched = len(self._stderr)
+            if stdout_end >= 0 and stderr_end >= 0 and self._stdout.find(b'\n', stdout_end) >= 0:
+                break
+            if self._handler.is_eof():
+                raise PersistentShellError('The shell exited while running the command')
+            self._handler.select()
+
+        rc_start = stdout_end + len(marker) + 1
+        rc = int(self._stdout[rc_start:self._stdout.find(b'\n', rc_start)])
+        stdout = bytes(self._stdout[:stdout_end])
+        stderr = bytes(self._stderr[:stderr_end])
+        del self._stdout[:]
+        del self._stderr[:]
+        return rc, stdout, stderr
+
+    def close(self):
+        try:
+            self._handler.__exit__(None, None, None)
+        finally:
+            self._sock.close()
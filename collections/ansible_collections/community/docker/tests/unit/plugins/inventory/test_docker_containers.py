@@ -6,6 +6,8 @@ from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
 
+import json
+
 import pytest
 
 from ansible.inventory.data import InventoryData
@@ -126,6 +128,7 @@ def test_populate(inventory, mocker):
         'compose': {},
         'groups': {},
         'keyed_groups': {},
+        'inspect_containers': True,
         'filters': None,
     }))
     inventory._populate(client)
@@ -158,6 +161,7 @@ def test_populate_service(inventory, mocker):
         'groups': {},
         'keyed_groups': {},
         'docker_host': 'unix://var/run/docker.sock',
+        'inspect_containers': True,
         'filters': None,
     }))
     inventory._populate(client)
@@ -200,6 +204,7 @@ def test_populate_stack(inventory, mocker):
         'docker_host': 'unix://var/run/docker.sock',
         'default_ip': '127.0.0.1',
         'private_ssh_port': 22,
+        'inspect_containers': True,
         'filters': None,
     }))
     inventory._populate(client)
@@ -239,6 +244,7 @@ def test_populate_filter_none(inventory, mocker):
         'compose': {},
         'groups': {},
         'keyed_groups': {},
+        'inspect_containers': True,
         'filters': [
             {'exclude': True},
         ],
@@ -258,6 +264,7 @@ def test_populate_filter(inventory, mocker):
         'compose': {},
         'groups': {},
         'keyed_groups': {},
+        'inspect_containers': True,
         'filters': [
             {'include': make_trusted('docker_state.Running is true')},
             {'exclude': True},
@@ -270,3 +277,154 @@ def test_populate_filter(inventory, mocker):
 
     assert host_1_vars['ansible_host'] == 'loving_tharp'
     assert len(inventory.inventory.hosts) == 1
+
+
+class FakeListOnlyClient(object):
+    def __init__(self, *containers):
+        self.containers = list(containers)
+
+    def get_json(self, url, *param, **kwargs):
+        assert url == '/containers/json', 'Only the container list may be requested, not {0}'.format(url.format(*param))
+        return self.containers
+
+
+def test_populate_list_only(inventory, mocker):
+    client = FakeListOnlyClient({
+        'Id': 'cafe2a4ce0d1bcd71f0e5d7a0f4a6e9a6bf7b1d3f54d0f1dd6b7c5c4fb3d5e6a',
+        'Names': ['/list_only'],
+        'Image': 'quay.io/ansible/ubuntu1804-test-container:1.21.0',
+        'State': 'running',
+        'Labels': {'com.docker.stack.namespace': 'my_list_stack'},
+        'Ports': [
+            {'IP': '0.0.0.0', 'PrivatePort': 22, 'PublicPort': 32803, 'Type': 'tcp'},
+        ],
+    })
+
+    inventory.get_option = mocker.MagicMock(side_effect=create_get_option({
+        'verbose_output': True,
+        'connection_type': 'ssh',
+        'add_legacy_groups': True,
+        'private_ssh_port': 22,
+        'default_ip': '127.0.0.1',
+        'compose': {},
+        'groups': {},
+        'keyed_groups': {},
+        'docker_host': 'unix://var/run/docker.sock',
+        'inspect_containers': False,
+        'filters': None,
+    }))
+    inventory._populate(client)
+
+    host_1 = inventory.inventory.get_host('list_only')
+    host_1_vars = host_1.get_vars()
+
+    assert host_1_vars['ansible_ssh_host'] == '127.0.0.1'
+    assert host_1_vars['ansible_ssh_port'] == '32803'
+    assert host_1_vars['docker_state'] == 'running'
+    assert host_1_vars['docker_stack'] == 'my_list_stack'
+    assert 'list_only' in [host.name for host in inventory.inventory.groups['running'].hosts]
+    assert [host.name for host in inventory.inventory.groups['stack_my_list_stack'].hosts] == ['list_only']
+
+
+def test_populate_concurrent_inspect(inventory, mocker):
+    hosts = []
+    for index in range(20):
+        host = dict(LOVING_THARP)
+        host['Id'] = '{0:064x}'.format(index + 1)
+        host['Name'] = '/concurrent_{0}'.format(index)
+        hosts.append(host)
+    client = FakeClient(*hosts)
+
+    inventory.get_option = mocker.MagicMock(side_effect=create_get_option({
+        'verbose_output': True,
+        'connection_type': 'docker-api',
+        'add_legacy_groups': False,
+        'compose': {},
+        'groups': {},
+        'keyed_groups': {},
+        'inspect_containers': True,
+        'inspect_concurrency': 4,
+        'filters': None,
+    }))
+    inventory._populate(client)
+
+    for index in range(20):
+        host_vars = inventory.inventory.get_host('concurrent_{0}'.format(index)).get_vars()
+        assert host_vars['docker_id'] == '{0:064x}'.format(index + 1)
+
+
+class FakeCachingClient(FakeClient):
+    def __init__(self, *hosts, **kwargs):
+        super(FakeCachingClient, self).__init__(*hosts)
+        self.get_results['/info'] = {
+            'ID': kwargs.get('daemon_id', 'daemon-1'),
+            'SystemTime': kwargs.get('system_time', '2025-03-01T12:00:10.123456789+01:00'),
+        }
+        self.events = kwargs.get('events', [])
+        self.inspected = []
+        self.event_params = None
+
+    def get_json(self, url, *param, **kwargs):
+        if url == '/containers/{0}/json':
+            self.inspected.append(param[0])
+        return super(FakeCachingClient, self).get_json(url, *param, **kwargs)
+
+    def get_text(self, url, *param, **kwargs):
+        assert url == '/events'
+        self.event_params = kwargs['params']
+        return '\n'.join(json.dumps(event) for event in self.events)
+
+
+def test_populate_cache(inventory, mocker):
+    hosts = []
+    for index in range(3):
+        host = dict(LOVING_THARP)
+        host['Id'] = '{0:064x}'.format(index + 100)
+        host['Name'] = '/cached_{0}'.format(index)
+        hosts.append(host)
+
+    inventory.get_option = mocker.MagicMock(side_effect=create_get_option({
+        'verbose_output': True,
+        'connection_type': 'docker-api',
+        'add_legacy_groups': False,
+        'compose': {},
+        'groups': {},
+        'keyed_groups': {},
+        'inspect_containers': True,
+        'inspect_concurrency': 1,
+        'filters': None,
+        'cache': True,
+    }))
+
+    client = FakeCachingClient(*hosts)
+    cache_data = inventory._populate(client)
+    assert sorted(client.inspected) == sorted(host['Id'] for host in hosts)
+    assert cache_data['until'] == 1740826810
+    assert sorted(cache_data['objects']) == sorted(host['Id'] for host in hosts)
+    # The data has to survive a JSON cache backend
+    cache_data = json.loads(json.dumps(cache_data))
+
+    # Only the containers with an event are inspected again, exec events do not change anything
+    client = FakeCachingClient(*hosts, system_time='2025-03-01T11:05:00Z', events=[
+        {'Type': 'container', 'Action': 'exec_start: sh', 'Actor': {'ID': hosts[0]['Id']}},
+        {'Type': 'container', 'Action': 'rename', 'Actor': {'ID': hosts[1]['Id']}},
+        {'Type': 'network', 'Action': 'connect', 'Actor': {'ID': 'network-1', 'Attributes': {'container': hosts[2]['Id']}}},
+    ])
+    cache_data = inventory._populate(client, cache_data)
+    assert client.inspected == [hosts[1]['Id'], hosts[2]['Id']]
+    assert client.event_params['since'] == '1740826810'
+    assert client.event_params['until'] == '1740827100'
+    assert json.loads(client.event_params['filters']) == {'type': ['container', 'network']}
+    assert inventory.inventory.get_host('cached_0').get_vars()['docker_id'] == hosts[0]['Id']
+
+    # A changed container list is noticed even without events
+    client = FakeCachingClient(*hosts)
+    client.get_results['/containers/json'][2]['Image'] = 'other:latest'
+    inventory._populate(client, cache_data)
+    assert client.inspected == [hosts[2]['Id']]
+
+    # The cache of another daemon is not used
+    client = FakeCachingClient(*hosts, daemon_id='daemon-2')
+    inventory._populate(client, cache_data)
+    assert client.event_params is None
+    assert sorted(client.inspected) == sorted(host['Id'] for host in hosts)
@@ -364,6 +364,41 @@ class ExcludePathsTest(unittest.TestCase):
             ['../a.py', '/../b.py']
         ) == set(['c.py'])
 
+    def test_many_patterns(self):
+        # More patterns than fit into a single expression on Python 2
+        patterns = ['unused{0}'.format(i) for i in range(250)]
+        assert self.exclude(patterns + ['*.py'] + patterns + ['!b.py'] + patterns) == convert_paths(
+            self.all_paths - set(['a.py', 'cde.py'])
+        )
+
+    def test_excluded_directory_not_walked(self):
+        walked = []
+        original_listdir = os.listdir
+        original_scandir = getattr(os, 'scandir', None)
+
+        def listdir(path):
+            walked.append(os.path.relpath(path, self.base))
+            return original_listdir(path)
+
+        def scandir(path):
+            walked.append(os.path.relpath(path, self.base))
+            return original_scandir(path)
+
+        os.listdir = listdir
+        if original_scandir is not None:
+            os.scandir = scandir
+        try:
+            assert self.exclude(['subdir', 'target', '!target/subdir/file.txt']) == convert_paths(
+                self.all_paths - set([p for p in self.all_paths if p.startswith('subdir')]) - set(['target', 'target/file.txt'])
+                - set(['target/subdir'])
+            )
+        finally:
+            os.listdir = original_listdir
+            if original_scandir is not None:
+                os.scandir = original_scandir
+        # target has to be walked since one of its files is included again, subdir does not
+        assert sorted(walked) == sorted(['.', 'bar', 'foo', convert_path('foo/bar'), 'target', convert_path('target/subdir')])
+
 
 class TarTest(unittest.TestCase):
     def test_tar_with_excludes(self):
@@ -10,6 +10,7 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
+import json
 import sys
 
 import pytest
@@ -17,6 +18,7 @@ import pytest
 if sys.version_info < (2, 7):
     pytestmark = pytest.mark.skip('Python 2.6 is not supported')
 
+from ansible_collections.community.docker.plugins.module_utils._api.errors import StreamParseError
 from ansible_collections.community.docker.plugins.module_utils._api.utils.json_stream import json_splitter, stream_as_text, json_stream
 
 
@@ -75,3 +77,30 @@ class TestJsonStream:
             {'three': 'four'},
             {'x': 2}
         ]
+
+    def test_with_bytes_split_inside_objects_and_characters(self):
+        data = u'{"status": "Pulling fs layer", "id": "ěĝ"}\r\n{"status": "Done"}\r\n'.encode('utf-8')
+        stream = [data[i:i + 3] for i in range(0, len(data), 3)]
+        output = list(json_stream(stream))
+        assert output == [
+            {'status': 'Pulling fs layer', 'id': u'ěĝ'},
+            {'status': 'Done'},
+        ]
+
+    def test_with_many_objects_in_one_chunk(self):
+        events = [
+            {'status': 'Downloading', 'progressDetail': {'current': i, 'total': 20000}, 'id': 'abcdef012345'}
+            for i in range(20000)
+        ]
+        stream = [''.join(json.dumps(event) + '\r\n' for event in events).encode('utf-8')]
+        assert list(json_stream(stream)) == events
+
+    def test_with_trailing_garbage(self):
+        stream = [
+            '{"one": "two"}\n',
+            '{"three": ',
+        ]
+        output = json_stream(stream)
+        assert next(output) == {'one': 'two'}
+        with pytest.raises(StreamParseError):
+            next(output)
@@ -5,10 +5,17 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
+import io
+import os
+import tarfile
+
 import pytest
 
 from ansible_collections.community.docker.plugins.module_utils.copy import (
+    _parse_file_digest,
     _stream_generator_to_fileobj,
+    put_files,
+    walk_directory,
 )
 
 
@@ -75,3 +82,73 @@ def test__stream_generator_to_fileobj(chunks, read_sizes):
 
     assert buffer == expected[:len(buffer)]
     assert min(totally_read, len(expected)) == len(buffer)
+
+
+DIGEST = 'e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855'
+
+
+@pytest.mark.parametrize('stdout, expected', [
+    (b'0 0\n' + DIGEST.encode() + b'  /file\n', (0, 0, DIGEST)),
+    (b'1000 100\n' + DIGEST.upper().encode() + b'  /a file with spaces\n', (1000, 100, DIGEST)),
+    (b'0 0\n', None),
+    (b'0\n' + DIGEST.encode() + b'  /file\n', None),
+    (b'0 0\n' + DIGEST[:-1].encode() + b'  /file\n', None),
+    (b'0 0\n' + DIGEST[:-1].encode() + b'x  /file\n', None),
+    (b'x 0\n' + DIGEST.encode() + b'  /file\n', None),
+])
+def test__parse_file_digest(stdout, expected):
+    assert _parse_file_digest(stdout) == expected
+
+
+class FakePutArchiveClient(object):
+    def __init__(self):
+        self.calls = []
+
+    def _url(self, pathfmt, *args):
+        return pathfmt.format(*args)
+
+    def _put(self, url, params=None, data=None):
+        self.calls.append((url, params['path'], b''.join(data)))
+        return type('Response', (object, ), {'status_code': 200})()
+
+    def _raise_for_status(self, response):
+        pass
+
+
+def create_tree(tmp_path):
+    (tmp_path / 'sub').mkdir()
+    (tmp_path / 'a.txt').write_bytes(b'hello\n')
+    (tmp_path / 'sub' / 'b.bin').write_bytes(b'\x00' * 1000)
+    os.symlink('a.txt', str(tmp_path / 'link'))
+    os.symlink('sub', str(tmp_path / 'sublink'))
+
+
+def test_walk_directory(tmp_path):
+    create_tree(tmp_path)
+    assert [relative_path for b_path, relative_path, file_stat in walk_directory(str(tmp_path))] == [
+        '', 'a.txt', 'link', 'sub', 'sublink', 'sub/b.bin',
+    ]
+    assert [relative_path for b_path, relative_path, file_stat in walk_directory(str(tmp_path), follow_links=True)] == [
+        '', 'a.txt', 'link', 'sub', 'sublink', 'sub/b.bin', 'sublink/b.bin',
+    ]
+
+
+def test_put_files(tmp_path):
+    create_tree(tmp_path)
+    client = FakePutArchiveClient()
+    put_files(client, 'container', walk_directory(str(tmp_path)), '/opt/target', 1000, 1001, mode=0o640)
+
+    assert len(client.calls) == 1
+    url, path, data = client.calls[0]
+    assert url == '/containers/container/archive'
+    assert path == '/opt'
+    assert len(data) % tarfile.RECORDSIZE == 0
+    with tarfile.open(fileobj=io.BytesIO(data), mode='r') as tar:
+        members = dict((member.name, member) for member in tar)
+        assert sorted(members) == ['target', 'target/a.txt', 'target/link', 'target/sub', 'target/sub/b.bin', 'target/sublink']
+        assert all(member.uid == 1000 and member.gid == 1001 for member in members.values())
+        assert members['target'].isdir()
+        assert members['target/a.txt'].mode == 0o640
+        assert tar.extractfile(members['target/a.txt']).read() == b'hello\n'
+        assert tar.extractfile(members['target/sub/b.bin']).read() == b'\x00' * 1000
+        assert members['target/link'].issym() and members['target/link'].linkname == 'a.txt'
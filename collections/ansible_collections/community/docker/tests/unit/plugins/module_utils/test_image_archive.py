@@ -5,12 +5,17 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
+import io
+import json
+import os
+
 import pytest
 import tarfile
 
 from ansible_collections.community.docker.plugins.module_utils.image_archive import (
     api_image_id,
     archived_image_manifest,
+    manifest_index_path,
     ImageArchiveInvalidException
 )
 
@@ -92,3 +97,87 @@ def test_archived_image_manifest_raises_when_manifest_missing_id(tar_file_name):
     except ImageArchiveInvalidException as e:
         assert isinstance(e.cause, KeyError)
         assert 'Config' in str(e.cause)
+
+
+def test_archived_image_manifest_index(tar_file_name, mocker):
+    write_imitation_archive(tar_file_name, 'abcde12345', ['foo:latest'])
+
+    actual = archived_image_manifest(tar_file_name)
+    assert actual.image_id == 'abcde12345'
+    assert not os.path.exists(manifest_index_path(tar_file_name))
+
+    actual = archived_image_manifest(tar_file_name, use_index=True)
+    assert actual.image_id == 'abcde12345'
+    with open(manifest_index_path(tar_file_name), 'rb') as f:
+        index = json.loads(f.read().decode('utf-8'))
+    assert index['archive']['size'] == os.path.getsize(tar_file_name)
+
+    # With a valid index, the archive is not searched
+    mocker.patch('tarfile.open', side_effect=AssertionError('archive should not be searched'))
+    actual = archived_image_manifest(tar_file_name, use_index=True)
+    assert actual.image_id == 'abcde12345'
+    assert actual.repo_tags == ['foo:latest']
+    mocker.stopall()
+
+    # The index is ignored and rewritten once the archive changed
+    write_imitation_archive(tar_file_name, 'fghij67890', ['bar:latest', 'baz:v1'])
+    actual = archived_image_manifest(tar_file_name, use_index=True)
+    assert actual.image_id == 'fghij67890'
+    actual = archived_image_manifest(tar_file_name, use_index=True)
+    assert actual.repo_tags == ['bar:latest', 'baz:v1']
+
+
+def test_archived_image_manifest_index_check_mode(tar_file_name, mocker):
+    write_imitation_archive(tar_file_name, 'abcde12345', ['foo:latest'])
+
+    # Without write_index, no index is created
+    actual = archived_image_manifest(tar_file_name, use_index=True, write_index=False)
+    assert actual.image_id == 'abcde12345'
+    assert not os.path.exists(manifest_index_path(tar_file_name))
+
+    # An existing index is still used, but it is not rewritten once the archive changed
+    archived_image_manifest(tar_file_name, use_index=True)
+    mocker.patch('tarfile.open', side_effect=AssertionError('archive should not be searched'))
+    actual = archived_image_manifest(tar_file_name, use_index=True, write_index=False)
+    assert actual.image_id == 'abcde12345'
+    mocker.stopall()
+
+    with open(manifest_index_path(tar_file_name), 'rb') as f:
+        index = f.read()
+    write_imitation_archive(tar_file_name, 'fghij67890', ['bar:latest'])
+    actual = archived_image_manifest(tar_file_name, use_index=True, write_index=False)
+    assert actual.image_id == 'fghij67890'
+    with open(manifest_index_path(tar_file_name), 'rb') as f:
+        assert f.read() == index
+
+
+def test_archived_image_manifest_index_does_not_match(tar_file_name):
+    write_imitation_archive(tar_file_name, 'abcde12345', ['foo:latest'])
+    archived_image_manifest(tar_file_name, use_index=True)
+
+    # An index whose data does not match what is stored in the archive is not used
+    with open(manifest_index_path(tar_file_name), 'rb') as f:
+        index = json.loads(f.read().decode('utf-8'))
+    index['manifest']['offset'] = 0
+    with open(manifest_index_path(tar_file_name), 'wb') as f:
+        f.write(json.dumps(index).encode('utf-8'))
+
+    actual = archived_image_manifest(tar_file_name, use_index=True)
+    assert actual.image_id == 'abcde12345'
+
+
+def test_archived_image_manifest_index_compressed(tmpdir):
+    file_name = str(tmpdir.join('foo.tar.gz'))
+    manifest = json.dumps([{'Config': 'abcde12345.json', 'RepoTags': ['foo:latest']}]).encode('utf-8')
+    tf = tarfile.open(file_name, 'w:gz')
+    try:
+        ti = tarfile.TarInfo('manifest.json')
+        ti.size = len(manifest)
+        tf.addfile(ti, io.BytesIO(manifest))
+    finally:
+        tf.close()
+
+    actual = archived_image_manifest(file_name, use_index=True)
+    assert actual.image_id == 'abcde12345'
+    # The manifest cannot be read directly from a compressed archive
+    assert not os.path.exists(manifest_index_path(file_name))
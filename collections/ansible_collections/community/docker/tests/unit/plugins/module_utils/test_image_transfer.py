@@ -0,0 +1,175 @@
+# Copyright (c) 2025, Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+import threading
+import time
+
+import pytest
+
+from ansible_collections.community.docker.plugins.module_utils.image_transfer import (
+    ImageTransferError,
+    ImageTransferProgress,
+    get_transferred_bytes,
+    run_in_parallel,
+    stream_pull,
+)
+
+
+PULL_EVENTS = [
+    {'status': 'Pulling from library/python', 'id': '3.13'},
+    {'status': 'Already exists', 'progressDetail': {}, 'id': 'aaaaaaaaaaaa'},
+    {'status': 'Pulling fs layer', 'progressDetail': {}, 'id': 'bbbbbbbbbbbb'},
+    {'status': 'Pulling fs layer', 'progressDetail': {}, 'id': 'cccccccccccc'},
+    {'status': 'Waiting', 'progressDetail': {}, 'id': 'cccccccccccc'},
+    {'status': 'Downloading', 'progressDetail': {'current': 1000, 'total': 3000}, 'id': 'bbbbbbbbbbbb'},
+    {'status': 'Downloading', 'progressDetail': {'current': 2500, 'total': 3000}, 'id': 'bbbbbbbbbbbb'},
+    {'status': 'Verifying Checksum', 'progressDetail': {}, 'id': 'bbbbbbbbbbbb'},
+    {'status': 'Download complete', 'progressDetail': {}, 'id': 'bbbbbbbbbbbb'},
+    {'status': 'Extracting', 'progressDetail': {'current': 32768, 'total': 3000}, 'id': 'bbbbbbbbbbbb'},
+    {'status': 'Pull complete', 'progressDetail': {}, 'id': 'bbbbbbbbbbbb'},
+    {'status': 'Downloading', 'progressDetail': {'current': 500, 'total': 700}, 'id': 'cccccccccccc'},
+    {'status': 'Download complete', 'progressDetail': {}, 'id': 'cccccccccccc'},
+    {'status': 'Pull complete', 'progressDetail': {}, 'id': 'cccccccccccc'},
+    {'status': 'Digest: sha256:0123456789abcdef'},
+    {'status': 'Status: Downloaded newer image for python:3.13'},
+]
+
+PUSH_EVENTS = [
+    {'status': 'The push refers to repository [registry.example.com/repo]'},
+    {'status': 'Preparing', 'progressDetail': {}, 'id': 'dddddddddddd'},
+    {'status': 'Preparing', 'progressDetail': {}, 'id': 'eeeeeeeeeeee'},
+    {'status': 'Preparing', 'progressDetail': {}, 'id': 'ffffffffffff'},
+    {'status': 'Layer already exists', 'progressDetail': {}, 'id': 'dddddddddddd'},
+    {'status': 'Mounted from repo/other', 'progressDetail': {}, 'id': 'eeeeeeeeeeee'},
+    {'status': 'Pushing', 'progressDetail': {'current': 512, 'total': 1024}, 'id': 'ffffffffffff'},
+    {'status': 'Pushed', 'progressDetail': {}, 'id': 'ffffffffffff'},
+    {'status': 'latest: digest: sha256:0123456789abcdef size: 1234'},
+]
+
+
+def test_progress_pull():
+    progress = ImageTransferProgress()
+    for event in PULL_EVENTS:
+        progress.add_event(event)
+    progress.finish()
+    assert progress.transferred
+    summary = progress.get_summary()
+    assert summary['duration'] >= 0
+    del summary['duration']
+    assert summary == {
+        'layers': 3,
+        'layers_transferred': 2,
+        'layers_existing': 1,
+        'bytes': 3700,
+    }
+
+
+def test_progress_push():
+    progress = ImageTransferProgress()
+    for event in PUSH_EVENTS:
+        progress.add_event(event)
+    summary = progress.get_summary()
+    del summary['duration']
+    assert summary == {
+        'layers': 3,
+        'layers_transferred': 1,
+        'layers_existing': 2,
+        'bytes': 1024,
+    }
+
+
+def test_progress_nothing_transferred():
+    progress = ImageTransferProgress()
+    for event in PUSH_EVENTS:
+        if event.get('status') not in ('Pushing', 'Pushed'):
+            progress.add_event(event)
+    assert not progress.transferred
+
+
+def test_get_transferred_bytes():
+    first = ImageTransferProgress()
+    second = ImageTransferProgress()
+    for event in PULL_EVENTS:
+        first.add_event(event)
+        # The second image shares layer b, which the daemon downloaded only once
+        if event.get('id') != 'cccccccccccc':
+            second.add_event(event)
+    assert first.get_summary()['bytes'] == 3700
+    assert second.get_summary()['bytes'] == 3000
+    assert get_transferred_bytes([first, second]) == 3700
+    assert get_transferred_bytes([]) == 0
+
+
+def test_run_in_parallel():
+    lock = threading.Lock()
+    running = [0, 0]
+
+    def function(item):
+        with lock:
+            running[0] += 1
+            running[1] = max(running[1], running[0])
+        time.sleep(0.01)
+        with lock:
+            running[0] -= 1
+        if item == 3:
+            raise ValueError('three')
+        return item * 2
+
+    results = run_in_parallel(function, list(range(10)), 4)
+    assert [result for result, exc in results] == [0, 2, 4, None, 8, 10, 12, 14, 16, 18]
+    assert [str(exc) for result, exc in results if exc is not None] == ['three']
+    assert 1 < running[1] <= 4
+
+    assert run_in_parallel(function, [], 4) == []
+
+
+class FakeClient(object):
+    def __init__(self, events):
+        self.events = events
+        self.requests = []
+
+    def _url(self, pathfmt, *args):
+        return pathfmt.format(*args)
+
+    def _post(self, url, **kwargs):
+        self.requests.append((url, kwargs))
+        return None
+
+    def _raise_for_status(self, response):
+        pass
+
+    def _stream_helper(self, response, decode=False):
+        return iter(self.events)
+
+    def log(self, msg, pretty_print=False):
+        pass
+
+
+def test_stream_pull():
+    client = FakeClient(PULL_EVENTS)
+    progress = ImageTransferProgress()
+    stream_pull(client, 'python', tag='3.13', platform='linux/amd64', auth_header='abc', progress=progress)
+    assert client.requests == [('/images/create', {
+        'params': {'tag': '3.13', 'fromImage': 'python', 'platform': 'linux/amd64'},
+        'headers': {'X-Registry-Auth': 'abc'},
+        'stream': True,
+        'timeout': None,
+    })]
+    assert progress.get_summary()['bytes'] == 3700
+    assert progress.end is not None
+
+
+@pytest.mark.parametrize('event, message', [
+    ({'error': 'failed', 'errorDetail': {'code': 404, 'message': 'not found'}}, 'code: 404 message: not found'),
+    ({'error': 'failed'}, 'failed'),
+])
+def test_stream_pull_error(event, message):
+    client = FakeClient(PULL_EVENTS[:3] + [event])
+    with pytest.raises(ImageTransferError) as exc:
+        stream_pull(client, 'python:3.13')
+    assert str(exc.value) == message
@@ -0,0 +1,89 @@
+# Copyright (c) 2025, Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+import socket
+import struct
+
+import pytest
+
+from ansible_collections.community.docker.plugins.module_utils.selectors import selectors
+from ansible_collections.community.docker.plugins.module_utils.socket_handler import (
+    DockerSocketHandlerBase,
+)
+
+
+def frame(stream_id, data):
+    return struct.pack('>BxxxL', stream_id, len(data)) + data
+
+
+FRAMES = [
+    (1, b'hello '),
+    (2, b'an error\n'),
+    (1, b''),
+    (1, b'x' * 300000),
+    (2, b'y' * 17),
+    (1, b'world\n'),
+]
+
+
+class FakeSocket(object):
+    # A socket without recv_into that returns the data in the given pieces
+    def __init__(self, pieces):
+        self._pieces = iter(pieces)
+
+    def recv(self, size):
+        piece = next(self._pieces, b'')
+        assert len(piece) <= size
+        return piece
+
+
+@pytest.mark.parametrize('piece_size', [1, 3, 8, 9, 4096, 262144])
+def test_demux_split_frames(piece_size):
+    data = b''.join(frame(stream_id, payload) for stream_id, payload in FRAMES)
+    handler = DockerSocketHandlerBase.__new__(DockerSocketHandlerBase)
+    handler._log = lambda msg: True
+    handler._eof = False
+    handler._sock = FakeSocket(data[i:i + piece_size] for i in range(0, len(data), piece_size))
+    handler._read_buffer = bytearray(262144)
+    handler._current_header = bytearray()
+    handler._current_stream = None
+    handler._current_missing = 0
+    handler._current_buffer = bytearray()
+    handler._block_buffer = []
+    handler._block_done_callback = None
+
+    while not handler._eof:
+        handler._read()
+
+    blocks = handler._block_buffer
+    assert all(isinstance(data, bytes) for stream_id, data in blocks)
+    assert blocks == [(stream_id, payload) for stream_id, payload in FRAMES if payload]
+
+
+def test_consume_socketpair():
+    ours, theirs = socket.socketpair()
+    try:
+        expected_stdout = b''.join(payload for stream_id, payload in FRAMES if stream_id == 1)
+        expected_stderr = b''.join(payload for stream_id, payload in FRAMES if stream_id == 2)
+        data = b''.join(frame(stream_id, payload) for stream_id, payload in FRAMES)
+        with DockerSocketHandlerBase(ours, selectors) as handler:
+            handler.write(b'input')
+            # Send the output while the handler reads, the socket buffer cannot hold all of it
+            theirs.setblocking(True)
+            sent = 0
+            while sent < len(data):
+                sent += theirs.send(data[sent:sent + 65536])
+                handler.select(0)
+            theirs.shutdown(socket.SHUT_WR)
+            stdout, stderr = handler.consume()
+        assert stdout == expected_stdout
+        assert stderr == expected_stderr
+        assert theirs.recv(100) == b'input'
+    finally:
+        ours.close()
+        theirs.close()
@@ -5,9 +5,20 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
+import io
+import tarfile
+
 import pytest
 
-from ansible_collections.community.docker.plugins.modules.docker_container_copy_into import parse_modern, parse_octal_string_only
+from ansible_collections.community.docker.plugins.module_utils._api.errors import APIError
+from ansible_collections.community.docker.plugins.module_utils.copy import put_files, walk_directory
+from ansible_collections.community.docker.plugins.modules.docker_container_copy_into import (
+    compare_directory,
+    copy_src_to_dst,
+    is_digest_equal,
+    parse_modern,
+    parse_octal_string_only,
+)
 
 
 @pytest.mark.parametrize("input, expected", [
@@ -66,3 +77,61 @@ def test_parse_bad_value(input):
         parse_modern(input)
     with pytest.raises(ValueError):
         parse_octal_string_only(input)
+
+
+@pytest.mark.parametrize("container_digest, expected", [
+    ((0, 0, 'abc'), True),
+    ((0, 0, 'abd'), False),
+    ((1, 0, 'abc'), False),
+    ((0, 1, 'abc'), False),
+    (None, None),
+    (APIError('container is not running'), None),
+])
+def test_is_digest_equal(mocker, container_digest, expected):
+    get_file_digest = mocker.patch(
+        'ansible_collections.community.docker.plugins.modules.docker_container_copy_into.get_file_digest',
+        side_effect=[container_digest],
+    )
+    assert is_digest_equal(None, 'container', '/file', 0, 0, lambda: 'abc') is expected
+    get_file_digest.assert_called_once_with(None, 'container', '/file')
+
+
+def test_copy_src_to_dst():
+    diff = {'after_header': '/local/file', 'after': 'content\n', 'dst_binary': 1}
+    copy_src_to_dst(diff, '/file')
+    assert diff == {'after_header': '/local/file', 'after': 'content\n', 'before_header': '/file', 'before': 'content\n'}
+
+
+def test_compare_directory(mocker, tmp_path):
+    (tmp_path / 'sub').mkdir()
+    (tmp_path / 'same.txt').write_bytes(b'same')
+    (tmp_path / 'other.txt').write_bytes(b'new content')
+    (tmp_path / 'sub' / 'new.txt').write_bytes(b'new')
+    entries = walk_directory(str(tmp_path))
+
+    # The container has the same directory, with a different other.txt and without sub/new.txt
+    container_entries = [entry for entry in entries if entry[1] != 'sub/new.txt']
+    archive = []
+    client = mocker.MagicMock()
+    client._put.side_effect = lambda url, params, data: archive.append(b''.join(data)) or mocker.MagicMock(status_code=200)
+    (tmp_path / 'other.txt').write_bytes(b'old content')
+    put_files(client, 'container', container_entries, '/target', 0, 0, mode=0o644)
+    (tmp_path / 'other.txt').write_bytes(b'new content')
+
+    def fetch_archive_ex(client, container, in_path, process_tar):
+        with tarfile.open(fileobj=io.BytesIO(archive[0]), mode='r|') as tar:
+            return process_tar(tar)
+
+    mocker.patch(
+        'ansible_collections.community.docker.plugins.modules.docker_container_copy_into.fetch_archive_ex',
+        side_effect=fetch_archive_ex,
+    )
+    existing, equal = compare_directory(client, 'container', '/target', entries, 0, 0, 0o644)
+    assert existing == set(['', 'same.txt', 'other.txt', 'sub'])
+    assert equal == set(['', 'same.txt', 'sub'])
+
+    # Other owner or mode
+    existing, equal = compare_directory(client, 'container', '/target', entries, 0, 1, 0o644)
+    assert equal == set()
+    existing, equal = compare_directory(client, 'container', '/target', entries, 0, 0, 0o600)
+    assert equal == set(['', 'sub'])
@@ -5,11 +5,13 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
+import os
+
 import pytest
 
 from ansible_collections.community.docker.plugins.modules.docker_image import ImageManager
 
-from ansible_collections.community.docker.plugins.module_utils.image_archive import api_image_id
+from ansible_collections.community.docker.plugins.module_utils.image_archive import api_image_id, manifest_index_path
 
 from ..test_support.docker_image_archive_stubbing import (
     write_imitation_archive,
@@ -60,6 +62,19 @@ def test_archived_image_action_when_current(tar_file_name):
     assert actual is None
 
 
+def test_archived_image_action_check_mode(tar_file_name):
+    fake_name = 'b:latest'
+    fake_id = 'b2'
+
+    write_imitation_archive(tar_file_name, fake_id, [fake_name])
+
+    actual = ImageManager.archived_image_action(
+        assert_no_logging, tar_file_name, fake_name, api_image_id(fake_id), use_manifest_index=True, write_manifest_index=False)
+
+    assert actual is None
+    assert not os.path.exists(manifest_index_path(tar_file_name))
+
+
 def test_archived_image_action_when_invalid(tar_file_name):
     fake_name = 'c:1.2.3'
     fake_id = 'c3'
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025, Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# Make coding more python3-ish
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+import pytest
+
+from ansible_collections.community.docker.plugins.plugin_utils.inventory_cache import (
+    CACHE_VERSION,
+    get_cached_state,
+    get_changed_ids,
+    parse_daemon_time,
+)
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('2025-03-01T12:00:10Z', 1740830410),
+    ('2025-03-01T12:00:10.123456789Z', 1740830410),
+    ('2025-03-01T13:00:10.5+01:00', 1740830410),
+    ('2025-03-01T07:30:10-04:30', 1740830410),
+    ('2025-03-01 12:00:10', None),
+    ('', None),
+    (None, None),
+])
+def test_parse_daemon_time(value, expected):
+    assert parse_daemon_time(value) == expected
+
+
+def test_get_cached_state():
+    cached = dict(version=CACHE_VERSION, daemon='a', until=123, objects={})
+    assert get_cached_state(cached, 'a') is cached
+    assert get_cached_state(cached, 'b') is None
+    assert get_cached_state(dict(cached, version=CACHE_VERSION + 1), 'a') is None
+    assert get_cached_state(dict(cached, until=None), 'a') is None
+    assert get_cached_state(None, 'a') is None
+
+
+def test_get_changed_ids():
+    events = [
+        {'Type': 'container', 'Action': 'start', 'Actor': {'ID': 'a'}},
+        {'Type': 'container', 'Action': 'exec_create: sh -c true', 'Actor': {'ID': 'b'}},
+        {'Type': 'container', 'Action': 'health_status: healthy', 'Actor': {'ID': 'c'}},
+        {'status': 'die', 'id': 'd'},
+        {'Type': 'container', 'Action': 'top', 'Actor': {'ID': 'e'}},
+        {'Type': 'network', 'Action': 'connect', 'Actor': {'ID': 'net1', 'Attributes': {'container': 'f', 'name': 'bridge'}}},
+        {'Type': 'network', 'Action': 'create', 'Actor': {'ID': 'net2', 'Attributes': {'name': 'other'}}},
+    ]
+    assert get_changed_ids(events, ignored_actions=('exec', 'top')) == set(['a', 'c', 'd', 'f'])
+    assert get_changed_ids(events) == set(['a', 'b', 'c', 'd', 'e', 'f'])
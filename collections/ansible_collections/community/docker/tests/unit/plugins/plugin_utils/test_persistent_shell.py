@@ -0,0 +1,136 @@
+# Copyright (c) 2025, Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+import os
+import socket
+import struct
+import subprocess
+import threading
+
+import pytest
+
+from ansible_collections.community.docker.plugins.plugin_utils.persistent_shell import (
+    PersistentShell,
+    PersistentShellError,
+    build_script,
+    can_frame_input,
+)
+
+
+class FakeDisplay(object):
+    def vvvv(self, msg, host=None):
+        pass
+
+
+class FakeDaemon(object):
+    # Runs a shell and passes its input and output over a socket, framed like the Docker daemon does
+    def __init__(self, sock):
+        self.process = subprocess.Popen(['/bin/sh'], stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        self._sock = sock
+        self._lock = threading.Lock()
+        self._open_outputs = 2
+        self._threads = [
+            threading.Thread(target=self._pump_input),
+            threading.Thread(target=self._pump_output, args=(1, self.process.stdout)),
+            threading.Thread(target=self._pump_output, args=(2, self.process.stderr)),
+        ]
+        for thread in self._threads:
+            thread.daemon = True
+            thread.start()
+
+    def _pump_input(self):
+        while True:
+            try:
+                data = self._sock.recv(4096)
+            except OSError:
+                data = b''
+            if not data:
+                break
+            self.process.stdin.write(data)
+            self.process.stdin.flush()
+        self.process.stdin.close()
+
+    def _pump_output(self, stream_id, stream):
+        while True:
+            data = os.read(stream.fileno(), 4096)
+            if not data:
+                break
+            with self._lock:
+                self._sock.sendall(struct.pack('>BxxxL', stream_id, len(data)) + data)
+        with self._lock:
+            # Like the daemon, end the stream once the shell has exited
+            self._open_outputs -= 1
+            if self._open_outputs == 0:
+                self._sock.shutdown(socket.SHUT_WR)
+
+    def stop(self):
+        self._threads[1].join()
+        self._threads[2].join()
+        self._sock.close()
+        self.process.wait()
+
+
+@pytest.fixture
+def shell():
+    if not os.path.exists('/bin/sh'):
+        pytest.skip('Needs /bin/sh')
+    ours, theirs = socket.socketpair()
+    daemon = FakeDaemon(theirs)
+    shell = PersistentShell(FakeDisplay(), ours)
+    yield shell, daemon
+    shell.close()
+    daemon.process.kill()
+    daemon.stop()
+
+
+@pytest.mark.parametrize('in_data, expected', [
+    (None, True),
+    (b'', False),
+    (b'foo', False),
+    (b'foo\nbar\n', True),
+    (b'foo\0bar\n', False),
+])
+def test_can_frame_input(in_data, expected):
+    assert can_frame_input(in_data) == expected
+
+
+def test_build_script():
+    assert build_script(['/bin/sh', '-c', "echo 'a b'"], b'MARKER') == (
+        b"/bin/sh -c 'echo '\"'\"'a b'\"'\"'' </dev/null\n"
+        b"printf '%s %d\\n' 'MARKER' \"$?\"\n"
+        b"printf '%s\\n' 'MARKER' >&2\n"
+    )
+    assert build_script(['cat'], b'MARKER', b'line 1\nline 2\n') == (
+        b"cat <<'MARKER_IN'\n"
+        b"line 1\nline 2\n"
+        b"MARKER_IN\n"
+        b"printf '%s %d\\n' 'MARKER' \"$?\"\n"
+        b"printf '%s\\n' 'MARKER' >&2\n"
+    )
+
+
+def test_run(shell):
+    shell, daemon = shell
+    assert shell.is_alive()
+    assert shell.run(['/bin/sh', '-c', 'echo foo; echo bar >&2; exit 3']) == (3, b'foo\n', b'bar\n')
+    assert shell.run(['/bin/sh', '-c', 'printf foo']) == (0, b'foo', b'')
+    assert shell.run(['/bin/sh', '-c', 'cat; echo "$1"', 'sh', "it's"], b'$HOME `x`\n') == (0, b"$HOME `x`\nit's\n", b'')
+    # Commands do not share state
+    assert shell.run(['/bin/sh', '-c', 'FOO=bar; cd /']) == (0, b'', b'')
+    assert shell.run(['/bin/sh', '-c', 'echo "${FOO}"']) == (0, b'\n', b'')
+    # Output larger than a frame
+    rc, stdout, stderr = shell.run(['/bin/sh', '-c', 'i=0; while [ $i -lt 20000 ]; do echo 0123456789abcdef; i=$((i+1)); done'])
+    assert (rc, stdout, stderr) == (0, b'0123456789abcdef\n' * 20000, b'')
+    assert shell.is_alive()
+
+
+def test_run_shell_exited(shell):
+    shell, daemon = shell
+    with pytest.raises(PersistentShellError):
+        shell.run(['exit'])
+    assert not shell.is_alive()